@@ -0,0 +1,75 @@
+"""Thread pool and per-stage concurrency limits for blocking calls (AI providers: app.core.outbound)."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Blocking SDK calls (boto3, pydub/ffmpeg) run here rather than in the loop's
+# default executor, so a burst of slow uploads cannot starve other to_thread users
+_executor = ThreadPoolExecutor(
+    max_workers=settings.BLOCKING_POOL_SIZE,
+    thread_name_prefix="blocking-sdk",
+)
+
+
+class Stage:
+    """Caps how many calls of one kind (e.g. S3 uploads) run at once."""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting}
+
+
+STAGES: Dict[str, Stage] = {
+    "audio": Stage("audio", settings.CONCURRENCY_AUDIO),
+    "upload": Stage("upload", settings.CONCURRENCY_UPLOAD),
+}
+
+
+def stage_slot(stage: str):
+    """`async with stage_slot("upload"):` around a native async call."""
+    return STAGES[stage].slot()
+
+
+async def run_blocking(stage: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking call in the SDK thread pool, within its stage's limit."""
+    async with stage_slot(stage):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def concurrency_stats() -> dict:
+    return {
+        "pool_size": settings.BLOCKING_POOL_SIZE,
+        "stages": {name: stage.stats() for name, stage in STAGES.items()},
+    }
+
+
+def shutdown_executor() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
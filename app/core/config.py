@@ -6,7 +6,77 @@ class Settings(BaseSettings):
     MONGO_PASSWORD: str
     MONGO_ADDRESS: str
     MONGO_CLUSTER: str
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    # Comma-separated, in order of preference (zstd, snappy, zlib)
+    MONGO_COMPRESSORS: str = "zstd,zlib"
+    MONGO_ENSURE_INDEXES: bool = True
     FIREBASE_API: str
+    FIREBASE_PROJECT_ID: str = ""
+    # "local" verifies ID tokens as JWTs, "rest" calls the accounts:lookup endpoint
+    FIREBASE_TOKEN_VERIFICATION: str = "local"
+    # Resolved users per token; role changes made outside the app apply after the TTL (0 disables the cache)
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    VOCABULARY_CATALOGUE_ENABLED: bool = True
+    VOCABULARY_REFRESH_SECONDS: int = 60
+    QUESTION_BANK_ENABLED: bool = True
+    # Signs test session tokens; must be shared by all workers. Random per process if empty.
+    TEST_SESSION_SECRET: str = ""
+    TEST_SESSION_TTL_SECONDS: int = 3 * 3600
+    WRITE_BEHIND_ENABLED: bool = True
+    WRITE_BEHIND_FLUSH_SECONDS: float = 1.0
+    WRITE_BEHIND_MAX_BATCH: int = 500
+    # Writes beyond this many pending ones, e.g. while Mongo is unreachable, are dropped
+    WRITE_BEHIND_MAX_PENDING: int = 10_000
+    SPEAKING_WORKERS: int = 4
+    SPEAKING_MAX_PENDING_JOBS: int = 100
+    # Analyses running longer than this are reported as failed
+    SPEAKING_JOB_TIMEOUT_SECONDS: int = 300
+    # Analyses never picked up by a worker, e.g. lost in a restart, fail after this
+    SPEAKING_JOB_QUEUE_TIMEOUT_SECONDS: int = 1800
+    # A minute of 48 kHz 16-bit stereo WAV, the largest recording we accept
+    SPEAKING_MAX_UPLOAD_BYTES: int = 12 * 1024 * 1024
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_SIZE: int = 2000
+    ANALYSIS_CACHE_TTL_SECONDS: int = 24 * 3600
+    ANALYSIS_CACHE_NORMALIZED: bool = True
+    # Threads for blocking SDK calls, and how many calls of each stage may run at once
+    BLOCKING_POOL_SIZE: int = 16
+    CONCURRENCY_AUDIO: int = 4
+    CONCURRENCY_UPLOAD: int = 8
+    # Outbound calls per AI provider: in flight, started per second (0 = unlimited), waiting before 503
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_RATE_PER_SECOND: float = 5.0
+    OPENAI_MAX_QUEUED: int = 50
+    # ElevenLabs is split by use so background podcast synthesis cannot hold every slot speaking
+    # transcription needs; keep the two concurrency limits within the account's combined limit
+    ELEVENLABS_STT_MAX_CONCURRENCY: int = 2
+    ELEVENLABS_STT_RATE_PER_SECOND: float = 0.0
+    ELEVENLABS_STT_MAX_QUEUED: int = 50
+    ELEVENLABS_TTS_MAX_CONCURRENCY: int = 2
+    ELEVENLABS_TTS_RATE_PER_SECOND: float = 0.0
+    ELEVENLABS_TTS_MAX_QUEUED: int = 50
+    # Dialogue lines of one podcast synthesized at once
+    PODCAST_TTS_CONCURRENCY: int = 4
+    # Synthesized podcast lines, keyed by (voice, model, text); an S3 prefix adds object storage behind the disk
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = "/tmp/tts-cache"
+    TTS_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    TTS_CACHE_S3_PREFIX: str = ""
+    # Background podcast generation
+    PODCAST_WORKERS: int = 2
+    PODCAST_MAX_PENDING_JOBS: int = 20
+    # Generations running longer than this, or never picked up by a worker, are reported as failed
+    PODCAST_JOB_TIMEOUT_SECONDS: int = 900
+    PODCAST_JOB_QUEUE_TIMEOUT_SECONDS: int = 3600
+    HTTP_ENABLE_HTTP2: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
     ALLOWED_ORIGINS: List[str] = ["*"]
     STORAGE_ADDRESS: str = ""
     STORAGE_USER: str = ""
@@ -0,0 +1,181 @@
+"""Governor for outbound calls to the AI providers: concurrency, rate limits, backpressure and retries."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import httpx
+import openai
+from fastapi import HTTPException
+from langchain_core.exceptions import OutputParserException
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth another attempt: timeouts, rate limits and server errors
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, bursting up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        # The lock keeps waiters in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Provider:
+    """
+    Limits for one upstream API: at most `max_concurrency` calls in flight,
+    started no faster than `rate_per_second`, with at most `max_queued`
+    callers waiting. Beyond that callers get a 503 with Retry-After straight
+    away rather than piling up behind a provider that is already saturated.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        rate_per_second: float,
+        max_queued: int,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_second, capacity=max_concurrency)
+        self.rate_per_second = rate_per_second
+        self.active = 0
+        self.waiting = 0
+        self.calls = 0
+        self.rejected = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.waiting >= self.max_queued:
+            self.rejected += 1
+            logger.warning(f"{self.name} queue is full ({self.waiting} waiting), rejecting call")
+            raise HTTPException(
+                status_code=503,
+                detail=f"{self.name} is busy, please try again shortly",
+                headers={"Retry-After": "5"},
+            )
+
+        queued_at = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._bucket.acquire()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.waiting -= 1
+
+        queued = time.monotonic() - queued_at
+        self.calls += 1
+        self.queue_seconds_total += queued
+        self.queue_seconds_max = max(self.queue_seconds_max, queued)
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate_per_second,
+            "max_queued": self.max_queued,
+            "active": self.active,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "queue_seconds_avg": round(self.queue_seconds_total / self.calls, 4) if self.calls else 0.0,
+            "queue_seconds_max": round(self.queue_seconds_max, 4),
+        }
+
+
+PROVIDERS: Dict[str, Provider] = {
+    "openai": Provider(
+        "OpenAI",
+        max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+        rate_per_second=settings.OPENAI_RATE_PER_SECOND,
+        max_queued=settings.OPENAI_MAX_QUEUED,
+    ),
+    "elevenlabs_stt": Provider(
+        "ElevenLabs transcription",
+        max_concurrency=settings.ELEVENLABS_STT_MAX_CONCURRENCY,
+        rate_per_second=settings.ELEVENLABS_STT_RATE_PER_SECOND,
+        max_queued=settings.ELEVENLABS_STT_MAX_QUEUED,
+    ),
+    "elevenlabs_tts": Provider(
+        "ElevenLabs speech synthesis",
+        max_concurrency=settings.ELEVENLABS_TTS_MAX_CONCURRENCY,
+        rate_per_second=settings.ELEVENLABS_TTS_RATE_PER_SECOND,
+        max_queued=settings.ELEVENLABS_TTS_MAX_QUEUED,
+    ),
+}
+
+
+def outbound(provider: str):
+    """`async with outbound("openai"):` around one call to the provider."""
+    return PROVIDERS[provider].slot()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient failures: rate limits, server errors, timeouts, dropped connections, malformed LLM output."""
+    if isinstance(exc, HTTPException):
+        # Our own backpressure; retrying would only deepen the queue
+        return False
+    if isinstance(exc, (openai.APIConnectionError, httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    if isinstance(exc, OutputParserException):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None and isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+    return status in RETRYABLE_STATUSES
+
+
+def outbound_retry(what: str):
+    """Retry policy for provider calls: retryable errors only, jittered exponential backoff."""
+    return retry(
+        stop=stop_after_attempt(3),
+        wait=wait_random_exponential(multiplier=1, max=10),
+        retry=retry_if_exception(is_retryable),
+        reraise=True,
+        before_sleep=lambda retry_state: logger.warning(
+            f"{what} failed, retrying (attempt {retry_state.attempt_number}): "
+            f"{retry_state.outcome.exception()}"
+        ),
+    )
+
+
+def outbound_stats() -> dict:
+    return {name: provider.stats() for name, provider in PROVIDERS.items()}
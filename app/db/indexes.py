@@ -0,0 +1,211 @@
+"""
+Declarative index registry for the hot queries issued by the routers.
+
+Indexes are reconciled at application startup and can also be managed from
+the command line:
+
+    python -m app.db.indexes            # create any missing indexes
+    python -m app.db.indexes --check    # report missing indexes, create nothing
+    python -m app.db.indexes --explain  # fail if a hot query plans a COLLSCAN
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# collection -> indexes it needs, named after their keys as Mongo would
+INDEXES: Dict[str, List[IndexModel]] = {
+    "words": [
+        # /words/{level}, /flashcards/{level}/session, /tests/{level}/start
+        IndexModel([("cerf_level", ASCENDING)], name="cerf_level_1"),
+    ],
+    "flashcard_sessions": [
+        IndexModel(
+            [("user_id", ASCENDING), ("level", ASCENDING), ("is_active", ASCENDING)],
+            name="user_id_1_level_1_is_active_1",
+        ),
+    ],
+    "test_results": [
+        # Best score per level
+        IndexModel(
+            [("userId", ASCENDING), ("level", ASCENDING), ("score", DESCENDING)],
+            name="userId_1_level_1_score_-1",
+        ),
+        # History, newest first
+        IndexModel(
+            [("userId", ASCENDING), ("completedAt", DESCENDING)],
+            name="userId_1_completedAt_-1",
+        ),
+    ],
+    # Per-session records of /tests/{level}/check and submit; useless once the session expires
+    "test_answer_checks": [
+        IndexModel(
+            [("createdAt", ASCENDING)],
+            name="createdAt_1",
+            expireAfterSeconds=settings.TEST_SESSION_TTL_SECONDS,
+        ),
+    ],
+    "test_session_uses": [
+        IndexModel(
+            [("usedAt", ASCENDING)],
+            name="usedAt_1",
+            expireAfterSeconds=settings.TEST_SESSION_TTL_SECONDS,
+        ),
+    ],
+    "speaking_sessions": [
+        IndexModel(
+            [("userId", ASCENDING), ("createdAt", DESCENDING)],
+            name="userId_1_createdAt_-1",
+        ),
+    ],
+    "speaking_questions": [
+        IndexModel([("id", ASCENDING)], name="id_1", unique=True),
+        IndexModel([("level", ASCENDING), ("theme", ASCENDING)], name="level_1_theme_1"),
+        IndexModel([("theme", ASCENDING)], name="theme_1"),
+    ],
+    "notifications": [
+        IndexModel(
+            [("user_id", ASCENDING), ("created_at", DESCENDING)],
+            name="user_id_1_created_at_-1",
+        ),
+    ],
+    "podcasts": [
+        IndexModel([("created_at", DESCENDING)], name="created_at_-1"),
+        IndexModel(
+            [("cefr_level", ASCENDING), ("context", ASCENDING), ("created_at", DESCENDING)],
+            name="cefr_level_1_context_1_created_at_-1",
+        ),
+    ],
+}
+
+# Representative shapes of the queries the routers run; used for explain checks
+HOT_QUERIES: List[dict] = [
+    {"collection": "words", "filter": {"cerf_level": "A1"}},
+    {"collection": "flashcard_sessions", "filter": {"user_id": "uid", "level": "A1", "is_active": True}},
+    {"collection": "test_results", "filter": {"userId": "uid", "level": "A1"}, "sort": {"score": -1}},
+    {"collection": "test_results", "filter": {"userId": "uid"}, "sort": {"completedAt": -1}},
+    {"collection": "speaking_sessions", "filter": {"userId": "uid"}, "sort": {"createdAt": -1}},
+    {"collection": "speaking_questions", "filter": {"level": "A1", "theme": "Hobbies"}},
+    {"collection": "notifications", "filter": {"user_id": "uid"}, "sort": {"created_at": -1}},
+    {"collection": "podcasts", "filter": {}, "sort": {"created_at": -1}},
+    {"collection": "podcasts", "filter": {"cefr_level": "A1", "context": "Das Café"}, "sort": {"created_at": -1}},
+]
+
+
+def covering_index(query: dict) -> Optional[str]:
+    """Name of a registered index whose key prefix serves the query's filter and sort."""
+    fields = list(query.get("filter", {})) + list(query.get("sort", {}))
+    for index in INDEXES.get(query["collection"], []):
+        keys = [key for key, _ in index.document["key"].items()]
+        # Equality fields may appear in any order, sort fields must follow them
+        prefix = keys[:len(fields)]
+        filter_fields = set(query.get("filter", {}))
+        if (
+            len(prefix) == len(fields)
+            and set(prefix[:len(filter_fields)]) == filter_fields
+            and prefix[len(filter_fields):] == list(query.get("sort", {}))
+        ):
+            return index.document["name"]
+    return None
+
+
+async def ensure_indexes(
+    db: AsyncIOMotorDatabase,
+    collections: Optional[Iterable[str]] = None,
+    create: bool = True,
+) -> dict:
+    """
+    Reconcile the registry with the database.
+
+    Returns {collection: {"created": [...], "missing": [...], "unmanaged": [...]}},
+    where "unmanaged" lists indexes present in Mongo but not in the registry.
+    """
+    report = {}
+    for name in collections or INDEXES:
+        collection = db[name]
+        existing = await collection.index_information()
+        wanted = INDEXES.get(name, [])
+
+        missing = []
+        for index in wanted:
+            index_name = index.document["name"]
+            if index_name not in existing:
+                missing.append(index)
+            elif list(existing[index_name]["key"]) != list(index.document["key"].items()):
+                logger.warning(f"Index {name}.{index_name} exists with different keys")
+
+        created = []
+        if missing and create:
+            created = await collection.create_indexes(missing)
+            logger.info(f"Created indexes on {name}: {created}")
+
+        registered = {index.document["name"] for index in wanted}
+        report[name] = {
+            "created": created,
+            "missing": [] if create else [index.document["name"] for index in missing],
+            "unmanaged": [n for n in existing if n != "_id_" and n not in registered],
+        }
+    return report
+
+
+def _plan_stages(plan: dict) -> Iterable[str]:
+    yield plan.get("stage", "")
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            yield from _plan_stages(plan[child_key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+
+async def find_collscans(db: AsyncIOMotorDatabase, queries: Optional[List[dict]] = None) -> List[dict]:
+    """Explain each hot query and return the ones whose winning plan is a COLLSCAN."""
+    collscans = []
+    for query in queries or HOT_QUERIES:
+        command = {"find": query["collection"], "filter": query.get("filter", {})}
+        if query.get("sort"):
+            command["sort"] = query["sort"]
+        explain = await db.command("explain", command, verbosity="queryPlanner")
+        winning_plan = explain["queryPlanner"]["winningPlan"]
+        if "COLLSCAN" in _plan_stages(winning_plan):
+            collscans.append(query)
+            logger.warning(f"COLLSCAN for {query['collection']}: {query.get('filter')} sort={query.get('sort')}")
+    return collscans
+
+
+async def _main(argv: List[str]) -> int:
+    from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_database
+
+    parser = argparse.ArgumentParser(description="Reconcile MongoDB indexes with the registry.")
+    parser.add_argument("--check", action="store_true", help="report missing indexes without creating them")
+    parser.add_argument("--explain", action="store_true", help="exit non-zero if a hot query uses a COLLSCAN")
+    args = parser.parse_args(argv)
+
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        report = await ensure_indexes(db, create=not args.check)
+        failed = False
+        for name, result in report.items():
+            print(f"{name}: created={result['created']} missing={result['missing']} unmanaged={result['unmanaged']}")
+            failed = failed or bool(result["missing"])
+        if args.explain:
+            collscans = await find_collscans(db)
+            for query in collscans:
+                print(f"COLLSCAN: {query}")
+            failed = failed or bool(collscans)
+        return 1 if failed else 0
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
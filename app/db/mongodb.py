@@ -1,34 +1,72 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.core.config import settings
+from app.db.indexes import ensure_indexes
+import asyncio
 import certifi
 import logging
 logger = logging.getLogger(__name__)
 
+DATABASE_NAME = "hackathon"
+
 class MongoDB:
     client: AsyncIOMotorClient = None
+    database: AsyncIOMotorDatabase = None
 
 db = MongoDB()
 
-async def get_database():
-    if db.client is None:
-        uri = f"mongodb+srv://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_ADDRESS}/?appName={settings.MONGO_CLUSTER}"
-        try:
-            # Use certifi for SSL certificate verification to fix SSL handshake issues
-            db.client = AsyncIOMotorClient(
-                uri, 
-                tlsCAFile=certifi.where(),
-                serverSelectionTimeoutMS=5000,  # Reduce timeout for faster feedback
-                connectTimeoutMS=5000,
-            )
-            # Test the connection
-            await db.client.admin.command('ping')
-            logger.info("Successfully connected to MongoDB")
-        except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {str(e)}")
-            db.client = None
-            raise
-    return db.client.get_database("hackathon")
+def _build_client() -> AsyncIOMotorClient:
+    uri = f"mongodb+srv://{settings.MONGO_USER}:{settings.MONGO_PASSWORD}@{settings.MONGO_ADDRESS}/?appName={settings.MONGO_CLUSTER}"
+    options = {}
+    if settings.MONGO_COMPRESSORS:
+        # pymongo drops (with a warning) any compressor whose library is missing
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    # Use certifi for SSL certificate verification to fix SSL handshake issues
+    return AsyncIOMotorClient(
+        uri,
+        tlsCAFile=certifi.where(),
+        serverSelectionTimeoutMS=5000,  # Reduce timeout for faster feedback
+        connectTimeoutMS=5000,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+        **options,
+    )
+
+async def _warm_up_pool():
+    """Open the minimum pool up front so the first requests don't pay for handshakes."""
+    await db.client.admin.command('ping')
+    # Concurrent pings each check out their own connection
+    await asyncio.gather(*(
+        db.client.admin.command('ping') for _ in range(settings.MONGO_MIN_POOL_SIZE)
+    ))
+
+async def connect_to_mongo():
+    """Create the shared client once, at application startup."""
+    if db.client is not None:
+        return
+    db.client = _build_client()
+    db.database = db.client.get_database(DATABASE_NAME)
+    try:
+        await _warm_up_pool()
+        logger.info("Successfully connected to MongoDB")
+    except Exception as e:
+        # Keep the client: motor reconnects on its own once the cluster is reachable
+        logger.error(f"Failed to connect to MongoDB: {str(e)}")
+
+async def ensure_database_indexes():
+    """Create any index declared in app.db.indexes that the database lacks."""
+    try:
+        await ensure_indexes(db.database)
+    except Exception as e:
+        logger.error(f"Index reconciliation failed: {str(e)}")
+
+async def get_database() -> AsyncIOMotorDatabase:
+    if db.database is None:
+        raise RuntimeError("MongoDB client is not initialized; connect_to_mongo() runs at startup")
+    return db.database
 
 async def close_mongo_connection():
     if db.client:
         db.client.close()
+        db.client = None
+        db.database = None
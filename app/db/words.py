@@ -0,0 +1,112 @@
+"""
+Projections and serializers for the words collection.
+
+Word documents carry tests, every translation, IPA, audio and more, while each
+endpoint only needs a handful of fields. Reads go through one of the named
+views below so Mongo only ships (and motor only decodes) those fields.
+"""
+
+from typing import Dict
+
+# view name -> projection
+WORD_VIEWS: Dict[str, dict] = {
+    # Flashcards (format_card)
+    "card": {"word": 1, "translations": 1, "ipa_transcription": 1, "audio": 1},
+    # /words/{level} list items (format_word)
+    "list": {"word": 1, "translations": 1, "ipa_transcription": 1, "audio": 1},
+    # Test questions
+    "test": {"word": 1, "cerf_level": 1, "tests": 1},
+    # Target words for speaking practice (format_speaking_target)
+    "speaking_target": {"word": 1, "translations": 1},
+    # Everything the vocabulary catalogue indexes
+    "catalogue": {"word": 1, "cerf_level": 1, "translations": 1, "ipa_transcription": 1, "audio": 1},
+}
+
+
+def word_projection(view: str) -> dict:
+    """Projection for a named view; raises KeyError for unknown views."""
+    return WORD_VIEWS[view]
+
+
+def get_audio_filename(url: str) -> str:
+    """Extract filename from audio URL and return proxied path."""
+    if not url:
+        return ""
+    # Extract filename from URL like https://storage.../hackathon/audio/word_m.mp3
+    filename = url.split("/")[-1] if "/" in url else url
+    return f"/audio/{filename}"
+
+
+def english_translation(doc: dict) -> str:
+    """English translation of a word, falling back to the first one available."""
+    translations = doc.get("translations", [])
+    for t in translations:
+        if t.get("language_code") == "en":
+            return t.get("content", "")
+    if translations:
+        return translations[0].get("content", "")
+    return ""
+
+
+def format_word(doc: dict) -> dict:
+    """Shape a word document ("list" view) for the /words/{level} list."""
+    audio = doc.get("audio", {})
+    return {
+        "id": str(doc["_id"]),
+        "original": doc.get("word", ""),
+        "translation": english_translation(doc),
+        "pronunciation": doc.get("ipa_transcription", "").replace("/", ""),
+        "audioMale": get_audio_filename(audio.get("male", "")),
+        "audioFemale": get_audio_filename(audio.get("female", "")),
+        "level": 0
+    }
+
+
+def format_card(doc: dict, language: str = "de-DE") -> dict:
+    """Shape a word document ("card" view) as a flashcard."""
+    audio = doc.get("audio", {})
+    return {
+        "id": str(doc["_id"]),
+        "targetWord": doc.get("word", ""),
+        "translation": english_translation(doc),
+        "phonetic": doc.get("ipa_transcription", "").replace("/", ""),
+        "language": language,
+        "audioMale": get_audio_filename(audio.get("male", "")),
+        "audioFemale": get_audio_filename(audio.get("female", "")),
+    }
+
+
+def format_speaking_target(doc: dict) -> dict:
+    """Shape a word document ("speaking_target" view) as a speaking target word."""
+    return {
+        "wordId": str(doc["_id"]),
+        "word": doc.get("word", ""),
+        "translation": english_translation(doc),
+    }
+
+
+def test_question_id(word_id: str, index: int) -> str:
+    """Stable id of a question: the word id and its position in word.tests."""
+    return f"{word_id}:{index}"
+
+
+def option_texts(options_raw: list) -> list:
+    """Option texts; options are stored either as strings or as {text, is_correct}."""
+    if options_raw and isinstance(options_raw[0], dict):
+        return [opt.get("text", "") for opt in options_raw if isinstance(opt, dict)]
+    return options_raw or []
+
+
+def format_test_question(word_id: str, word: str, index: int, test: dict) -> dict:
+    """Shape one entry of a word's tests array ("test" view) as a TestQuestion."""
+    return {
+        "question_id": test_question_id(word_id, index),
+        "word_id": word_id,
+        "word": word,
+        "question_type": test.get("question_type", "meaning"),
+        "question": test.get("question", ""),
+        "options": option_texts(test.get("options", [])),
+        "correct_answer": test.get("correct_answer", ""),
+        "explanation": test.get("explanation", ""),
+        "difficulty": test.get("difficulty", "easy"),
+    }
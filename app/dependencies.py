@@ -3,32 +3,68 @@ from app.models.user import UserInDB
 from app.db.mongodb import get_database
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.services.firebase_auth import get_user_by_token
+from app.core.cache import TTLCache
+from app.core.config import settings
 from typing import List, Optional
+import hashlib
 
-async def get_current_user(
-    authorization: str = Header(..., description="Bearer <token>"),
-    db: AsyncIOMotorDatabase = Depends(get_database)
-) -> UserInDB:
-    if not authorization.startswith("Bearer "):
-         raise HTTPException(status_code=401, detail="Invalid authorization header")
-    token = authorization.split(" ")[1]
-    
-    # Verify token with Firebase REST API
+# Verified token (by hash) -> resolved user, so repeat calls skip Mongo
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_user(user_id: str) -> int:
+    """
+    Drop cached principals for a user. Called after every in-app write to a
+    user's role, permissions or email; changes made outside the app (scripts,
+    the Mongo shell) take effect within AUTH_CACHE_TTL_SECONDS instead.
+    """
+    return principal_cache.invalidate_where(lambda user: user.id == user_id)
+
+
+async def _resolve_user(token: str, db: AsyncIOMotorDatabase) -> Optional[UserInDB]:
+    cache_key = hashlib.sha256(token.encode()).hexdigest()
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Verify token with Firebase
     firebase_user = await get_user_by_token(token)
     user_id = firebase_user["localId"]
-    
+
     # Fetch from MongoDB
     user_doc = await db["user"].find_one({"_id": user_id})
     if not user_doc:
-        raise HTTPException(status_code=404, detail="User not found in database")
-        
-    return UserInDB(
+        return None
+
+    user = UserInDB(
         id=user_doc["_id"],
         email=user_doc["email"],
         role=user_doc.get("role", "student_free"), # Fallback for legacy users
         permissions=user_doc.get("permissions", []),
         created_at=user_doc.get("created_at")
     )
+    # Never outlive the token itself; without its expiry, don't cache at all
+    expires_at = firebase_user.get("exp")
+    if expires_at is not None:
+        principal_cache.set(cache_key, user, expires_at=expires_at)
+    return user
+
+
+async def get_current_user(
+    authorization: str = Header(..., description="Bearer <token>"),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+) -> UserInDB:
+    if not authorization.startswith("Bearer "):
+         raise HTTPException(status_code=401, detail="Invalid authorization header")
+    token = authorization.split(" ")[1]
+
+    user = await _resolve_user(token, db)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found in database")
+    return user
 
 async def get_optional_user(
     authorization: Optional[str] = Header(None, description="Bearer <token>"),
@@ -37,23 +73,10 @@ async def get_optional_user(
     """Get the current user if authenticated, otherwise return None."""
     if not authorization or not authorization.startswith("Bearer "):
         return None
-    
+
     try:
         token = authorization.split(" ")[1]
-        firebase_user = await get_user_by_token(token)
-        user_id = firebase_user["localId"]
-        
-        user_doc = await db["user"].find_one({"_id": user_id})
-        if not user_doc:
-            return None
-            
-        return UserInDB(
-            id=user_doc["_id"],
-            email=user_doc["email"],
-            role=user_doc.get("role", "student_free"),
-            permissions=user_doc.get("permissions", []),
-            created_at=user_doc.get("created_at")
-        )
+        return await _resolve_user(token, db)
     except Exception:
         return None
 
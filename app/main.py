@@ -1,13 +1,48 @@
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import logging
 import time
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, words, podcasts, audio, flashcards, speaking, tests, users
-from app.db.mongodb import close_mongo_connection
+from app.routers import auth, words, podcasts, audio, flashcards, speaking, tests, users, diagnostics
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, ensure_database_indexes, get_database
 from app.core.config import settings
+from app.core.concurrency import shutdown_executor
+from app.services.http_client import start_http_client, close_http_client
+from app.services.token_verifier import token_verifier
+from app.services.question_bank import question_bank
+from app.services.podcast_jobs import podcast_jobs
+from app.services.speaking_jobs import speaking_jobs
+from app.services.vocabulary import vocabulary
+from app.services.write_behind import write_behind
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_to_mongo()
+    if settings.MONGO_ENSURE_INDEXES:
+        await ensure_database_indexes()
+    await start_http_client()
+    await token_verifier.start()
+    if settings.VOCABULARY_CATALOGUE_ENABLED:
+        await vocabulary.start(await get_database())
+    if settings.QUESTION_BANK_ENABLED:
+        await question_bank.start(await get_database())
+    if settings.WRITE_BEHIND_ENABLED:
+        await write_behind.start(await get_database())
+    await speaking_jobs.start()
+    await podcast_jobs.start()
+    yield
+    await podcast_jobs.stop()
+    await speaking_jobs.stop()
+    await write_behind.stop()
+    await question_bank.stop()
+    await vocabulary.stop()
+    await token_verifier.stop()
+    await close_http_client()
+    await close_mongo_connection()
+    shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
 
 # Configure Logging
 logging.basicConfig(
@@ -67,10 +102,7 @@ app.include_router(audio.router, prefix="/audio", tags=["audio"])
 app.include_router(flashcards.router, prefix="/flashcards", tags=["flashcards"])
 app.include_router(speaking.router, prefix="/speaking", tags=["speaking"])
 app.include_router(tests.router, prefix="/tests", tags=["tests"])
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    await close_mongo_connection()
+app.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"])
 
 @app.get("/")
 def read_root():
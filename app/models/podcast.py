@@ -94,6 +94,14 @@ class PodcastResponse(BaseModel):
     created_at: datetime
 
 
+class PodcastJobResponse(BaseModel):
+    """State of an asynchronous podcast generation (POST /podcasts/)."""
+    id: str = Field(description="Podcast ID, also the job ID")
+    status: str = Field(description="queued, script, audio, upload, quiz, ready or failed")
+    error: Optional[str] = Field(default=None, description="Why generation failed")
+    podcast: Optional[PodcastResponse] = Field(default=None, description="The podcast, once ready")
+
+
 class PodcastListItem(BaseModel):
     id: str
     title: str
@@ -51,6 +51,7 @@ class AudioMetadata(BaseModel):
     bucketUrl: str = Field(description="Public or signed URL to access the audio")
     durationSeconds: float = Field(description="Duration of the audio in seconds")
     sizeBytes: int = Field(description="Size of the audio file in bytes")
+    uploadError: Optional[str] = Field(default=None, description="Set when the recording could not be stored; the analysis is still valid")
     
     @field_validator('durationSeconds')
     @classmethod
@@ -117,6 +118,14 @@ class SpeakingSessionResponse(BaseModel):
     analysis: SpeakingAnalysis
 
 
+class SpeakingJobResponse(BaseModel):
+    """State of an asynchronous speaking analysis (POST /speaking/analyze)."""
+    jobId: str = Field(description="Job ID, also the ID of the speaking session")
+    status: str = Field(description="pending, processing, completed or failed")
+    error: Optional[str] = Field(default=None, description="Why the analysis failed")
+    session: Optional[SpeakingSessionResponse] = Field(default=None, description="The analysed session, once completed")
+
+
 class SpeakingHistoryItem(BaseModel):
     """Summary item for the history list."""
     id: str
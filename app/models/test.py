@@ -5,13 +5,12 @@ from datetime import datetime
 
 class TestQuestion(BaseModel):
     """A single test question from a word's tests array."""
+    question_id: str  # "{word_id}:{index in tests}"
     word_id: str
     word: str
     question_type: str  # "article", "meaning", "collocation", "sentence"
     question: str
     options: List[str]
-    correct_answer: str
-    explanation: str
     difficulty: str  # "easy", "medium"
 
 
@@ -20,6 +19,7 @@ class TestSession(BaseModel):
     level: str
     questions: List[TestQuestion]
     total_questions: int
+    session_token: str  # signed question set, sent back on check and submit
 
 
 class TestLevelInfo(BaseModel):
@@ -33,15 +33,28 @@ class TestLevelInfo(BaseModel):
 
 class AnswerSubmission(BaseModel):
     """A single answer submission."""
-    question_index: int
-    word_id: str
-    question: str
+    question_id: str
+    selected_answer: str
+
+
+class AnswerCheck(BaseModel):
+    """A single answer sent for immediate feedback."""
+    session_token: str
+    question_id: str
     selected_answer: str
+
+
+class AnswerFeedback(BaseModel):
+    """Whether an answer is correct, with the answer key for that question."""
+    question_id: str
+    is_correct: bool
     correct_answer: str
+    explanation: str
 
 
 class TestSubmission(BaseModel):
     """Submission payload for completing a test."""
+    session_token: str
     answers: List[AnswerSubmission]
 
 
@@ -10,6 +10,7 @@ from app.services.firebase_auth import (
     get_user_by_token
 )
 from app.db.mongodb import get_database
+from app.dependencies import invalidate_user
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
 
@@ -38,6 +39,8 @@ async def register(user: UserCreate, db: AsyncIOMotorDatabase = Depends(get_data
         {"$set": user_doc}, 
         upsert=True
     )
+    # The upsert resets role and permissions; don't keep serving the old ones
+    invalidate_user(user_doc["_id"])
     
     return firebase_response
 
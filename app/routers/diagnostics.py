@@ -0,0 +1,38 @@
+"""Runtime diagnostics for operators (connection pools, caches, write buffers, job queues)."""
+
+from fastapi import APIRouter, Depends
+
+from app.core.concurrency import concurrency_stats
+from app.core.outbound import outbound_stats
+from app.core.security import UserRole
+from app.dependencies import RoleChecker, principal_cache
+from app.services.analysis_cache import analysis_cache
+from app.services.http_client import get_pool_stats
+from app.services.level_catalogue import level_catalogue
+from app.services.podcast_jobs import podcast_jobs
+from app.services.question_bank import question_bank
+from app.services.speaking_jobs import speaking_jobs
+from app.services.tts_cache import tts_cache
+from app.services.vocabulary import vocabulary
+from app.services.write_behind import write_behind
+
+router = APIRouter(dependencies=[Depends(RoleChecker([UserRole.ADMIN]))])
+
+
+@router.get("/")
+async def get_diagnostics():
+    """Report connection pool and cache statistics for this worker process."""
+    return {
+        "http_pool": get_pool_stats(),
+        "auth_cache": principal_cache.stats(),
+        "vocabulary": vocabulary.stats(),
+        "level_catalogue": level_catalogue.stats(),
+        "question_bank": question_bank.stats(),
+        "write_behind": write_behind.stats(),
+        "speaking_jobs": speaking_jobs.stats(),
+        "podcast_jobs": podcast_jobs.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "tts_cache": tts_cache.stats(),
+        "concurrency": concurrency_stats(),
+        "outbound": outbound_stats(),
+    }
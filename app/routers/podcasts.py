@@ -1,6 +1,6 @@
 """Podcast API router for German language learning podcasts."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
@@ -12,19 +12,34 @@ from app.db.mongodb import get_database
 from app.core.config import settings
 from app.models.podcast import (
     PodcastCreate,
+    PodcastJobResponse,
     PodcastResponse,
     PodcastListItem,
     VoiceOption,
     PODCAST_CONTEXTS,
     CEFRLevel,
 )
+from app.services.jobs import job_event_stream
 from app.services.podcast_generator import podcast_generator
+from app.services.podcast_jobs import (
+    FAILED,
+    QUEUED,
+    READY,
+    job_state,
+    podcast_jobs,
+    podcast_response,
+    run_podcast_generation,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _audio_url(request: Request, podcast_id: str) -> str:
+    return str(request.url_for("get_podcast_audio", podcast_id=podcast_id))
+
+
 @router.get("/contexts", response_model=List[str])
 async def get_podcast_contexts():
     """Get available context options for podcast generation."""
@@ -68,7 +83,8 @@ async def list_podcasts(
     db = await get_database()
     collection = db.podcasts
 
-    query = {}
+    # Ready podcasts only; documents without a status predate jobs
+    query = {"status": {"$in": [None, READY]}}
     if level:
         query["cefr_level"] = level
     if context:
@@ -84,7 +100,7 @@ async def list_podcasts(
             cefr_level=p["cefr_level"],
             context=p["context"],
             duration=p.get("duration"),
-            audio_url=str(request.url_for("get_podcast_audio", podcast_id=str(p["_id"]))),
+            audio_url=_audio_url(request, str(p["_id"])),
             created_at=p["created_at"]
         )
         for p in podcasts
@@ -104,24 +120,20 @@ async def get_podcast(podcast_id: str, request: Request):
 
     if not podcast:
         raise HTTPException(status_code=404, detail="Podcast not found")
+    if podcast.get("status", READY) != READY:
+        raise HTTPException(status_code=409, detail="Podcast is not ready yet")
 
-    return PodcastResponse(
-        id=str(podcast["_id"]),
-        title=podcast["title"],
-        words=podcast["words"],
-        cefr_level=podcast["cefr_level"],
-        context=podcast["context"],
-        audio_url=str(request.url_for("get_podcast_audio", podcast_id=str(podcast["_id"]))),
-        duration=podcast.get("duration"),
-        transcript=podcast["transcript"],
-        quiz=podcast["quiz"],
-        created_at=podcast["created_at"]
-    )
+    return podcast_response(podcast, _audio_url(request, str(podcast["_id"])))
 
 
-@router.post("/", response_model=PodcastResponse)
-async def create_podcast(podcast_data: PodcastCreate):
-    """Create a new podcast (generates script, audio, and quiz)."""
+@router.post("/", response_model=PodcastJobResponse, status_code=202)
+async def create_podcast(podcast_data: PodcastCreate, request: Request):
+    """
+    Queue a new podcast for generation (script, audio, and quiz).
+    
+    Returns the podcast ID straight away with status "queued". Follow its
+    progress with GET /podcasts/{id}/status or GET /podcasts/{id}/events.
+    """
     db = await get_database()
     collection = db.podcasts
 
@@ -132,53 +144,66 @@ async def create_podcast(podcast_data: PodcastCreate):
             detail=f"Invalid context. Must be one of: {', '.join(PODCAST_CONTEXTS)}"
         )
 
+    # Save the queued podcast; the job fills in script, audio, and quiz
+    podcast_doc = {
+        "status": QUEUED,
+        "words": podcast_data.words,
+        "cefr_level": podcast_data.cefr_level.value,
+        "context": podcast_data.context,
+        "voice_ids": podcast_data.voice_ids,
+        "created_at": datetime.utcnow(),
+        "created_by": None  # Can be set if user auth is added
+    }
+    insert_result = await collection.insert_one(podcast_doc)
+    podcast_id = str(insert_result.inserted_id)
+
     try:
-        # Generate the podcast
-        logger.info(f"Starting podcast generation: {podcast_data.words}")
-        result = await podcast_generator.generate_podcast(
-            words=podcast_data.words,
-            cefr_level=podcast_data.cefr_level.value,
-            context=podcast_data.context,
-            voice_ids=podcast_data.voice_ids
-        )
+        podcast_jobs.submit(podcast_id, lambda: run_podcast_generation(db, podcast_id, podcast_data))
+    except HTTPException:
+        await collection.delete_one({"_id": insert_result.inserted_id})
+        raise
 
-        # Save to database
-        podcast_doc = {
-            "title": result.title,
-            "words": podcast_data.words,
-            "cefr_level": podcast_data.cefr_level.value,
-            "context": podcast_data.context,
-            "voice_ids": podcast_data.voice_ids,
-            "audio_url": result.audio_url,
-            "audio_filename": result.audio_filename,
-            "duration": result.duration,
-            "transcript": result.transcript,
-            "quiz": result.quiz,
-            "created_at": datetime.utcnow(),
-            "created_by": None  # Can be set if user auth is added
-        }
-
-        insert_result = await collection.insert_one(podcast_doc)
-        podcast_id = str(insert_result.inserted_id)
-
-        logger.info(f"Podcast created successfully: {podcast_id}")
-
-        return PodcastResponse(
-            id=podcast_id,
-            title=result.title,
-            words=podcast_data.words,
-            cefr_level=podcast_data.cefr_level.value,
-            context=podcast_data.context,
-            audio_url=result.audio_url,
-            duration=result.duration,
-            transcript=result.transcript,
-            quiz=result.quiz,
-            created_at=podcast_doc["created_at"]
-        )
+    logger.info(f"Podcast generation queued: {podcast_id} ({podcast_data.words})")
+    return job_state(podcast_doc, _audio_url(request, podcast_id))
 
-    except Exception as e:
-        logger.error(f"Podcast generation failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Podcast generation failed: {str(e)}")
+
+async def _find_job(podcast_id: str, request: Request) -> Optional[dict]:
+    if not ObjectId.is_valid(podcast_id):
+        return None
+    db = await get_database()
+    doc = await db.podcasts.find_one({"_id": ObjectId(podcast_id)})
+    return job_state(doc, _audio_url(request, podcast_id)) if doc else None
+
+
+@router.get("/{podcast_id}/status", response_model=PodcastJobResponse)
+async def get_podcast_status(podcast_id: str, request: Request):
+    """Get the generation status of a podcast; includes the podcast once ready."""
+    state = await _find_job(podcast_id, request)
+    if not state:
+        raise HTTPException(status_code=404, detail="Podcast not found")
+    return state
+
+
+@router.get("/{podcast_id}/events")
+async def stream_podcast_status(podcast_id: str, request: Request):
+    """
+    Stream the generation status of a podcast as server-sent events.
+    
+    Emits a "status" event (same shape as GET /podcasts/{podcast_id}/status)
+    on every stage change and closes after "ready" or "failed".
+    """
+    if not await _find_job(podcast_id, request):
+        raise HTTPException(status_code=404, detail="Podcast not found")
+    return StreamingResponse(
+        job_event_stream(
+            podcast_jobs,
+            podcast_id,
+            lambda: _find_job(podcast_id, request),
+            terminal=(READY, FAILED),
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 
 @router.delete("/{podcast_id}")
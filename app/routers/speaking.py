@@ -1,13 +1,17 @@
 """Speaking practice endpoints for language learning."""
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import json
 import logging
 
+from app.core.config import settings
 from app.db.mongodb import get_database
+from app.db.words import format_speaking_target, word_projection
 from app.dependencies import get_current_user
 from app.models.user import UserInDB
 from app.models.speaking import (
@@ -19,8 +23,19 @@ from app.models.speaking import (
     SpeakingHistoryItem,
     SpeakingHistoryResponse,
     SpeakingQuestionResponse,
+    SpeakingJobResponse,
 )
-from app.services.speaking_service import speaking_service
+from app.services.jobs import job_event_stream
+from app.services.speaking_jobs import (
+    COMPLETED,
+    PENDING,
+    job_state,
+    run_speaking_analysis,
+    session_response,
+    speaking_jobs,
+)
+from app.services.speaking_service import MAX_AUDIO_SECONDS, speaking_service
+from app.services.upload_stream import read_audio_upload
 
 logger = logging.getLogger(__name__)
 
@@ -205,7 +220,7 @@ async def get_practice_session(
         
         word_pipeline = [
             {"$sample": {"size": 5}},
-            {"$limit": 5}
+            {"$project": word_projection("speaking_target")}
         ]
         
         cursor = db["words"].aggregate(word_pipeline)
@@ -213,24 +228,11 @@ async def get_practice_session(
         word_dicts = []
         
         async for doc in cursor:
-            translation = ""
-            translations = doc.get("translations", [])
-            for t in translations:
-                if t.get("language_code") == "en":
-                    translation = t.get("content", "")
-                    break
-            if not translation and translations:
-                translation = translations[0].get("content", "")
-            
-            word_text = doc.get("word", "")
-            words.append(TargetWord(
-                wordId=str(doc["_id"]),
-                word=word_text,
-                translation=translation
-            ))
+            target = format_speaking_target(doc)
+            words.append(TargetWord(**target))
             word_dicts.append({
-                "word": word_text,
-                "translation": translation
+                "word": target["word"],
+                "translation": target["translation"]
             })
         
         if len(words) < 3:
@@ -241,7 +243,7 @@ async def get_practice_session(
         
         # Generate a contextual question based on the words
         try:
-            question_text = speaking_service.generate_question(word_dicts)
+            question_text = await speaking_service.agenerate_question(word_dicts)
         except Exception as e:
             logger.error(f"Failed to generate question: {e}")
             question_text = "Beschreiben Sie einen typischen Tag in Ihrem Leben und verwenden Sie dabei die angegebenen Wörter."
@@ -259,24 +261,61 @@ async def get_practice_session(
         raise HTTPException(status_code=500, detail="Failed to create practice session")
 
 
-@router.post("/analyze", response_model=SpeakingSessionResponse)
+# Documents the multipart body, which the endpoint parses from the stream itself
+ANALYZE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["audio", "questionText", "targetWords"],
+                    "properties": {
+                        "audio": {"type": "string", "format": "binary", "description": "Audio file (MP3, WAV, or WebM)"},
+                        "questionText": {"type": "string", "description": "The question that was asked"},
+                        "targetWords": {"type": "string", "description": "JSON array of target words"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+@router.post(
+    "/analyze",
+    response_model=SpeakingJobResponse,
+    status_code=202,
+    openapi_extra=ANALYZE_REQUEST_BODY,
+)
 async def analyze_speaking(
-    audio: UploadFile = File(..., description="Audio file (MP3, WAV, or WebM)"),
-    questionText: str = Form(..., description="The question that was asked"),
-    targetWords: str = Form(..., description="JSON array of target words"),
+    request: Request,
     user: UserInDB = Depends(get_current_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Process and analyze a speaking practice submission.
+    Accept a speaking practice submission for analysis.
     
-    1. Validates audio duration (max 60 seconds)
-    2. Uploads audio to Hetzner S3
-    3. Transcribes audio using ElevenLabs
-    4. Analyzes response using OpenAI
-    5. Saves session to MongoDB
+    1. Streams the upload, rejecting files over the size cap and recordings
+       over 60 seconds while they are still being received
+    2. Saves a pending session to MongoDB and returns its ID as the job ID
+    
+    A background worker then uploads the audio to Hetzner S3, transcribes it
+    using ElevenLabs and analyzes it using OpenAI. Follow the job with
+    GET /speaking/jobs/{jobId} or GET /speaking/jobs/{jobId}/events.
     """
     try:
+        upload = await read_audio_upload(
+            request,
+            file_field="audio",
+            max_bytes=settings.SPEAKING_MAX_UPLOAD_BYTES,
+            max_seconds=MAX_AUDIO_SECONDS,
+        )
+        questionText = upload.fields.get("questionText")
+        targetWords = upload.fields.get("targetWords")
+        if questionText is None or targetWords is None:
+            raise HTTPException(status_code=400, detail="questionText and targetWords are required")
+        
         # Parse target words from JSON
         try:
             target_words_data = json.loads(targetWords)
@@ -291,74 +330,51 @@ async def analyze_speaking(
         except json.JSONDecodeError:
             raise HTTPException(status_code=400, detail="Invalid targetWords JSON format")
         
-        # Read audio file
-        audio_bytes = await audio.read()
+        audio_bytes = upload.file_bytes
         if not audio_bytes:
             raise HTTPException(status_code=400, detail="Empty audio file")
         
-        # Validate audio duration (max 60 seconds)
-        try:
-            duration_seconds = speaking_service.validate_audio_duration(audio_bytes)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        
-        # Upload audio to S3
-        try:
-            hetzner_path, bucket_url = speaking_service.upload_audio_to_s3(audio_bytes)
-        except ValueError as e:
-            raise HTTPException(status_code=500, detail=str(e))
-        
-        # Transcribe audio
-        try:
-            transcription = speaking_service.transcribe_audio(audio_bytes)
-        except ValueError as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        # Formats the header probe does not know are decoded to measure them
+        duration_seconds = upload.duration_seconds
+        if duration_seconds is None:
+            try:
+                duration_seconds = await speaking_service.avalidate_audio_duration(audio_bytes)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
         
-        # Analyze speaking
-        try:
-            analysis = speaking_service.analyze_speaking(
-                transcription=transcription,
-                question=questionText,
-                target_words=target_words
-            )
-        except Exception as e:
-            logger.error(f"Analysis failed: {e}")
-            raise HTTPException(status_code=500, detail="Failed to analyze speaking response")
-        
-        # Create audio metadata
-        audio_metadata = AudioMetadata(
-            hetznerPath=hetzner_path,
-            bucketUrl=bucket_url,
-            durationSeconds=duration_seconds,
-            sizeBytes=len(audio_bytes)
-        )
-        
-        # Save to MongoDB
+        # Save the pending session; the job fills in audio location and analysis
         session_doc = {
             "userId": user.id,
             "createdAt": datetime.utcnow(),
+            "status": PENDING,
             "question": {
                 "text": questionText,
                 "audioUrl": None
             },
             "targetWords": [w.model_dump() for w in target_words],
-            "audio": audio_metadata.model_dump(),
-            "analysis": analysis.model_dump()
+            "audio": AudioMetadata(
+                hetznerPath="",
+                bucketUrl="",
+                durationSeconds=duration_seconds,
+                sizeBytes=len(audio_bytes)
+            ).model_dump(),
         }
         
         result = await db["speaking_sessions"].insert_one(session_doc)
         session_id = str(result.inserted_id)
         
-        logger.info(f"Speaking session created: {session_id} for user {user.id}")
+        try:
+            speaking_jobs.submit(
+                session_id,
+                lambda: run_speaking_analysis(db, session_id, audio_bytes, questionText, target_words)
+            )
+        except HTTPException:
+            await db["speaking_sessions"].delete_one({"_id": result.inserted_id})
+            raise
         
-        return SpeakingSessionResponse(
-            id=session_id,
-            createdAt=session_doc["createdAt"],
-            question=SpeakingQuestion(text=questionText),
-            targetWords=target_words,
-            audio=audio_metadata,
-            analysis=analysis
-        )
+        logger.info(f"Speaking analysis queued: {session_id} for user {user.id}")
+        
+        return SpeakingJobResponse(jobId=session_id, status=PENDING)
         
     except HTTPException:
         raise
@@ -367,6 +383,49 @@ async def analyze_speaking(
         raise HTTPException(status_code=500, detail="Failed to process speaking submission")
 
 
+async def _find_job(db: AsyncIOMotorDatabase, job_id: str, user: UserInDB) -> Optional[dict]:
+    if not ObjectId.is_valid(job_id):
+        return None
+    doc = await db["speaking_sessions"].find_one({"_id": ObjectId(job_id), "userId": user.id})
+    return job_state(doc) if doc else None
+
+
+@router.get("/jobs/{job_id}", response_model=SpeakingJobResponse)
+async def get_speaking_job(
+    job_id: str,
+    user: UserInDB = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Get the status of a speaking analysis, with the session once completed.
+    """
+    state = await _find_job(db, job_id, user)
+    if not state:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return state
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_speaking_job(
+    job_id: str,
+    user: UserInDB = Depends(get_current_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Stream the status of a speaking analysis as server-sent events.
+    
+    Emits a "status" event (same shape as GET /speaking/jobs/{job_id}) on
+    every change and closes after "completed" or "failed".
+    """
+    if not await _find_job(db, job_id, user):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return StreamingResponse(
+        job_event_stream(speaking_jobs, job_id, lambda: _find_job(db, job_id, user)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @router.get("/history", response_model=SpeakingHistoryResponse)
 async def get_speaking_history(
     user: UserInDB = Depends(get_current_user),
@@ -380,12 +439,15 @@ async def get_speaking_history(
     Returns a paginated list of past sessions sorted by date (newest first).
     """
     try:
+        # Analysed sessions only; documents without a status predate jobs
+        query = {"userId": user.id, "status": {"$in": [None, COMPLETED]}}
+        
         # Count total sessions for this user
-        total = await db["speaking_sessions"].count_documents({"userId": user.id})
+        total = await db["speaking_sessions"].count_documents(query)
         
         # Fetch sessions sorted by createdAt descending
         cursor = db["speaking_sessions"].find(
-            {"userId": user.id}
+            query
         ).sort("createdAt", -1).skip(skip).limit(limit)
         
         sessions = []
@@ -423,8 +485,6 @@ async def get_speaking_session(
     """
     Get details of a specific speaking session.
     """
-    from bson import ObjectId
-    
     try:
         doc = await db["speaking_sessions"].find_one({
             "_id": ObjectId(session_id),
@@ -433,20 +493,10 @@ async def get_speaking_session(
         
         if not doc:
             raise HTTPException(status_code=404, detail="Session not found")
+        if doc.get("status", COMPLETED) != COMPLETED:
+            raise HTTPException(status_code=409, detail="Session has not been analysed yet")
         
-        return SpeakingSessionResponse(
-            id=str(doc["_id"]),
-            createdAt=doc.get("createdAt", datetime.utcnow()),
-            question=SpeakingQuestion(
-                text=doc.get("question", {}).get("text", ""),
-                audioUrl=doc.get("question", {}).get("audioUrl")
-            ),
-            targetWords=[
-                TargetWord(**w) for w in doc.get("targetWords", [])
-            ],
-            audio=AudioMetadata(**doc.get("audio", {})),
-            analysis=doc.get("analysis", {})
-        )
+        return session_response(doc)
         
     except HTTPException:
         raise
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from app.db.mongodb import get_database
+from app.core.config import settings
+from app.db.words import format_test_question, word_projection
 from app.dependencies import get_current_user, get_optional_user
 from app.models.user import UserInDB
 from app.models.test import (
@@ -14,11 +18,105 @@ from app.models.test import (
     TestSubmission,
     TestResultResponse,
     TestHistoryItem,
+    AnswerCheck,
+    AnswerFeedback,
+    AnswerSubmission,
 )
+from app.services.level_catalogue import level_catalogue
+from app.services.question_bank import question_bank
+from app.services.session_tokens import TestSessionClaims, issue_session_token, verify_session_token
+from app.services.vocabulary import get_words_version
+from app.services.write_behind import write_behind
 
 router = APIRouter()
 
 QUESTIONS_PER_TEST = 20
+# Bounds of the questions_per_test user setting
+MIN_QUESTIONS_PER_TEST = 5
+MAX_QUESTIONS_PER_TEST = 50
+# Result ids a test summary remembers to make its updates idempotent
+RECENT_RESULT_IDS = 100
+SUMMARY_PROJECTION = {"recent_result_ids": 0}
+
+
+def _is_valid_field_name(level: str) -> bool:
+    return bool(level) and "." not in level and not level.startswith("$")
+
+
+async def _build_summary(db: AsyncIOMotorDatabase, user_id: str) -> dict:
+    """
+    Create a user's test_summaries document from their stored results, then
+    fold in results stored while it was being built.
+    """
+    pipeline = [
+        {"$match": {"userId": user_id}},
+        {
+            "$group": {
+                "_id": "$level",
+                "best_score": {"$max": "$score"},
+                "attempts": {"$sum": 1},
+                "result_ids": {"$push": "$_id"}
+            }
+        }
+    ]
+    levels, counted = {}, []
+    async for doc in db["test_results"].aggregate(pipeline):
+        counted += doc["result_ids"]
+        if _is_valid_field_name(doc["_id"]):
+            levels[doc["_id"]] = {"best_score": doc["best_score"], "attempts": doc["attempts"]}
+
+    # Their own summary updates may still be on the way; the guard skips them
+    recent = sorted(counted)[-RECENT_RESULT_IDS:]
+    summary = {"_id": user_id, "levels": levels, "recent_result_ids": recent}
+    try:
+        await db["test_summaries"].insert_one(summary)
+    except DuplicateKeyError:
+        # Built concurrently
+        return await db["test_summaries"].find_one({"_id": user_id}, SUMMARY_PROJECTION)
+
+    # Results whose update ran before the summary existed matched nothing
+    missed = db["test_results"].find(
+        {"userId": user_id, "_id": {"$nin": counted}}, {"level": 1, "score": 1}
+    )
+    updates = [
+        update async for doc in missed
+        if (update := _summary_update(user_id, doc["level"], doc["_id"], doc["score"]))
+    ]
+    if updates:
+        await db["test_summaries"].bulk_write(updates, ordered=False)
+        return await db["test_summaries"].find_one({"_id": user_id}, SUMMARY_PROJECTION)
+    return summary
+
+
+async def _user_level_stats(db: AsyncIOMotorDatabase, user_id: str) -> Dict[str, dict]:
+    """
+    Best score and attempt count per level for a user.
+
+    Served from the user's test_summaries document, which submit_test keeps
+    current. Users without one get it built from test_results.
+    """
+    summary = await db["test_summaries"].find_one({"_id": user_id}, SUMMARY_PROJECTION)
+    if not summary:
+        summary = await _build_summary(db, user_id)
+    return summary.get("levels", {})
+
+
+def _summary_update(user_id: str, level: str, result_id: ObjectId, score: int) -> Optional[UpdateOne]:
+    """
+    Folds a new result into the user's summary, if one has been built yet.
+    The ids of the last RECENT_RESULT_IDS results folded in guard against
+    applying it twice, e.g. when a write-behind flush is retried.
+    """
+    if not _is_valid_field_name(level):
+        return None
+    return UpdateOne(
+        {"_id": user_id, "recent_result_ids": {"$ne": result_id}},
+        {
+            "$max": {f"levels.{level}.best_score": score},
+            "$inc": {f"levels.{level}.attempts": 1},
+            "$push": {"recent_result_ids": {"$each": [result_id], "$slice": -RECENT_RESULT_IDS}}
+        }
+    )
 
 
 @router.get("/debug")
@@ -60,25 +158,10 @@ async def get_test_levels(
 ):
     """Get available CEFR levels with test question counts and user's best scores."""
     
-    # Aggregate words by cerf_level that have test questions
-    pipeline = [
-        {"$match": {"tests": {"$exists": True, "$type": "array", "$ne": []}}},
-        {"$unwind": "$tests"},
-        {
-            "$group": {
-                "_id": "$cerf_level",
-                "question_count": {"$sum": 1}
-            }
-        },
-        {"$sort": {"_id": 1}}
-    ]
-    
-    cursor = db["words"].aggregate(pipeline)
     levels = []
-    
-    async for doc in cursor:
-        level = doc["_id"]
-        if not level:
+    for stats in await level_catalogue.levels(db):
+        level = stats["level"]
+        if not stats["question_count"]:
             continue
             
         # Determine theme based on level
@@ -92,83 +175,106 @@ async def get_test_levels(
         
         level_info = TestLevelInfo(
             level=level,
-            question_count=doc["question_count"],
+            question_count=stats["question_count"],
             theme=theme,
         )
         levels.append(level_info)
     
-    # If user is authenticated, get their best scores
+    # If user is authenticated, merge in their best scores and attempts
     if user:
+        level_stats = await _user_level_stats(db, user.id)
         for level_info in levels:
-            # Get best score for this level
-            best_result = await db["test_results"].find_one(
-                {"userId": user.id, "level": level_info.level},
-                sort=[("score", -1)]
-            )
-            if best_result:
-                level_info.best_score = best_result.get("score")
-            
-            # Count attempts
-            attempts = await db["test_results"].count_documents(
-                {"userId": user.id, "level": level_info.level}
-            )
-            level_info.attempts = attempts
+            stats = level_stats.get(level_info.level)
+            if stats:
+                level_info.best_score = stats.get("best_score")
+                level_info.attempts = stats.get("attempts", 0)
     
     return levels
 
 
+async def _questions_per_test(db: AsyncIOMotorDatabase, user: Optional[UserInDB]) -> int:
+    """The user's questions_per_test setting, clamped; the default for anonymous users."""
+    if not user:
+        return QUESTIONS_PER_TEST
+    user_doc = await db["user"].find_one({"_id": user.id}, {"settings.questions_per_test": 1})
+    count = ((user_doc or {}).get("settings") or {}).get("questions_per_test")
+    if not isinstance(count, int):
+        return QUESTIONS_PER_TEST
+    return max(MIN_QUESTIONS_PER_TEST, min(MAX_QUESTIONS_PER_TEST, count))
+
+
+async def _sample_questions(
+    db: AsyncIOMotorDatabase, level: str, size: int, difficulty: Optional[str]
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    Random questions for a level, from the question bank or straight from
+    Mongo, and the words version they were taken from.
+    """
+    if settings.QUESTION_BANK_ENABLED:
+        await question_bank.ensure_loaded(db)
+        return question_bank.sample(level, size, difficulty), question_bank.version
+
+    # Read before sampling, so the stamp is never newer than the words sampled
+    version = await get_words_version(db)
+
+    pipeline = [
+        {"$match": {"cerf_level": level, "tests": {"$exists": True, "$type": "array", "$ne": []}}},
+        {"$project": word_projection("test")},
+        {"$unwind": {"path": "$tests", "includeArrayIndex": "test_index"}},
+    ]
+    if difficulty:
+        pipeline.append({"$match": {"tests.difficulty": difficulty}})
+    pipeline.append({"$sample": {"size": size}})
+
+    questions = [
+        format_test_question(str(doc["_id"]), doc.get("word", ""), doc["test_index"], doc["tests"])
+        async for doc in db["words"].aggregate(pipeline)
+    ]
+    return questions, version
+
+
+async def _answer_key(
+    db: AsyncIOMotorDatabase, question_ids: List[str], words_version: Optional[int]
+) -> Dict[str, dict]:
+    """
+    Questions (with correct_answer and explanation) by id, for a session
+    sampled from `words_version`. Served from the question bank when it holds
+    that version; otherwise, e.g. while a reload is pending or after one, and
+    for ids it does not know, they cost one words read.
+    """
+    key = {}
+    if settings.QUESTION_BANK_ENABLED:
+        await question_bank.ensure_loaded(db)
+        if question_bank.version == words_version:
+            for question_id in question_ids:
+                question = question_bank.get(question_id)
+                if question:
+                    key[question_id] = question
+
+    word_ids = {qid.split(":")[0] for qid in question_ids if qid not in key}
+    word_ids = [ObjectId(wid) for wid in word_ids if ObjectId.is_valid(wid)]
+    if word_ids:
+        cursor = db["words"].find({"_id": {"$in": word_ids}}, word_projection("test"))
+        async for doc in cursor:
+            word_id = str(doc["_id"])
+            for index, test in enumerate(doc.get("tests", [])):
+                if isinstance(test, dict):
+                    question = format_test_question(word_id, doc.get("word", ""), index, test)
+                    key.setdefault(question["question_id"], question)
+    return key
+
+
 @router.get("/{level}/start", response_model=TestSession)
 async def start_test(
     level: str,
+    difficulty: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_database),
+    user: Optional[UserInDB] = Depends(get_optional_user),
 ):
-    """Start a new test session for a specific CEFR level with 20 random questions."""
-    
-    # Fetch random questions from words at this level
-    # Options are stored as [{text: "...", is_correct: true/false}, ...] 
-    # We need to extract just the text values
-    pipeline = [
-        {"$match": {"cerf_level": level, "tests": {"$exists": True, "$type": "array", "$ne": []}}},
-        {"$unwind": "$tests"},
-        {"$sample": {"size": QUESTIONS_PER_TEST}},
-        {
-            "$project": {
-                "word_id": {"$toString": "$_id"},
-                "word": "$word",
-                "question_type": "$tests.question_type",
-                "question": "$tests.question",
-                "options_raw": "$tests.options",
-                "correct_answer": "$tests.correct_answer",
-                "explanation": "$tests.explanation",
-                "difficulty": "$tests.difficulty"
-            }
-        }
-    ]
-    
-    cursor = db["words"].aggregate(pipeline)
-    questions = []
-    
-    async for doc in cursor:
-        # Extract option texts from the options array
-        # Options can be either strings or objects with 'text' field
-        options_raw = doc.get("options_raw", [])
-        if options_raw and isinstance(options_raw[0], dict):
-            # Options are objects like {text: "...", is_correct: true/false}
-            options = [opt.get("text", "") for opt in options_raw if isinstance(opt, dict)]
-        else:
-            # Options are already strings
-            options = options_raw if options_raw else []
-        
-        questions.append(TestQuestion(
-            word_id=doc["word_id"],
-            word=doc.get("word", ""),
-            question_type=doc.get("question_type", "meaning"),
-            question=doc.get("question", ""),
-            options=options,
-            correct_answer=doc.get("correct_answer", ""),
-            explanation=doc.get("explanation", ""),
-            difficulty=doc.get("difficulty", "easy"),
-        ))
+    """Start a new test session for a CEFR level with the user's questions_per_test random questions."""
+    size = await _questions_per_test(db, user)
+    sampled, words_version = await _sample_questions(db, level, size, difficulty)
+    questions = [TestQuestion(**q) for q in sampled]
     
     if not questions:
         raise HTTPException(
@@ -180,40 +286,104 @@ async def start_test(
         level=level,
         questions=questions,
         total_questions=len(questions),
+        session_token=issue_session_token(level, [q.question_id for q in questions], words_version),
     )
 
 
-@router.post("/{level}/submit", response_model=TestResultResponse)
-async def submit_test(
+def _check_id(session_id: str, question_id: str) -> str:
+    return f"{session_id}:{question_id}"
+
+
+@router.post("/{level}/check", response_model=AnswerFeedback)
+async def check_answer(
     level: str,
-    submission: TestSubmission,
+    check: AnswerCheck,
     db: AsyncIOMotorDatabase = Depends(get_database),
-    user: UserInDB = Depends(get_current_user),
 ):
-    """Submit test answers and store results."""
+    """
+    Immediate feedback for one answer of a test session. The first answer
+    checked for a question is recorded and is the one submit_test grades, so
+    revealing the key cannot be turned into a better score.
+
+    The key itself comes from the question bank. The one write per check is
+    that record: sessions are stateless, so nothing else can tell a later
+    check or submit, possibly on another worker, which answer came first.
+    """
+    session_id, question_ids, words_version = verify_session_token(check.session_token, level)
+    if check.question_id not in question_ids:
+        raise HTTPException(status_code=400, detail="Question is not part of this test session")
+
+    question = (await _answer_key(db, [check.question_id], words_version)).get(check.question_id)
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+
+    recorded = await db["test_answer_checks"].find_one_and_update(
+        {"_id": _check_id(session_id, check.question_id)},
+        {"$setOnInsert": {"selectedAnswer": check.selected_answer, "createdAt": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    selected_answer = recorded["selectedAnswer"]
+
+    return AnswerFeedback(
+        question_id=check.question_id,
+        is_correct=selected_answer == question["correct_answer"],
+        correct_answer=question["correct_answer"],
+        explanation=question["explanation"],
+    )
+
+
+async def _checked_answers(db: AsyncIOMotorDatabase, session_id: str, question_ids: List[str]) -> Dict[str, str]:
+    """Answers recorded by check_answer for a session, by question id."""
+    check_ids = {_check_id(session_id, qid): qid for qid in question_ids}
+    cursor = db["test_answer_checks"].find({"_id": {"$in": list(check_ids)}})
+    return {check_ids[doc["_id"]]: doc["selectedAnswer"] async for doc in cursor}
+
+
+async def _grade(
+    db: AsyncIOMotorDatabase,
+    user: UserInDB,
+    level: str,
+    claims: TestSessionClaims,
+    answers: List[AnswerSubmission],
+) -> dict:
+    """The test_results document for a session's answers, graded against the answer key."""
+    answer_key = await _answer_key(db, claims.question_ids, claims.words_version)
+    
+    # Answers already checked stand; otherwise the first answer per question counts
+    selected = {
+        question_id: answer
+        for question_id, answer in (await _checked_answers(db, claims.session_id, claims.question_ids)).items()
+        if question_id in answer_key
+    }
+    for answer in answers:
+        if answer.question_id in answer_key:
+            selected.setdefault(answer.question_id, answer.selected_answer)
     
-    # Calculate score
     correct_count = 0
     answers_data = []
     
-    for answer in submission.answers:
-        is_correct = answer.selected_answer == answer.correct_answer
+    for question_id, selected_answer in selected.items():
+        question = answer_key[question_id]
+        is_correct = selected_answer == question["correct_answer"]
         if is_correct:
             correct_count += 1
         
         answers_data.append({
-            "wordId": answer.word_id,
-            "question": answer.question,
-            "selectedAnswer": answer.selected_answer,
-            "correctAnswer": answer.correct_answer,
+            "questionId": question_id,
+            "wordId": question["word_id"],
+            "question": question["question"],
+            "selectedAnswer": selected_answer,
+            "correctAnswer": question["correct_answer"],
             "isCorrect": is_correct,
         })
     
-    total_questions = len(submission.answers)
+    # Unanswered questions count against the score
+    total_questions = len(claims.question_ids)
     percentage = round((correct_count / total_questions) * 100) if total_questions > 0 else 0
     
-    # Store result in database
-    result_doc = {
+    return {
+        "_id": ObjectId(),
         "userId": user.id,
         "level": level,
         "score": percentage,
@@ -222,15 +392,47 @@ async def submit_test(
         "completedAt": datetime.utcnow(),
         "answers": answers_data,
     }
-    
-    await db["test_results"].insert_one(result_doc)
+
+
+@router.post("/{level}/submit", response_model=TestResultResponse)
+async def submit_test(
+    level: str,
+    submission: TestSubmission,
+    db: AsyncIOMotorDatabase = Depends(get_database),
+    user: UserInDB = Depends(get_current_user),
+):
+    """Grade test answers against the server-side answer key and store results."""
+    claims = verify_session_token(submission.session_token, level)
+
+    # A session can be submitted once. Claim it before grading so concurrent
+    # submits cannot both store a result; give it back if nothing was stored.
+    try:
+        await db["test_session_uses"].insert_one(
+            {"_id": claims.session_id, "userId": user.id, "usedAt": datetime.utcnow()}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Test session has already been submitted")
+
+    try:
+        result_doc = await _grade(db, user, level, claims, submission.answers)
+        summary_update = _summary_update(user.id, level, result_doc["_id"], result_doc["score"])
+        if settings.WRITE_BEHIND_ENABLED and write_behind.add_result(result_doc, summary_update):
+            summary_update = None
+        else:
+            await db["test_results"].insert_one(result_doc)
+    except Exception:
+        await db["test_session_uses"].delete_one({"_id": claims.session_id})
+        raise
+
+    if summary_update:
+        await db["test_summaries"].bulk_write([summary_update])
     
     return TestResultResponse(
         level=level,
-        score=percentage,
-        total_questions=total_questions,
-        correct_answers=correct_count,
-        percentage=percentage,
+        score=result_doc["score"],
+        total_questions=result_doc["totalQuestions"],
+        correct_answers=result_doc["correctAnswers"],
+        percentage=result_doc["score"],
     )
 
 
@@ -243,12 +445,17 @@ async def get_test_history(
 ):
     """Get the user's test history."""
     
-    cursor = db["test_results"].find(
-        {"userId": user.id}
-    ).sort("completedAt", -1).skip(skip).limit(limit)
+    # Results still in the write-behind buffer are the newest ones
+    pending = write_behind.pending_results(user.id)
+    docs = pending[skip:skip + limit]
+    if len(docs) < limit:
+        cursor = db["test_results"].find(
+            {"userId": user.id}
+        ).sort("completedAt", -1).skip(max(0, skip - len(pending))).limit(limit - len(docs))
+        docs += await cursor.to_list(length=limit - len(docs))
     
     history = []
-    async for doc in cursor:
+    for doc in docs:
         history.append(TestHistoryItem(
             id=str(doc["_id"]),
             level=doc["level"],
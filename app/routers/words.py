@@ -2,6 +2,10 @@ from fastapi import APIRouter, Depends
 from app.dependencies import RoleChecker
 from app.core.security import UserRole
 from app.db.mongodb import get_database
+from app.core.config import settings
+from app.db.words import format_word, word_projection
+from app.services.level_catalogue import level_catalogue
+from app.services.vocabulary import vocabulary
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import List
 
@@ -9,25 +13,10 @@ router = APIRouter()
 
 @router.get("/")
 async def get_word_decks(db: AsyncIOMotorDatabase = Depends(get_database)):
-    # Aggregate words by cerf_level to create "decks"
-    pipeline = [
-        {
-            "$group": {
-                "_id": "$cerf_level",
-                "wordCount": {"$sum": 1}
-            }
-        },
-        {"$sort": {"_id": 1}}
-    ]
-
-    cursor = db["words"].aggregate(pipeline)
     decks = []
-    async for doc in cursor:
-        level = doc["_id"]
-        # Skip if level is null or empty
-        if not level:
-            continue
-            
+    for stats in await level_catalogue.levels(db):
+        level = stats["level"]
+
         # Determine theme mapping based on level
         theme = "slate"
         if level.startswith("A"):
@@ -43,7 +32,7 @@ async def get_word_decks(db: AsyncIOMotorDatabase = Depends(get_database)):
             "description": f"Common words for CEFR level {level}.",
             "level": level,
             "category": "General", 
-            "wordCount": doc["wordCount"],
+            "wordCount": stats["word_count"],
             "progress": 0, 
             "theme": theme,
             "isCustom": False,
@@ -52,44 +41,17 @@ async def get_word_decks(db: AsyncIOMotorDatabase = Depends(get_database)):
     
     return decks
 
-def get_audio_filename(url: str) -> str:
-    """Extract filename from audio URL and return proxied path."""
-    if not url:
-        return ""
-    # Extract filename from URL like https://storage.../hackathon/audio/word_m.mp3
-    filename = url.split("/")[-1] if "/" in url else url
-    return f"/audio/{filename}"
-
-
 @router.get("/{level}")
 async def get_words_by_level(level: str, db: AsyncIOMotorDatabase = Depends(get_database)):
-    cursor = db["words"].find({"cerf_level": level})
-    words = []
-    async for doc in cursor:
-        # Try to find English translation first
-        translation = ""
-        translations = doc.get("translations", [])
-        for t in translations:
-            if t.get("language_code") == "en":
-                translation = t.get("content", "")
-                break
-        if not translation and translations:
-            translation = translations[0].get("content", "")
-
-        # Get audio URLs and convert to proxy paths
-        audio = doc.get("audio", {})
+    if settings.VOCABULARY_CATALOGUE_ENABLED:
+        await vocabulary.ensure_loaded(db)
+        return vocabulary.words(level)
 
-        words.append({
-            "id": str(doc["_id"]),
-            "original": doc.get("word", ""),
-            "translation": translation,
-            "pronunciation": doc.get("ipa_transcription", "").replace("/", ""),
-            "audioMale": get_audio_filename(audio.get("male", "")),
-            "audioFemale": get_audio_filename(audio.get("female", "")),
-            "level": 0
-        })
-    return words
+    cursor = db["words"].find({"cerf_level": level}, word_projection("list"))
+    return [format_word(doc) async for doc in cursor]
 
 @router.post("/", dependencies=[Depends(RoleChecker([UserRole.ADMIN, UserRole.TEACHER]))])
 async def create_word_entry():
+    # Nothing is written yet. Once a word is, follow the write with
+    # bump_words_version(db) and level_catalogue.invalidate() so catalogues reload.
     return {"message": "Word created successfully"}
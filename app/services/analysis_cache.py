@@ -0,0 +1,102 @@
+"""Cache of speaking analyses, so resubmitted answers skip the LLM."""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import List, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.speaking import SpeakingAnalysis, TargetWord
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _collapse(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_text(text: str) -> str:
+    """Casefolded, punctuation stripped and whitespace collapsed."""
+    stripped = "".join(
+        " " if unicodedata.category(ch).startswith("P") else ch
+        for ch in text.casefold()
+    )
+    return _collapse(stripped)
+
+
+def _key(transcription: str, question: str, target_words: List[TargetWord]) -> str:
+    words = sorted((w.word.casefold(), w.translation.casefold()) for w in target_words)
+    raw = json.dumps([transcription, _collapse(question), words], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Two tiers keyed on (transcription, question, sorted target words): an
+    exact tier on the whitespace-collapsed transcription, then optionally a
+    normalized tier that also ignores case and punctuation. A hit returns the
+    stored analysis with the new transcription put in.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, normalized: bool):
+        self.exact = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.normalized: Optional[TTLCache] = TTLCache(maxsize=maxsize, ttl=ttl) if normalized else None
+        self.lookups = 0
+
+    def _keys(self, transcription: str, question: str, target_words: List[TargetWord]):
+        exact = _key(_collapse(transcription), question, target_words)
+        if self.normalized is None:
+            return exact, None
+        return exact, _key(normalize_text(transcription), question, target_words)
+
+    def get(
+        self,
+        transcription: str,
+        question: str,
+        target_words: List[TargetWord],
+    ) -> Optional[SpeakingAnalysis]:
+        self.lookups += 1
+        exact_key, normalized_key = self._keys(transcription, question, target_words)
+        cached = self.exact.get(exact_key)
+        if cached is None and self.normalized is not None:
+            cached = self.normalized.get(normalized_key)
+        if cached is None:
+            return None
+        return SpeakingAnalysis(**{**cached, "transcription": transcription})
+
+    def set(
+        self,
+        transcription: str,
+        question: str,
+        target_words: List[TargetWord],
+        analysis: SpeakingAnalysis,
+    ) -> None:
+        exact_key, normalized_key = self._keys(transcription, question, target_words)
+        value = analysis.model_dump()
+        self.exact.set(exact_key, value)
+        if self.normalized is not None:
+            self.normalized.set(normalized_key, value)
+
+    def clear(self) -> None:
+        self.exact.clear()
+        if self.normalized is not None:
+            self.normalized.clear()
+
+    def stats(self) -> dict:
+        hits = self.exact.hits + (self.normalized.hits if self.normalized is not None else 0)
+        return {
+            "lookups": self.lookups,
+            "hits": hits,
+            "hit_ratio": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            "exact": self.exact.stats(),
+            "normalized": self.normalized.stats() if self.normalized is not None else None,
+        }
+
+
+analysis_cache = AnalysisCache(
+    maxsize=settings.ANALYSIS_CACHE_SIZE,
+    ttl=settings.ANALYSIS_CACHE_TTL_SECONDS,
+    normalized=settings.ANALYSIS_CACHE_NORMALIZED,
+)
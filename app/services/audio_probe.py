@@ -0,0 +1,327 @@
+"""
+Audio duration from container and frame headers, without decoding.
+
+Covers what the app actually handles: MP3 (Xing/Info or VBRI header and a
+frame scan), WAV (RIFF chunks) and WebM/Matroska (Info duration and the last
+block timestamp, as MediaRecorder writes no duration). Every probe returns
+None when it does not recognise the data, so callers can fall back to a full
+decode.
+
+Header durations come from the client, so they are never taken on their own:
+the probes return the longest of the header value, what the frames or blocks
+actually present add up to, and what the byte length implies at the codec's
+highest bitrate. A file can claim to be longer than it is, never shorter.
+"""
+
+import struct
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+# --- MP3 ---------------------------------------------------------------------
+
+# kbit/s by bitrate index, for MPEG-1 and MPEG-2/2.5 Layer III
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz by sample rate index, per MPEG version bits (0: 2.5, 2: 2, 3: 1)
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+_MP3_MAX_BITRATE = 320_000
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Offset of the first byte after a leading ID3v2 tag (0 if there is none)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+class Mp3Frame(NamedTuple):
+    offset: int
+    length: int
+    samples: int
+    sample_rate: int
+    mpeg1: bool
+    mono: bool
+
+
+def _mp3_frame(data: bytes, pos: int) -> Optional[Mp3Frame]:
+    """The Layer III frame whose header is at pos, if there is one."""
+    if pos + 4 > len(data):
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x03
+    layer = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[1 if mpeg1 else 2][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    samples = 1152 if mpeg1 else 576
+    padding = (b2 >> 1) & 0x01
+    length = (samples // 8) * bitrate // sample_rate + padding
+    mono = (b3 >> 6) == 3
+    return Mp3Frame(pos, length, samples, sample_rate, mpeg1, mono)
+
+
+def _find_first_frame(data: bytes, start: int, limit: int = 64 * 1024) -> Optional[int]:
+    """First offset from start holding a frame header followed by another one."""
+    end = min(len(data) - 4, start + limit)
+    pos = data.find(b"\xff", start, end)
+    while pos != -1:
+        frame = _mp3_frame(data, pos)
+        if frame:
+            following = pos + frame.length
+            if following + 4 > len(data) or _mp3_frame(data, following):
+                return pos
+        pos = data.find(b"\xff", pos + 1, end)
+    return None
+
+
+def info_frame_count(data: bytes, frame: Mp3Frame) -> Optional[int]:
+    """
+    Total frame count if `frame` is a Xing/Info or VBRI header frame, else
+    None. Such a frame carries metadata rather than audio.
+    """
+    # Xing/Info header sits in the first frame, right after the side information
+    side_info = (17 if frame.mono else 32) if frame.mpeg1 else (9 if frame.mono else 17)
+    xing = frame.offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        return struct.unpack(">I", data[xing + 8:xing + 12])[0] if flags & 0x01 else 0
+
+    # VBRI (Fraunhofer) header sits 32 bytes after the frame header
+    vbri = frame.offset + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        return struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+    return None
+
+
+def iter_mp3_frames(data: bytes) -> Iterator[Mp3Frame]:
+    """Complete Layer III frames from the first one, stopping at the first non-frame (e.g. an ID3v1 tag)."""
+    pos = _find_first_frame(data, _skip_id3v2(data))
+    if pos is None:
+        return
+    while True:
+        frame = _mp3_frame(data, pos)
+        if not frame or pos + frame.length > len(data):
+            return
+        yield frame
+        pos += frame.length
+
+
+class _Mp3Scan:
+    """Frame walk over a growing buffer, resuming where the previous update() stopped."""
+
+    def __init__(self):
+        self.first: Optional[Mp3Frame] = None
+        self.pos = 0
+        self.samples = 0
+        self.header_count: Optional[int] = None
+        self.done = False
+
+    def update(self, data: bytes) -> Optional[float]:
+        if self.first is None:
+            start = _find_first_frame(data, _skip_id3v2(data))
+            if start is None:
+                return None
+            self.first = _mp3_frame(data, start)
+            self.pos = start
+
+        while not self.done:
+            frame = _mp3_frame(data, self.pos)
+            if frame is None:
+                # A header cut off at the end may still arrive; anything else ends the audio
+                self.done = self.pos + 4 <= len(data)
+                break
+            if self.pos + frame.length > len(data):
+                break
+            if frame.offset == self.first.offset:
+                self.header_count = info_frame_count(data, frame)
+            self.samples += frame.samples
+            self.pos += frame.length
+
+        if not self.samples:
+            return None
+        scanned = self.samples / self.first.sample_rate
+        claimed = (self.header_count or 0) * self.first.samples / self.first.sample_rate
+        # Whatever follows a broken frame may still decode, so no fewer seconds than the bytes allow
+        minimum = (len(data) - self.first.offset) * 8 / _MP3_MAX_BITRATE
+        return max(scanned, claimed, minimum)
+
+
+def probe_mp3(data: bytes) -> Optional[float]:
+    return _Mp3Scan().update(data)
+
+
+# --- WAV ---------------------------------------------------------------------
+
+def probe_wav(data: bytes) -> Optional[float]:
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    byte_rate = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        body = pos + 8
+        if chunk_id == b"fmt " and chunk_size >= 16:
+            byte_rate = struct.unpack("<I", data[body + 8:body + 12])[0]
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            # Streamed files leave the size unset; count what is there
+            available = len(data) - body
+            return min(chunk_size, available) / byte_rate
+        pos = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+# --- WebM / Matroska ---------------------------------------------------------
+
+_EBML_HEADER = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_TRACKS = 0x1654AE6B
+_TRACK_ENTRY = 0xAE
+_CODEC_ID = 0x86
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_CLUSTER = 0x1F43B675
+_CLUSTER_TIMECODE = 0xE7
+_BLOCK_GROUP = 0xA0
+_BLOCK = 0xA1
+_SIMPLE_BLOCK = 0xA3
+
+# Masters whose children we read; everything else is skipped by size
+_DESCEND = {_SEGMENT, _INFO, _TRACKS, _TRACK_ENTRY, _CLUSTER, _BLOCK_GROUP}
+# bit/s ceiling per codec, for the byte-length bound (Opus tops out at 510 kbit/s)
+_MAX_BITRATES = {b"A_OPUS": 510_000}
+
+
+def _vint(data: bytes, pos: int, keep_marker: bool) -> Tuple[Optional[int], int]:
+    """(value, length) of an EBML variable-size integer; value None for "unknown size"."""
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise ValueError("invalid EBML integer")
+    value = first if keep_marker else first & (mask - 1)
+    all_ones = (first & (mask - 1)) == mask - 1
+    for b in data[pos + 1:pos + length]:
+        value = (value << 8) | b
+        all_ones = all_ones and b == 0xFF
+    if not keep_marker and all_ones:
+        return None, length
+    return value, length
+
+
+class _WebmScan:
+    """
+    One linear pass over the elements of a growing buffer, resuming where the
+    previous update() stopped. Masters are entered rather than skipped, so
+    elements of unknown size (live recordings) need no end offset: the next
+    sibling ID simply shows up where the children stop.
+    """
+
+    def __init__(self):
+        self.pos = 0
+        self.timecode_scale = 1_000_000  # ns per tick, the Matroska default
+        self.duration_ticks = None
+        self.cluster_timecode = 0
+        self.last_block = None
+        self.codecs = set()
+        self.done = False
+
+    def update(self, data: bytes) -> Optional[float]:
+        if len(data) < 4 or struct.unpack(">I", data[:4])[0] != _EBML_HEADER:
+            return None
+        if not self.done:
+            try:
+                self._scan(data)
+            except IndexError:
+                pass  # element header cut off at the end; the rest may still arrive
+            except (ValueError, struct.error):
+                self.done = True
+
+        if not self.duration_ticks and self.last_block is None:
+            return None
+        ticks = max(self.duration_ticks or 0, self.last_block or 0)
+        duration = ticks * self.timecode_scale / 1e9
+        if self.codecs and all(codec in _MAX_BITRATES for codec in self.codecs):
+            max_bitrate = sum(_MAX_BITRATES[codec] for codec in self.codecs)
+            duration = max(duration, len(data) * 8 / max_bitrate)
+        return duration
+
+    def _scan(self, data: bytes) -> None:
+        while self.pos < len(data):
+            pos = self.pos
+            element_id, id_length = _vint(data, pos, keep_marker=True)
+            size, size_length = _vint(data, pos + id_length, keep_marker=False)
+            body = pos + id_length + size_length
+
+            if element_id in _DESCEND:
+                self.pos = body
+                continue
+            if size is None:
+                self.done = True
+                return
+            if body + size > len(data):
+                return
+
+            if element_id == _TIMECODE_SCALE:
+                self.timecode_scale = int.from_bytes(data[body:body + size], "big")
+            elif element_id == _DURATION:
+                self.duration_ticks = struct.unpack(">f" if size == 4 else ">d", data[body:body + size])[0]
+            elif element_id == _CODEC_ID:
+                self.codecs.add(bytes(data[body:body + size]).rstrip(b"\x00"))
+            elif element_id == _CLUSTER_TIMECODE:
+                self.cluster_timecode = int.from_bytes(data[body:body + size], "big")
+            elif element_id in (_SIMPLE_BLOCK, _BLOCK):
+                _, track_length = _vint(data, body, keep_marker=False)
+                relative = struct.unpack(">h", data[body + track_length:body + track_length + 2])[0]
+                timestamp = self.cluster_timecode + relative
+                self.last_block = timestamp if self.last_block is None else max(self.last_block, timestamp)
+            self.pos = body + size
+
+
+def probe_webm(data: bytes) -> Optional[float]:
+    return _WebmScan().update(data)
+
+
+def probe_duration(data: bytes) -> Optional[float]:
+    """Duration in seconds read from the headers, or None for unrecognised data."""
+    return DurationProbe().update(data)
+
+
+class DurationProbe:
+    """
+    probe_duration for a buffer that keeps growing, as during an upload. Each
+    update() only parses what arrived since the previous one (the WAV probe
+    reads a few chunk headers and needs no state), so probing as the data
+    comes in stays linear in its size.
+    """
+
+    def __init__(self):
+        self._mp3 = _Mp3Scan()
+        self._webm = _WebmScan()
+
+    def update(self, data: bytes) -> Optional[float]:
+        for probe in (probe_wav, self._webm.update, self._mp3.update):
+            duration = probe(data)
+            if duration is not None:
+                return duration
+        return None
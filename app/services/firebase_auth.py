@@ -1,6 +1,8 @@
-import httpx
+import jwt
 from app.core.config import settings
 from fastapi import HTTPException, status
+from app.services.http_client import get_http_client
+from app.services.token_verifier import token_verifier
 
 FIREBASE_AUTH_URL = "https://identitytoolkit.googleapis.com/v1/accounts"
 
@@ -8,8 +10,7 @@ async def sign_up_with_email(email: str, password: str):
     url = f"{FIREBASE_AUTH_URL}:signUp?key={settings.FIREBASE_API}"
     payload = {"email": email, "password": password, "returnSecureToken": True}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
+    response = await get_http_client().post(url, json=payload)
         
     if response.status_code != 200:
         error_data = response.json()
@@ -24,8 +25,7 @@ async def sign_in_with_email(email: str, password: str):
     url = f"{FIREBASE_AUTH_URL}:signInWithPassword?key={settings.FIREBASE_API}"
     payload = {"email": email, "password": password, "returnSecureToken": True}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
+    response = await get_http_client().post(url, json=payload)
 
     if response.status_code != 200:
         error_data = response.json()
@@ -40,8 +40,7 @@ async def send_password_reset_email(email: str):
     url = f"{FIREBASE_AUTH_URL}:sendOobCode?key={settings.FIREBASE_API}"
     payload = {"requestType": "PASSWORD_RESET", "email": email}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
+    response = await get_http_client().post(url, json=payload)
 
     if response.status_code != 200:
         error_data = response.json()
@@ -56,8 +55,7 @@ async def send_email_verification(id_token: str):
     url = f"{FIREBASE_AUTH_URL}:sendOobCode?key={settings.FIREBASE_API}"
     payload = {"requestType": "VERIFY_EMAIL", "idToken": id_token}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
+    response = await get_http_client().post(url, json=payload)
 
     if response.status_code != 200:
         error_data = response.json()
@@ -69,11 +67,16 @@ async def send_email_verification(id_token: str):
     return response.json()
 
 async def get_user_by_token(id_token: str):
+    """Verify an ID token and return the Firebase user it belongs to."""
+    if settings.FIREBASE_TOKEN_VERIFICATION == "rest" or not token_verifier.enabled:
+        return await lookup_user_by_token(id_token)
+    return await token_verifier.verify(id_token)
+
+async def lookup_user_by_token(id_token: str):
     url = f"{FIREBASE_AUTH_URL}:lookup?key={settings.FIREBASE_API}"
     payload = {"idToken": id_token}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
+    response = await get_http_client().post(url, json=payload)
         
     if response.status_code != 200:
         raise HTTPException(
@@ -87,5 +90,11 @@ async def get_user_by_token(id_token: str):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
-        
-    return data["users"][0]
+
+    user = data["users"][0]
+    # Firebase has accepted the token, so its own exp says how long that holds
+    try:
+        user["exp"] = jwt.decode(id_token, options={"verify_signature": False})["exp"]
+    except (jwt.PyJWTError, KeyError):
+        pass
+    return user
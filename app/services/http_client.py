@@ -0,0 +1,83 @@
+"""Application-wide pooled HTTP client for outbound calls (Firebase, Google keys)."""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SharedHttpClient:
+    client: Optional[httpx.AsyncClient] = None
+
+http = SharedHttpClient()
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=settings.HTTP_ENABLE_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.HTTP_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if startup has not run (scripts, tests)."""
+    if http.client is None or http.client.is_closed:
+        http.client = _build_client()
+    return http.client
+
+
+async def start_http_client():
+    get_http_client()
+    logger.info("Shared HTTP client started")
+
+
+async def close_http_client():
+    if http.client is not None:
+        await http.client.aclose()
+        http.client = None
+
+
+def _pool_state(client: httpx.AsyncClient) -> dict:
+    """
+    Live pool counters read from httpcore, which httpx does not expose
+    publicly; {} when those internals are not what this expects.
+    """
+    try:
+        pool = client._transport._pool
+        connections = list(pool.connections)
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for c in connections if c.is_idle()),
+            "available": sum(1 for c in connections if c.is_available()),
+            "pending_requests": len(pool._requests),
+            "connection_info": [c.info() for c in connections],
+        }
+    except Exception as e:
+        logger.debug(f"HTTP pool state unavailable: {e}")
+        return {}
+
+
+def get_pool_stats() -> dict:
+    """Summarize the connection pool of the shared client for diagnostics."""
+    if http.client is None:
+        return {"started": False}
+
+    return {
+        "started": True,
+        "http2": settings.HTTP_ENABLE_HTTP2,
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        **_pool_state(http.client),
+    }
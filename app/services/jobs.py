@@ -0,0 +1,128 @@
+"""Bounded background job queues and the event plumbing to follow their progress."""
+
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    A fixed number of asyncio workers consuming a bounded queue of jobs. A job
+    is a zero-argument coroutine function; it records its own state (e.g. in
+    Mongo) and reports changes through notify(). Jobs still queued when the
+    queue stops are dropped.
+    """
+
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.name = name
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._tasks = []
+        self._events: Dict[str, asyncio.Event] = {}
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, job_id: str, job: Callable[[], Awaitable[None]]) -> None:
+        """Queue a job; raises 503 when the queue is full."""
+        try:
+            self._queue.put_nowait((job_id, job))
+        except asyncio.QueueFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many jobs in progress, please try again shortly",
+                headers={"Retry-After": "10"}
+            )
+
+    def notify(self, job_id: str) -> None:
+        """Wake up everyone waiting for a change of this job."""
+        event = self._events.pop(job_id, None)
+        if event:
+            event.set()
+
+    async def wait_for_change(self, job_id: str, timeout: float) -> None:
+        """Return after notify(job_id) or `timeout` seconds, whichever comes first."""
+        event = self._events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, job = await self._queue.get()
+            self.running += 1
+            try:
+                await job()
+                self.completed += 1
+            except asyncio.CancelledError:
+                # stop() cancelling the worker ends it; a job's own stray cancellation must not
+                if asyncio.current_task().cancelling():
+                    raise
+                self.failed += 1
+                logger.error(f"{self.name} job {job_id} was cancelled")
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"{self.name} job {job_id} failed: {e}")
+            finally:
+                self.running -= 1
+                self._queue.task_done()
+                self.notify(job_id)
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if not self._queue.empty():
+            logger.warning(f"{self.name} queue stopped with {self._queue.qsize()} jobs not started")
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+def format_sse(event: str, data: dict) -> str:
+    """One server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def job_event_stream(
+    queue: JobQueue,
+    job_id: str,
+    load_state: Callable[[], Awaitable[Optional[dict]]],
+    poll_seconds: float = 2.0,
+    terminal: Tuple[str, ...] = ("completed", "failed"),
+):
+    """
+    Server-sent events for a job: a "status" event whenever load_state()
+    changes, ending with a state whose status is in `terminal`. load_state
+    returns None when the job is gone. Changes made on another worker are
+    picked up by polling.
+    """
+    last = None
+    while True:
+        state = await load_state()
+        if state is None:
+            yield format_sse("error", {"detail": "Job not found"})
+            return
+        if state != last:
+            yield format_sse("status", state)
+            last = state
+        if state.get("status") in terminal:
+            return
+        await queue.wait_for_change(job_id, poll_seconds)
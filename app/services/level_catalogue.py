@@ -0,0 +1,98 @@
+"""Per-level word and test question counts behind GET /words/ and GET /tests/levels."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.services.vocabulary import CATALOG_META_COLLECTION, get_words_version
+
+logger = logging.getLogger(__name__)
+
+# Materialized counts, stamped with the words version they were computed from
+LEVEL_STATS_ID = "level_stats"
+
+
+async def compute_level_stats(db: AsyncIOMotorDatabase) -> List[dict]:
+    """Count words and test questions per CEFR level in one pass over words."""
+    pipeline = [
+        {
+            "$group": {
+                "_id": "$cerf_level",
+                "word_count": {"$sum": 1},
+                "question_count": {
+                    "$sum": {"$cond": [{"$isArray": "$tests"}, {"$size": "$tests"}, 0]}
+                }
+            }
+        },
+        {"$sort": {"_id": 1}}
+    ]
+    return [
+        {"level": doc["_id"], "word_count": doc["word_count"], "question_count": doc["question_count"]}
+        async for doc in db["words"].aggregate(pipeline)
+        if doc["_id"]
+    ]
+
+
+class LevelCatalogue:
+    """
+    Level statistics cached in-process and invalidated by the words version
+    stamp. The version is re-checked at most every VOCABULARY_REFRESH_SECONDS;
+    on a change the counts are taken from the materialized catalog_meta
+    document, and only recomputed by whichever worker sees it stale first.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.loaded = False
+        self._levels: List[dict] = []
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def load(self, db: AsyncIOMotorDatabase, version: Optional[int]) -> None:
+        meta = db[CATALOG_META_COLLECTION]
+        stored = await meta.find_one({"_id": LEVEL_STATS_ID})
+        if stored and stored.get("version") == version:
+            levels = stored.get("levels", [])
+        else:
+            levels = await compute_level_stats(db)
+            await meta.replace_one(
+                {"_id": LEVEL_STATS_ID},
+                {"version": version, "levels": levels, "updated_at": datetime.utcnow()},
+                upsert=True
+            )
+            logger.info(f"Level statistics recomputed for words version {version}")
+
+        self._levels = levels
+        self.version = version
+        self.loaded = True
+
+    def _is_fresh(self) -> bool:
+        return self.loaded and time.monotonic() - self._checked_at < settings.VOCABULARY_REFRESH_SECONDS
+
+    async def levels(self, db: AsyncIOMotorDatabase) -> List[dict]:
+        """[{level, word_count, question_count}] sorted by level; shared, do not mutate."""
+        if self._is_fresh():
+            return self._levels
+        async with self._lock:
+            if not self._is_fresh():
+                version = await get_words_version(db)
+                if not self.loaded or version != self.version:
+                    await self.load(db, version)
+                self._checked_at = time.monotonic()
+        return self._levels
+
+    def invalidate(self) -> None:
+        """Re-check the version stamp on the next read."""
+        self._checked_at = 0.0
+
+    def stats(self) -> dict:
+        return {"loaded": self.loaded, "version": self.version, "levels": len(self._levels)}
+
+
+# Singleton instance
+level_catalogue = LevelCatalogue()
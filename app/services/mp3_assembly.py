@@ -0,0 +1,86 @@
+"""Join MP3 segments frame by frame, without decoding or re-encoding."""
+
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Tuple
+
+from app.services.audio_probe import Mp3Frame, info_frame_count, iter_mp3_frames
+
+
+class Mp3FormatError(ValueError):
+    """A segment is not MPEG Layer III, or does not match the format of the segments before it."""
+
+
+class Mp3Format(NamedTuple):
+    sample_rate: int
+    samples_per_frame: int
+    mono: bool
+
+
+def _audio_frames(data: bytes) -> Tuple[Mp3Format, List[Mp3Frame]]:
+    """The audio frames of one MP3 file (Xing/Info/VBRI header frame dropped) and their format."""
+    frames = list(iter_mp3_frames(data))
+    if frames and info_frame_count(data, frames[0]) is not None:
+        # Its frame count describes the segment, not the joined file
+        frames = frames[1:]
+    if not frames:
+        raise Mp3FormatError("Segment contains no MP3 audio frames")
+    first = frames[0]
+    fmt = Mp3Format(first.sample_rate, first.samples, first.mono)
+    for frame in frames:
+        if Mp3Format(frame.sample_rate, frame.samples, frame.mono) != fmt:
+            raise Mp3FormatError("Segment changes format mid-stream")
+    return fmt, frames
+
+
+def silence_frame(header: bytes, length: int) -> bytes:
+    """
+    A frame of silence in the format of `header`: same version, bitrate,
+    sample rate and channel mode, no CRC and no padding. All-zero side
+    information means no main data (part2_3_length 0) and no bit reservoir
+    use (main_data_begin 0), which decoders render as silence.
+    """
+    b1 = header[1] | 0x01           # protection bit set: no CRC follows
+    b2 = header[2] & 0xFC           # clear padding and private bits
+    b3 = header[3] & 0xCF           # clear mode extension
+    return bytes([0xFF, b1, b2, b3]).ljust(length, b"\x00")
+
+
+def assemble_mp3(segments: Iterable[bytes], output_path: Path, gap_seconds: float) -> List[dict]:
+    """
+    Write the segments to output_path with gap_seconds of silence after each,
+    copying MP3 frames as they are. Returns {"start", "end"} in seconds per
+    segment, with the gap counted towards its segment, computed from frame
+    counts. Raises Mp3FormatError if the segments do not share sample rate
+    and channel mode; the file is then incomplete.
+    """
+    timings = []
+    fmt = None
+    total_frames = 0
+
+    with open(output_path, "wb") as out:
+        for data in segments:
+            segment_fmt, frames = _audio_frames(data)
+            if fmt is None:
+                fmt = segment_fmt
+                frame_seconds = fmt.samples_per_frame / fmt.sample_rate
+                gap_frames = round(gap_seconds / frame_seconds)
+                first = frames[0]
+                header = data[first.offset:first.offset + 4]
+                padding = (header[2] >> 1) & 0x01
+                silence = silence_frame(header, first.length - padding)
+            elif segment_fmt != fmt:
+                raise Mp3FormatError(f"Segment format {segment_fmt} differs from {fmt}")
+
+            start = total_frames
+            # Frames are contiguous in the file, so one slice covers them all
+            view = memoryview(data)
+            out.write(view[frames[0].offset:frames[-1].offset + frames[-1].length])
+            out.write(silence * gap_frames)
+            total_frames += len(frames) + gap_frames
+
+            timings.append({
+                "start": round(start * frame_seconds, 3),
+                "end": round(total_frames * frame_seconds, 3)
+            })
+
+    return timings
@@ -1,23 +1,32 @@
 """Podcast generation service for German language learning."""
 
+import asyncio
 import logging
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
+from typing import Awaitable, Callable, List, Optional
+import uuid
 import paramiko
 from pydub import AudioSegment
-from elevenlabs.client import ElevenLabs
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from app.core.concurrency import run_blocking
 from app.core.config import settings
+from app.core.outbound import outbound, outbound_retry
+from app.services.audio_probe import probe_mp3
+from app.services.mp3_assembly import Mp3FormatError, assemble_mp3
+from app.services.tts_cache import tts_cache
 
 logger = logging.getLogger(__name__)
 
+TTS_MODEL_ID = "eleven_multilingual_v2"
+# Silence after each line of dialogue
+LINE_PAUSE_MS = 400
+
 
 # --- Pydantic Models for LLM Output ---
 
@@ -56,6 +65,7 @@ class PodcastGeneratorService:
     def __init__(self):
         self.llm: Optional[ChatOpenAI] = None
         self.elevenlabs_client: Optional[ElevenLabs] = None
+        self.elevenlabs_async_client: Optional[AsyncElevenLabs] = None
         self._initialized = False
 
     def _ensure_initialized(self):
@@ -71,21 +81,16 @@ class PodcastGeneratorService:
         self.llm = ChatOpenAI(
             model="gpt-4o",
             temperature=0.7,
-            api_key=settings.OPENAI_API_KEY
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,  # outbound_retry owns retries
         )
         self.elevenlabs_client = ElevenLabs(api_key=settings.ELEVEN_LABS_KEY)
+        self.elevenlabs_async_client = AsyncElevenLabs(api_key=settings.ELEVEN_LABS_KEY)
         self._initialized = True
         logger.info("Podcast generator service initialized")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Script generation failed, retrying (attempt {retry_state.attempt_number})..."
-        ),
-    )
-    def generate_script(
+    @outbound_retry("Script generation")
+    async def generate_script(
         self,
         words: List[str],
         cefr_level: str,
@@ -134,15 +139,37 @@ class PodcastGeneratorService:
         chain = prompt | self.llm | parser
 
         logger.info(f"Generating script (level {cefr_level}, context: {context})...")
-        result = chain.invoke({
-            "words": ", ".join(words),
-            "cefr_level": cefr_level,
-            "context": context,
-            "role_instruction": role_instruction,
-        })
+        async with outbound("openai"):
+            result = await chain.ainvoke({
+                "words": ", ".join(words),
+                "cefr_level": cefr_level,
+                "context": context,
+                "role_instruction": role_instruction,
+            })
         logger.info(f"Script generated: '{result.title}'")
         return result
 
+    async def synthesize_line(self, text: str, voice_id: str) -> bytes:
+        """MP3 bytes for one line of dialogue, from the TTS cache when it was synthesized before."""
+        if not settings.TTS_CACHE_ENABLED:
+            return await self._synthesize(text, voice_id)
+        return await tts_cache.fetch(
+            voice_id, TTS_MODEL_ID, text, lambda: self._synthesize(text, voice_id)
+        )
+
+    @outbound_retry("Speech synthesis")
+    async def _synthesize(self, text: str, voice_id: str) -> bytes:
+        async with outbound("elevenlabs_tts"):
+            chunks = [
+                chunk
+                async for chunk in self.elevenlabs_async_client.text_to_speech.convert(
+                    voice_id=voice_id,
+                    text=text,
+                    model_id=TTS_MODEL_ID,
+                )
+            ]
+        return b"".join(chunks)
+
     async def generate_audio(
         self,
         script: PodcastScriptModel,
@@ -152,71 +179,80 @@ class PodcastGeneratorService:
         """
         Generate audio from the podcast script using ElevenLabs.
         Returns a list of dicts with timing info: [{'start': float, 'end': float}, ...]
+
+        Lines are synthesized concurrently (at most PODCAST_TTS_CONCURRENCY at
+        a time, each retried on its own) and assembled in script order.
         """
         self._ensure_initialized()
 
         # Map speakers to voices
         default_voices = voice_ids if voice_ids else ["rachel", "drew"]
-        combined_audio = AudioSegment.empty()
         assigned_voices: dict[str, str] = {}
-        timings = []
-
-        logger.info("Generating audio (German)...")
-
-        silence_duration_ms = 400
-
-        for i, line in enumerate(script.dialogue):
-            speaker = line.speaker
-            text = line.text
-
-            if speaker not in assigned_voices:
+        for line in script.dialogue:
+            if line.speaker not in assigned_voices:
                 voice_idx = len(assigned_voices) % len(default_voices)
-                assigned_voices[speaker] = default_voices[voice_idx]
+                assigned_voices[line.speaker] = default_voices[voice_idx]
 
-            voice_id = assigned_voices[speaker]
-
-            # Calculate start time (current duration in seconds)
-            start_ms = len(combined_audio)
-            
-            try:
-                # Use text_to_speech API (ElevenLabs SDK v1.0+)
-                audio_response = self.elevenlabs_client.text_to_speech.convert(
-                    voice_id=voice_id,
-                    text=text,
-                    model_id="eleven_multilingual_v2",
-                )
+        logger.info(f"Generating audio (German), {len(script.dialogue)} lines...")
 
-                # Collect audio data from generator
-                audio_data = b"".join(audio_response)
-                segment = AudioSegment.from_mp3(BytesIO(audio_data))
-                
-                # Append segment + silence
-                combined_audio += segment + AudioSegment.silent(duration=silence_duration_ms)
+        limit = asyncio.Semaphore(settings.PODCAST_TTS_CONCURRENCY)
 
-                # Calculate end time (after segment, before silence? or including silence?)
-                # Including silence ensures "active" state persists during the pause
-                end_ms = len(combined_audio)
-                
-                timings.append({
-                    "start": start_ms / 1000.0,
-                    "end": end_ms / 1000.0
-                })
+        async def synthesize(i: int, line: ScriptLineModel) -> bytes:
+            async with limit:
+                try:
+                    audio_data = await self.synthesize_line(line.text, assigned_voices[line.speaker])
+                except Exception as e:
+                    logger.error(f"Failed to generate audio for line {i + 1}: {e}")
+                    raise
+            logger.debug(f"Generated audio for line {i + 1}/{len(script.dialogue)}")
+            return audio_data
+
+        tasks = [asyncio.create_task(synthesize(i, line)) for i, line in enumerate(script.dialogue)]
+        try:
+            segments = await asyncio.gather(*tasks)
+        except Exception:
+            # One line failed for good; the podcast fails, so stop the rest
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        timings = await run_blocking("audio", self._assemble_audio, segments, output_path)
+        logger.info(f"Audio saved: {output_path}")
+        return timings
 
-                logger.debug(f"Generated audio for line {i + 1}/{len(script.dialogue)}")
+    @staticmethod
+    def _assemble_audio(segments: List[bytes], output_path: Path) -> List[dict]:
+        """
+        Join MP3 segments with a pause after each; returns per-line timings in seconds.
+        The pause counts towards the line, so its "active" state persists during it.
+        """
+        try:
+            return assemble_mp3(segments, output_path, gap_seconds=LINE_PAUSE_MS / 1000)
+        except Mp3FormatError as e:
+            logger.warning(f"Cannot join MP3 frames directly ({e}), re-encoding instead")
 
-            except Exception as e:
-                logger.error(f"Failed to generate audio for line {i + 1}: {e}")
-                raise e # Propagate error to fail the generation
+        combined_audio = AudioSegment.empty()
+        timings = []
+        for audio_data in segments:
+            start_ms = len(combined_audio)
+            segment = AudioSegment.from_mp3(BytesIO(audio_data))
+            combined_audio += segment + AudioSegment.silent(duration=LINE_PAUSE_MS)
+            timings.append({
+                "start": start_ms / 1000.0,
+                "end": len(combined_audio) / 1000.0
+            })
 
         combined_audio.export(output_path, format="mp3")
-        logger.info(f"Audio saved: {output_path}")
         return timings
 
     def get_audio_duration(self, audio_path: Path) -> str:
-        """Get duration of audio file in mm:ss format."""
+        """Get duration of audio file in mm:ss format, from its headers where possible."""
         try:
-            audio = AudioSegment.from_mp3(audio_path)
-            duration_seconds = len(audio) // 1000
+            duration = probe_mp3(audio_path.read_bytes())
+            if duration is None:
+                duration = len(AudioSegment.from_mp3(audio_path)) / 1000.0
+            duration_seconds = int(duration)
             minutes = duration_seconds // 60
             seconds = duration_seconds % 60
             return f"{minutes}:{seconds:02d}"
@@ -224,15 +260,8 @@ class PodcastGeneratorService:
             logger.error(f"Failed to get audio duration: {e}")
             return "0:00"
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Quiz generation failed, retrying (attempt {retry_state.attempt_number})..."
-        ),
-    )
-    def generate_quiz(self, script_content: str, num_questions: int = 7) -> QuizModel:
+    @outbound_retry("Quiz generation")
+    async def generate_quiz(self, script_content: str, num_questions: int = 7) -> QuizModel:
         """Generate comprehension quiz questions from the transcript."""
         self._ensure_initialized()
 
@@ -258,7 +287,8 @@ class PodcastGeneratorService:
         chain = prompt | self.llm | parser
 
         logger.info(f"Generating {num_questions} quiz questions...")
-        result = chain.invoke({"script": script_content, "num_questions": num_questions})
+        async with outbound("openai"):
+            result = await chain.ainvoke({"script": script_content, "num_questions": num_questions})
         logger.info(f"Generated {len(result.questions)} quiz questions")
         return result
 
@@ -319,39 +349,80 @@ class PodcastGeneratorService:
         cefr_level: str,
         context: str,
         voice_ids: List[str],
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        on_stage: Optional[Callable[[str], Awaitable[None]]] = None,
+        podcast_id: Optional[str] = None
     ) -> PodcastGenerationResult:
-        """Generate a complete podcast with script, audio, and quiz."""
+        """
+        Generate a complete podcast with script, audio, and quiz.
+
+        Once the script exists, the quiz (which only needs its text) is
+        generated while the audio is synthesized and uploaded; whichever
+        branch fails first cancels the other.
+
+        on_stage, if given, is awaited with "script", "audio" and "upload" as
+        each step starts, then with "quiz" if the quiz is still being
+        generated when the upload is done.
+
+        The audio is stored as podcast_<podcast_id>.mp3 (a random id if none
+        is given), so concurrent generations never overwrite each other.
+        """
         import tempfile
         import os
 
+        async def stage(name: str):
+            if on_stage:
+                await on_stage(name)
+
         # 1. Generate script
+        await stage("script")
         num_speakers = len(voice_ids) if voice_ids else 2
-        script = self.generate_script(words, cefr_level, context, min(num_speakers, 2))
+        script = await self.generate_script(words, cefr_level, context, min(num_speakers, 2))
 
-        # 2. Generate audio
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        audio_filename = f"podcast_{timestamp}.mp3"
+        audio_filename = f"podcast_{podcast_id or uuid.uuid4().hex}.mp3"
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            local_audio_path = Path(tmpdir) / audio_filename
+        # 2a. Generate and upload audio
+        async def produce_audio():
+            with tempfile.TemporaryDirectory() as tmpdir:
+                local_audio_path = Path(tmpdir) / audio_filename
 
-            # Generate audio (async method)
-            timings = await self.generate_audio(script, voice_ids, local_audio_path)
+                await stage("audio")
+                timings = await self.generate_audio(script, voice_ids, local_audio_path)
 
-            # Get duration
-            duration = self.get_audio_duration(local_audio_path)
+                # Get duration
+                duration = await run_blocking("audio", self.get_audio_duration, local_audio_path)
 
-            # Upload to Hetzner
-            upload_success = self.upload_to_hetzner(local_audio_path, "hackathon/podcast")
-            if not upload_success:
-                raise Exception("Failed to upload audio to storage")
+                # Upload to Hetzner
+                await stage("upload")
+                upload_success = await run_blocking(
+                    "upload", self.upload_to_hetzner, local_audio_path, "hackathon/podcast"
+                )
+                if not upload_success:
+                    raise Exception("Failed to upload audio to storage")
+            return timings, duration
 
-        # 3. Generate quiz
+        # 2b. Generate quiz
         full_transcript = "\n".join(
             f"{line.speaker}: {line.text}" for line in script.dialogue
         )
-        quiz = self.generate_quiz(full_transcript, num_questions=7)
+
+        audio_task = asyncio.create_task(produce_audio())
+        quiz_task = asyncio.create_task(self.generate_quiz(full_transcript, num_questions=7))
+        try:
+            done, pending = await asyncio.wait(
+                {audio_task, quiz_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                task.result()  # raises if the first branch to finish failed
+            if quiz_task in pending:
+                await stage("quiz")
+            timings, duration = await audio_task
+            quiz = await quiz_task
+        except BaseException:
+            for task in (audio_task, quiz_task):
+                task.cancel()
+            await asyncio.gather(audio_task, quiz_task, return_exceptions=True)
+            raise
 
         # Build audio URL
         audio_url = f"https://{settings.STORAGE_ADDRESS}/hackathon/podcast/{audio_filename}"
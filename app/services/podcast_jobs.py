@@ -0,0 +1,116 @@
+"""Background podcast generation: script, audio, upload and quiz."""
+
+import logging
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.models.podcast import PodcastCreate, PodcastResponse
+from app.services.jobs import JobQueue
+from app.services.podcast_generator import podcast_generator
+
+logger = logging.getLogger(__name__)
+
+# Status of a podcasts document, in order; documents without one predate jobs
+QUEUED = "queued"
+SCRIPT = "script"
+AUDIO = "audio"
+UPLOAD = "upload"
+QUIZ = "quiz"
+READY = "ready"
+FAILED = "failed"
+
+IN_PROGRESS = (QUEUED, SCRIPT, AUDIO, UPLOAD, QUIZ)
+
+podcast_jobs = JobQueue(
+    "Podcast generation",
+    workers=settings.PODCAST_WORKERS,
+    max_pending=settings.PODCAST_MAX_PENDING_JOBS,
+)
+
+
+def podcast_response(doc: dict, audio_url: str) -> PodcastResponse:
+    """Shape a ready podcasts document for the API."""
+    return PodcastResponse(
+        id=str(doc["_id"]),
+        title=doc["title"],
+        words=doc["words"],
+        cefr_level=doc["cefr_level"],
+        context=doc["context"],
+        audio_url=audio_url,
+        duration=doc.get("duration"),
+        transcript=doc["transcript"],
+        quiz=doc["quiz"],
+        created_at=doc["created_at"]
+    )
+
+
+def job_state(doc: dict, audio_url: str) -> dict:
+    """id/status/error/podcast of a podcasts document."""
+    status = doc.get("status", READY)
+    error = doc.get("error")
+    if status in IN_PROGRESS:
+        now = datetime.utcnow()
+        if doc.get("started_at"):
+            # The worker that owned it went away
+            timed_out = now - doc["started_at"] > timedelta(seconds=settings.PODCAST_JOB_TIMEOUT_SECONDS)
+        else:
+            # Still queued; only fail it once it cannot still be waiting for a worker
+            waited = now - doc.get("created_at", now)
+            timed_out = waited > timedelta(seconds=settings.PODCAST_JOB_QUEUE_TIMEOUT_SECONDS)
+        if timed_out:
+            status, error = FAILED, "Podcast generation timed out"
+
+    state = {"id": str(doc["_id"]), "status": status, "error": error, "podcast": None}
+    if status == READY:
+        state["podcast"] = podcast_response(doc, audio_url).model_dump()
+    return state
+
+
+async def run_podcast_generation(
+    db: AsyncIOMotorDatabase,
+    podcast_id: str,
+    podcast_data: PodcastCreate,
+) -> None:
+    """Generate a queued podcast, recording each stage on its document."""
+    podcasts = db.podcasts
+    query = {"_id": ObjectId(podcast_id)}
+    await podcasts.update_one(query, {"$set": {"started_at": datetime.utcnow()}})
+
+    async def on_stage(stage: str):
+        await podcasts.update_one(query, {"$set": {"status": stage}})
+        podcast_jobs.notify(podcast_id)
+
+    try:
+        result = await podcast_generator.generate_podcast(
+            words=podcast_data.words,
+            cefr_level=podcast_data.cefr_level.value,
+            context=podcast_data.context,
+            voice_ids=podcast_data.voice_ids,
+            on_stage=on_stage,
+            podcast_id=podcast_id
+        )
+    except Exception as e:
+        logger.error(f"Podcast generation {podcast_id} failed: {e}")
+        message = e.detail if isinstance(e, HTTPException) else f"Podcast generation failed: {e}"
+        await podcasts.update_one(query, {"$set": {
+            "status": FAILED,
+            "completed_at": datetime.utcnow(),
+            "error": message,
+        }})
+        return
+
+    await podcasts.update_one(query, {"$set": {
+        "status": READY,
+        "completed_at": datetime.utcnow(),
+        "title": result.title,
+        "audio_url": result.audio_url,
+        "audio_filename": result.audio_filename,
+        "duration": result.duration,
+        "transcript": result.transcript,
+        "quiz": result.quiz,
+    }})
+    logger.info(f"Podcast created successfully: {podcast_id}")
@@ -0,0 +1,79 @@
+"""In-memory bank of test questions, flattened from words.tests."""
+
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.words import format_test_question, word_projection
+from app.services.vocabulary import VersionedCatalogue, get_words_version
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionBank(VersionedCatalogue):
+    """
+    One pre-shaped row per test question, indexed by CEFR level, by
+    (level, difficulty) and by question id, so assembling a test is a
+    random.sample over a prebuilt list. Rebuilt from words.tests whenever the
+    words version stamp moves. Question dicts are shared and must not be
+    mutated.
+    """
+
+    name = "Question bank"
+
+    def __init__(self):
+        super().__init__()
+        self._by_level: Dict[str, List[dict]] = {}
+        self._by_level_difficulty: Dict[Tuple[str, str], List[dict]] = {}
+        self._by_id: Dict[str, dict] = {}
+
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        version = await get_words_version(db)
+        by_level: Dict[str, List[dict]] = {}
+        by_level_difficulty: Dict[Tuple[str, str], List[dict]] = {}
+        by_id: Dict[str, dict] = {}
+
+        query = {"tests": {"$exists": True, "$type": "array", "$ne": []}}
+        async for doc in db["words"].find(query, word_projection("test")):
+            level = doc.get("cerf_level")
+            word_id = str(doc["_id"])
+            for index, test in enumerate(doc.get("tests", [])):
+                if not isinstance(test, dict):
+                    continue
+                question = format_test_question(word_id, doc.get("word", ""), index, test)
+                by_id[question["question_id"]] = question
+                if level:
+                    by_level.setdefault(level, []).append(question)
+                    by_level_difficulty.setdefault((level, question["difficulty"]), []).append(question)
+
+        self._by_level = by_level
+        self._by_level_difficulty = by_level_difficulty
+        self._by_id = by_id
+        self.version = version
+        self.loaded = True
+        logger.info(f"Question bank loaded: {len(by_id)} questions, version {version}")
+
+    def sample(self, level: str, size: int, difficulty: Optional[str] = None) -> List[dict]:
+        """`size` random questions from a level, optionally of one difficulty."""
+        if difficulty:
+            questions = self._by_level_difficulty.get((level, difficulty), [])
+        else:
+            questions = self._by_level.get(level, [])
+        return random.sample(questions, min(len(questions), size))
+
+    def get(self, question_id: str) -> Optional[dict]:
+        return self._by_id.get(question_id)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "questions": len(self._by_id),
+            "levels": {level: len(questions) for level, questions in self._by_level.items()},
+        }
+
+
+# Singleton instance
+question_bank = QuestionBank()
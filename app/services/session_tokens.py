@@ -0,0 +1,79 @@
+"""Stateless test sessions: the question set is carried by an HMAC-signed token."""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from typing import List, NamedTuple, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+if settings.TEST_SESSION_SECRET:
+    _SECRET = settings.TEST_SESSION_SECRET.encode()
+else:
+    _SECRET = secrets.token_bytes(32)
+    logger.warning("TEST_SESSION_SECRET is not set; test sessions only validate on the worker that issued them")
+
+
+class TestSessionClaims(NamedTuple):
+    session_id: str
+    question_ids: List[str]
+    # Words version the questions were sampled from; question ids are positions in it
+    words_version: Optional[int]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_SECRET, payload, hashlib.sha256).digest()
+
+
+def issue_session_token(level: str, question_ids: List[str], words_version: Optional[int]) -> str:
+    """
+    Sign the level, question ids, the words version they were taken from, a
+    random session id and the issue time.
+    """
+    payload = json.dumps(
+        {
+            "l": level,
+            "q": question_ids,
+            "v": words_version,
+            "s": secrets.token_hex(8),
+            "t": int(time.time()),
+        },
+        separators=(",", ":")
+    ).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def verify_session_token(token: str, level: str) -> TestSessionClaims:
+    """Claims of a valid, unexpired session for `level`; raises 400 otherwise."""
+    try:
+        payload_b64, signature_b64 = token.split(".")
+        payload = _b64decode(payload_b64)
+        signature = _b64decode(signature_b64)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed test session")
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise HTTPException(status_code=400, detail="Invalid test session")
+
+    session = json.loads(payload)
+    if session["l"] != level:
+        raise HTTPException(status_code=400, detail="Test session belongs to another level")
+    if time.time() - session["t"] > settings.TEST_SESSION_TTL_SECONDS:
+        raise HTTPException(status_code=400, detail="Test session has expired")
+    return TestSessionClaims(session["s"], session["q"], session.get("v"))
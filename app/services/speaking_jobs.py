@@ -0,0 +1,133 @@
+"""Background speaking analysis: S3 upload, transcription and LLM analysis."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.models.speaking import (
+    AudioMetadata,
+    SpeakingQuestion,
+    SpeakingSessionResponse,
+    TargetWord,
+)
+from app.services.jobs import JobQueue
+from app.services.speaking_service import speaking_service
+
+logger = logging.getLogger(__name__)
+
+# Status of a speaking_sessions document; documents without one predate jobs
+PENDING = "pending"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+speaking_jobs = JobQueue(
+    "Speaking analysis",
+    workers=settings.SPEAKING_WORKERS,
+    max_pending=settings.SPEAKING_MAX_PENDING_JOBS,
+)
+
+
+def session_response(doc: dict) -> SpeakingSessionResponse:
+    """Shape a completed speaking_sessions document for the API."""
+    return SpeakingSessionResponse(
+        id=str(doc["_id"]),
+        createdAt=doc.get("createdAt", datetime.utcnow()),
+        question=SpeakingQuestion(
+            text=doc.get("question", {}).get("text", ""),
+            audioUrl=doc.get("question", {}).get("audioUrl")
+        ),
+        targetWords=[
+            TargetWord(**w) for w in doc.get("targetWords", [])
+        ],
+        audio=AudioMetadata(**doc.get("audio", {})),
+        analysis=doc.get("analysis", {})
+    )
+
+
+def job_state(doc: dict) -> dict:
+    """jobId/status/error/session of a speaking_sessions document."""
+    status = doc.get("status", COMPLETED)
+    error = doc.get("error")
+    if status in (PENDING, PROCESSING):
+        now = datetime.utcnow()
+        if doc.get("startedAt"):
+            # The worker that owned it went away
+            timed_out = now - doc["startedAt"] > timedelta(seconds=settings.SPEAKING_JOB_TIMEOUT_SECONDS)
+        else:
+            # Still queued; only fail it once it cannot still be waiting for a worker
+            waited = now - doc.get("createdAt", now)
+            timed_out = waited > timedelta(seconds=settings.SPEAKING_JOB_QUEUE_TIMEOUT_SECONDS)
+        if timed_out:
+            status, error = FAILED, "Analysis timed out"
+
+    state = {"jobId": str(doc["_id"]), "status": status, "error": error, "session": None}
+    if status == COMPLETED:
+        state["session"] = session_response(doc).model_dump()
+    return state
+
+
+async def run_speaking_analysis(
+    db: AsyncIOMotorDatabase,
+    session_id: str,
+    audio_bytes: bytes,
+    question_text: str,
+    target_words: List[TargetWord],
+) -> None:
+    """
+    Run the pipeline for a pending session and store the outcome on it.
+
+    The S3 upload only needs the bytes, so it runs alongside transcription and
+    analysis and only the final update waits for both. A failed upload does
+    not fail the session: the analysis is kept and audio.uploadError is set.
+    A failed transcription or analysis fails the session; the upload is then
+    abandoned.
+    """
+    sessions = db["speaking_sessions"]
+    query = {"_id": ObjectId(session_id)}
+    await sessions.update_one(query, {"$set": {"status": PROCESSING, "startedAt": datetime.utcnow()}})
+    speaking_jobs.notify(session_id)
+
+    upload = asyncio.create_task(speaking_service.aupload_audio_to_s3(audio_bytes))
+    try:
+        transcription = await speaking_service.atranscribe_audio(audio_bytes)
+        analysis = await speaking_service.aanalyze_speaking(
+            transcription=transcription,
+            question=question_text,
+            target_words=target_words
+        )
+    except Exception as e:
+        upload.cancel()
+        await asyncio.gather(upload, return_exceptions=True)
+        logger.error(f"Speaking analysis {session_id} failed: {e}")
+        message: Optional[str] = None
+        if isinstance(e, HTTPException):
+            message = e.detail  # a provider queue was full
+        elif isinstance(e, ValueError):
+            message = str(e)
+        await sessions.update_one(query, {"$set": {
+            "status": FAILED,
+            "completedAt": datetime.utcnow(),
+            "error": message or "Failed to analyze speaking response",
+        }})
+        return
+
+    update = {
+        "status": COMPLETED,
+        "completedAt": datetime.utcnow(),
+        "analysis": analysis.model_dump(),
+    }
+    try:
+        update["audio.hetznerPath"], update["audio.bucketUrl"] = await upload
+    except Exception as e:
+        logger.error(f"Audio upload for speaking session {session_id} failed, keeping the analysis: {e}")
+        update["audio.uploadError"] = str(e) if isinstance(e, ValueError) else "Failed to upload audio"
+
+    await sessions.update_one(query, {"$set": update})
+    logger.info(f"Speaking session analysed: {session_id}")
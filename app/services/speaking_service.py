@@ -5,22 +5,26 @@ import uuid
 from io import BytesIO
 from typing import List, Optional
 from pydub import AudioSegment
+from fastapi import HTTPException
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
-from elevenlabs.client import ElevenLabs
+from elevenlabs.client import AsyncElevenLabs
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from app.core.concurrency import run_blocking
 from app.core.config import settings
+from app.core.outbound import outbound, outbound_retry
 from app.models.speaking import (
     TargetWord,
     OpenAIAnalysisResponse,
     SpeakingAnalysis,
     WordUsageAnalysis,
 )
+from app.services.analysis_cache import analysis_cache
+from app.services.audio_probe import probe_duration
 
 logger = logging.getLogger(__name__)
 
@@ -29,13 +33,17 @@ S3_ENDPOINT = "https://fsn1.your-objectstorage.com"
 S3_BUCKET = "sprache-hackathon-audio"
 S3_SPEAKING_PREFIX = "users/speaking"
 
+# Longest accepted speaking recording
+MAX_AUDIO_SECONDS = 60
+
 
 class SpeakingService:
     """Service for speaking practice functionality."""
 
     def __init__(self):
         self.llm: Optional[ChatOpenAI] = None
-        self.elevenlabs_client: Optional[ElevenLabs] = None
+        self.elevenlabs_async_client: Optional[AsyncElevenLabs] = None
+        self._s3_client = None
         self._initialized = False
 
     def _ensure_initialized(self):
@@ -51,33 +59,43 @@ class SpeakingService:
         self.llm = ChatOpenAI(
             model="gpt-4o",
             temperature=0.3,  # Lower temperature for more consistent analysis
-            api_key=settings.OPENAI_API_KEY
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,  # outbound_retry owns retries
         )
-        self.elevenlabs_client = ElevenLabs(api_key=settings.ELEVEN_LABS_KEY)
+        self.elevenlabs_async_client = AsyncElevenLabs(api_key=settings.ELEVEN_LABS_KEY)
         self._initialized = True
         logger.info("Speaking service initialized")
 
     def _get_s3_client(self):
-        """Create S3 client for Hetzner Object Storage."""
-        return boto3.client(
-            's3',
-            endpoint_url=S3_ENDPOINT,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
-            config=Config(signature_version='s3v4')
-        )
+        """S3 client for Hetzner Object Storage; created once, boto3 clients are thread-safe."""
+        if self._s3_client is None:
+            self._s3_client = boto3.client(
+                's3',
+                endpoint_url=S3_ENDPOINT,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                config=Config(signature_version='s3v4')
+            )
+        return self._s3_client
 
     def validate_audio_duration(self, audio_bytes: bytes) -> float:
         """
         Validate audio duration and return duration in seconds.
-        Raises ValueError if duration exceeds 60 seconds.
+        Raises ValueError if duration exceeds MAX_AUDIO_SECONDS.
+
+        The duration is read from the MP3/WAV/WebM headers; only other formats
+        are decoded with pydub.
         """
         try:
-            audio = AudioSegment.from_file(BytesIO(audio_bytes))
-            duration_seconds = len(audio) / 1000.0
+            duration_seconds = probe_duration(audio_bytes)
+            if duration_seconds is None:
+                audio = AudioSegment.from_file(BytesIO(audio_bytes))
+                duration_seconds = len(audio) / 1000.0
             
-            if duration_seconds > 60:
-                raise ValueError(f"Audio duration ({duration_seconds:.1f}s) exceeds maximum of 60 seconds")
+            if duration_seconds > MAX_AUDIO_SECONDS:
+                raise ValueError(
+                    f"Audio duration ({duration_seconds:.1f}s) exceeds maximum of {MAX_AUDIO_SECONDS} seconds"
+                )
             
             return duration_seconds
         except Exception as e:
@@ -86,6 +104,10 @@ class SpeakingService:
             logger.error(f"Failed to validate audio: {e}")
             raise ValueError(f"Invalid audio file: {e}")
 
+    async def avalidate_audio_duration(self, audio_bytes: bytes) -> float:
+        """validate_audio_duration in the SDK thread pool (the pydub fallback shells out to ffmpeg)."""
+        return await run_blocking("audio", self.validate_audio_duration, audio_bytes)
+
     def upload_audio_to_s3(self, audio_bytes: bytes, filename: Optional[str] = None) -> tuple[str, str]:
         """
         Upload audio to Hetzner S3 bucket.
@@ -121,7 +143,19 @@ class SpeakingService:
             logger.error(f"Failed to upload audio to S3: {e}")
             raise ValueError(f"Failed to upload audio: {e}")
 
-    def transcribe_audio(self, audio_bytes: bytes) -> str:
+    async def aupload_audio_to_s3(self, audio_bytes: bytes, filename: Optional[str] = None) -> tuple[str, str]:
+        """upload_audio_to_s3 in the SDK thread pool."""
+        return await run_blocking("upload", self.upload_audio_to_s3, audio_bytes, filename)
+
+    @outbound_retry("Transcription")
+    async def _aspeech_to_text(self, audio_bytes: bytes):
+        async with outbound("elevenlabs_stt"):
+            return await self.elevenlabs_async_client.speech_to_text.convert(
+                file=BytesIO(audio_bytes),
+                model_id="scribe_v1",
+            )
+
+    async def atranscribe_audio(self, audio_bytes: bytes) -> str:
         """
         Transcribe audio using ElevenLabs Speech-to-Text API.
         
@@ -129,49 +163,24 @@ class SpeakingService:
             str: Transcription text
         """
         self._ensure_initialized()
-        
+
         try:
-            # ElevenLabs STT API - file parameter expects a file-like object
-            audio_file = BytesIO(audio_bytes)
-            result = self.elevenlabs_client.speech_to_text.convert(
-                file=audio_file,
-                model_id="scribe_v1",  # ElevenLabs Scribe model for STT
-            )
-            
+            result = await self._aspeech_to_text(audio_bytes)
             transcription = result.text if hasattr(result, 'text') else str(result)
             logger.info(f"Transcription completed: {len(transcription)} characters")
             return transcription
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             raise ValueError(f"Failed to transcribe audio: {e}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Analysis failed, retrying (attempt {retry_state.attempt_number})..."
-        ),
-    )
-    def analyze_speaking(
-        self,
-        transcription: str,
-        question: str,
-        target_words: List[TargetWord]
-    ) -> SpeakingAnalysis:
-        """
-        Analyze the speaking practice using OpenAI.
-        
-        Returns:
-            SpeakingAnalysis: Complete analysis of the speaking attempt
-        """
+    def _analysis_chain(self):
+        """Prompt | LLM | parser chain for aanalyze_speaking."""
         self._ensure_initialized()
 
         parser = PydanticOutputParser(pydantic_object=OpenAIAnalysisResponse)
 
-        # Format target words for the prompt
-        words_list = ", ".join([f'"{w.word}" ({w.translation})' for w in target_words])
-
         template = """You are a strict language examiner for German language learners.
 
 Task: Analyze the user's spoken answer.
@@ -201,17 +210,23 @@ Instructions:
             partial_variables={"format_instructions": parser.get_format_instructions()},
         )
 
-        chain = prompt | self.llm | parser
+        return prompt | self.llm | parser
 
-        logger.info("Analyzing speaking practice...")
-        result: OpenAIAnalysisResponse = chain.invoke({
+    @staticmethod
+    def _analysis_inputs(transcription: str, question: str, target_words: List[TargetWord]) -> dict:
+        # Format target words for the prompt
+        words_list = ", ".join([f'"{w.word}" ({w.translation})' for w in target_words])
+        return {
             "question": question,
             "transcription": transcription,
             "target_words": words_list,
-        })
+        }
+
+    @staticmethod
+    def _to_speaking_analysis(result: OpenAIAnalysisResponse) -> SpeakingAnalysis:
+        """Convert OpenAI response to SpeakingAnalysis model."""
         logger.info(f"Analysis completed: score={result.score}, level={result.cefr_level}")
 
-        # Convert OpenAI response to SpeakingAnalysis model
         word_usage = [
             WordUsageAnalysis(
                 word=wu.word,
@@ -231,27 +246,69 @@ Instructions:
             wordUsage=word_usage
         )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception),
-        before_sleep=lambda retry_state: logger.warning(
-            f"Question generation failed, retrying (attempt {retry_state.attempt_number})..."
-        ),
-    )
-    def generate_question(self, words: List[dict]) -> str:
+    def _cached_analysis(
+        self,
+        transcription: str,
+        question: str,
+        target_words: List[TargetWord]
+    ) -> Optional[SpeakingAnalysis]:
+        if not settings.ANALYSIS_CACHE_ENABLED:
+            return None
+        cached = analysis_cache.get(transcription, question, target_words)
+        if cached is not None:
+            logger.info("Speaking analysis served from cache")
+        return cached
+
+    def _store_analysis(
+        self,
+        transcription: str,
+        question: str,
+        target_words: List[TargetWord],
+        analysis: SpeakingAnalysis
+    ) -> None:
+        if settings.ANALYSIS_CACHE_ENABLED:
+            analysis_cache.set(transcription, question, target_words, analysis)
+
+    async def aanalyze_speaking(
+        self,
+        transcription: str,
+        question: str,
+        target_words: List[TargetWord]
+    ) -> SpeakingAnalysis:
         """
-        Generate a contextual question based on the target words.
+        Analyze the speaking practice using OpenAI.
+        
+        Repeat answers to the same question are served from the analysis cache.
         
-        Args:
-            words: List of word dictionaries with 'word' and 'translation' keys
-            
         Returns:
-            str: A question that encourages using the target words
+            SpeakingAnalysis: Complete analysis of the speaking attempt
         """
-        self._ensure_initialized()
+        cached = self._cached_analysis(transcription, question, target_words)
+        if cached is not None:
+            return cached
+        analysis = await self._aanalyze_uncached(transcription, question, target_words)
+        self._store_analysis(transcription, question, target_words, analysis)
+        return analysis
+
+    @outbound_retry("Analysis")
+    async def _aanalyze_uncached(
+        self,
+        transcription: str,
+        question: str,
+        target_words: List[TargetWord]
+    ) -> SpeakingAnalysis:
+        chain = self._analysis_chain()
 
-        words_text = ", ".join([f'"{w["word"]}" ({w["translation"]})' for w in words])
+        logger.info("Analyzing speaking practice...")
+        async with outbound("openai"):
+            result: OpenAIAnalysisResponse = await chain.ainvoke(
+                self._analysis_inputs(transcription, question, target_words)
+            )
+        return self._to_speaking_analysis(result)
+
+    def _question_chain(self):
+        """Prompt | LLM chain for agenerate_question."""
+        self._ensure_initialized()
 
         template = """You are a German language teacher creating speaking practice exercises.
 
@@ -272,13 +329,28 @@ Question:"""
             input_variables=["words"],
         )
 
-        chain = prompt | self.llm
+        return prompt | self.llm
+
+    @outbound_retry("Question generation")
+    async def agenerate_question(self, words: List[dict]) -> str:
+        """
+        Generate a contextual question based on the target words.
+        
+        Args:
+            words: List of word dictionaries with 'word' and 'translation' keys
+            
+        Returns:
+            str: A question that encourages using the target words
+        """
+        chain = self._question_chain()
+        words_text = ", ".join([f'"{w["word"]}" ({w["translation"]})' for w in words])
 
         logger.info("Generating practice question...")
-        result = chain.invoke({"words": words_text})
+        async with outbound("openai"):
+            result = await chain.ainvoke({"words": words_text})
         question = result.content.strip()
         logger.info(f"Question generated: {question[:50]}...")
-        
+
         return question
 
 
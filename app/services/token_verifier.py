@@ -0,0 +1,203 @@
+"""Local verification of Firebase ID tokens against Google's public signing keys."""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Optional
+
+import jwt
+from cryptography.x509 import load_pem_x509_certificate
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.services.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+FIREBASE_ISSUER_PREFIX = "https://securetoken.google.com/"
+
+# Refresh keys a little before Google says they expire
+REFRESH_MARGIN_SECONDS = 300
+# Used when the certificate response carries no usable Cache-Control header
+DEFAULT_MAX_AGE_SECONDS = 3600
+# Lower bound between refreshes, including those triggered by an unknown key id
+MIN_REFRESH_INTERVAL_SECONDS = 60
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(cache_control: Optional[str]) -> int:
+    """Return the max-age of a Cache-Control header in seconds."""
+    if cache_control:
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return int(match.group(1))
+    return DEFAULT_MAX_AGE_SECONDS
+
+
+class FirebaseTokenVerifier:
+    """Verifies RS256 Firebase ID tokens locally using cached Google public keys."""
+
+    def __init__(self, project_id: str = ""):
+        self.project_id = project_id
+        self._keys: Dict[str, object] = {}
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.project_id)
+
+    @property
+    def issuer(self) -> str:
+        return f"{FIREBASE_ISSUER_PREFIX}{self.project_id}"
+
+    async def _fetch_keys(self) -> int:
+        """Download the current signing certificates and return their max-age."""
+        response = await get_http_client().get(GOOGLE_CERTS_URL)
+        response.raise_for_status()
+
+        keys = {
+            kid: load_pem_x509_certificate(pem.encode()).public_key()
+            for kid, pem in response.json().items()
+        }
+        max_age = parse_max_age(response.headers.get("cache-control"))
+
+        self._keys = keys
+        self._last_refresh = time.monotonic()
+        self._expires_at = self._last_refresh + max_age
+        logger.info(f"Loaded {len(keys)} Firebase signing keys (max-age {max_age}s)")
+        return max_age
+
+    async def refresh_keys(self, force: bool = False) -> None:
+        """Refresh the key set if it is stale, or unconditionally when forced."""
+        async with self._lock:
+            now = time.monotonic()
+            if force:
+                if now - self._last_refresh < MIN_REFRESH_INTERVAL_SECONDS:
+                    return
+            elif self._keys and now < self._expires_at:
+                return
+            await self._fetch_keys()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = self._expires_at - time.monotonic() - REFRESH_MARGIN_SECONDS
+            await asyncio.sleep(max(delay, MIN_REFRESH_INTERVAL_SECONDS))
+            try:
+                async with self._lock:
+                    await self._fetch_keys()
+            except Exception as e:
+                logger.warning(f"Background Firebase key refresh failed: {e}")
+
+    async def start(self) -> None:
+        """Load the key set and schedule background refreshes."""
+        if not self.enabled or self._refresh_task is not None:
+            return
+        try:
+            await self.refresh_keys()
+        except Exception as e:
+            # Keys are fetched on demand by the first request instead
+            logger.error(f"Initial Firebase key fetch failed: {e}")
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    async def _get_key(self, kid: str):
+        try:
+            await self.refresh_keys()
+        except Exception as e:
+            if not self._keys:
+                logger.error(f"Could not fetch Firebase signing keys: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service unavailable"
+                )
+        key = self._keys.get(kid)
+        if key is None:
+            # Google may have rotated keys before our cached copy expired
+            try:
+                await self.refresh_keys(force=True)
+            except Exception as e:
+                logger.warning(f"Firebase key refresh for unknown kid failed: {e}")
+            key = self._keys.get(kid)
+        return key
+
+    async def verify(self, id_token: str) -> dict:
+        """
+        Verify a Firebase ID token and return the user in the shape of an
+        accounts:lookup result (localId, email, displayName, ...) plus `exp`.
+        """
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except jwt.PyJWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials"
+            )
+
+        if header.get("alg") != "RS256" or not header.get("kid"):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials"
+            )
+
+        key = await self._get_key(header["kid"])
+        if key is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials"
+            )
+
+        try:
+            claims = jwt.decode(
+                id_token,
+                key=key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=self.issuer,
+                leeway=10,
+                options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+            )
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token expired"
+            )
+        except jwt.PyJWTError as e:
+            logger.debug(f"Firebase token rejected: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials"
+            )
+
+        if not claims["sub"] or claims.get("auth_time", 0) > time.time() + 10:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials"
+            )
+
+        return {
+            "localId": claims["sub"],
+            "email": claims.get("email"),
+            "emailVerified": claims.get("email_verified", False),
+            "displayName": claims.get("name"),
+            "exp": claims["exp"],
+        }
+
+
+# Singleton instance
+token_verifier = FirebaseTokenVerifier(settings.FIREBASE_PROJECT_ID)
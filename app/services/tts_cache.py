@@ -0,0 +1,264 @@
+"""Content-addressed cache of synthesized speech segments, on local disk with optional object storage."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.core.concurrency import run_blocking
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Same Hetzner Object Storage bucket as the word and speaking audio
+S3_ENDPOINT = "https://fsn1.your-objectstorage.com"
+S3_BUCKET = "sprache-hackathon-audio"
+
+
+def segment_key(voice_id: str, model_id: str, text: str) -> str:
+    """SHA-256 of (voice, model, text): identical requests give identical audio."""
+    raw = json.dumps([voice_id, model_id, text], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _LeaderCancelled(Exception):
+    """The fetch producing a segment was cancelled before it had one."""
+
+
+class TTSCache:
+    """
+    MP3 segments stored as <directory>/<key[:2]>/<key>.mp3, evicted least
+    recently used first once they exceed max_bytes. Recency survives restarts
+    through file mtimes. With an S3 prefix configured, local misses are
+    looked up in object storage and new segments are written there too.
+
+    Disk and S3 I/O run in the blocking pool; the index is guarded by a lock
+    because those calls run on several threads at once. A segment requested
+    again while it is still being synthesized waits for that synthesis
+    instead of starting another.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, s3_prefix: Optional[str] = None):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.s3_prefix = s3_prefix.strip("/") if s3_prefix else None
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._s3_client = None
+        self.hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.mp3"
+
+    def _ensure_loaded(self) -> None:
+        """Index the segments already on disk, oldest first. Caller holds the lock."""
+        if self._loaded:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.glob("*/*.mp3"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._loaded = True
+        self._evict()
+        logger.info(f"TTS cache: {len(self._index)} segments, {self._bytes} bytes in {self.directory}")
+
+    def _evict(self) -> None:
+        """Drop least recently used segments until under max_bytes. Caller holds the lock."""
+        while self._bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def _read_local(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except OSError:
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._bytes -= size
+            return None
+
+    def _write_local(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename, so readers never see a partial segment
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._ensure_loaded()
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def _get_s3_client(self):
+        if self._s3_client is None:
+            self._s3_client = boto3.client(
+                's3',
+                endpoint_url=S3_ENDPOINT,
+                aws_access_key_id=settings.S3_ACCESS_KEY,
+                aws_secret_access_key=settings.S3_SECRET_KEY,
+                config=Config(signature_version='s3v4')
+            )
+        return self._s3_client
+
+    def _read_remote(self, key: str) -> Optional[bytes]:
+        try:
+            response = self._get_s3_client().get_object(Bucket=S3_BUCKET, Key=f"{self.s3_prefix}/{key}.mp3")
+            return response["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("NoSuchKey", "404"):
+                logger.warning(f"TTS cache object storage read failed: {e}")
+            return None
+
+    def _write_remote(self, key: str, data: bytes) -> None:
+        self._get_s3_client().put_object(
+            Bucket=S3_BUCKET,
+            Key=f"{self.s3_prefix}/{key}.mp3",
+            Body=data,
+            ContentType="audio/mpeg",
+        )
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        data = self._read_local(key)
+        if data is None and self.s3_prefix:
+            data = self._read_remote(key)
+            if data is not None:
+                self.remote_hits += 1
+                self._write_local(key, data)
+        return data
+
+    def _store(self, key: str, data: bytes) -> None:
+        self._write_local(key, data)
+        if self.s3_prefix:
+            self._write_remote(key, data)
+
+    async def fetch(
+        self,
+        voice_id: str,
+        model_id: str,
+        text: str,
+        synthesize: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """The cached segment, or synthesize() stored for next time."""
+        key = segment_key(voice_id, model_id, text)
+
+        while (pending := self._inflight.get(key)) is not None:
+            try:
+                data = await asyncio.shield(pending)
+            except _LeaderCancelled:
+                # Whoever was producing it gave up; produce it ourselves or join the next one
+                continue
+            self.hits += 1
+            self.bytes_saved += len(data)
+            return data
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._load_or_synthesize(key, synthesize)
+        except asyncio.CancelledError:
+            # Only this fetch was cancelled, not the ones waiting on it
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters see the failure; nobody needs to retrieve it otherwise
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+        finally:
+            del self._inflight[key]
+        return data
+
+    async def _load_or_synthesize(self, key: str, synthesize: Callable[[], Awaitable[bytes]]) -> bytes:
+        try:
+            data = await run_blocking("audio", self._lookup, key)
+        except Exception as e:
+            logger.warning(f"TTS cache read failed, synthesizing: {e}")
+            data = None
+        if data is not None:
+            self.hits += 1
+            self.bytes_saved += len(data)
+            return data
+
+        self.misses += 1
+        data = await synthesize()
+        try:
+            await run_blocking("audio", self._store, key, data)
+        except Exception as e:
+            logger.warning(f"TTS cache write failed: {e}")
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            for key in list(self._index):
+                try:
+                    self._path(key).unlink()
+                except OSError:
+                    pass
+            self._index.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+        }
+
+
+tts_cache = TTSCache(
+    directory=settings.TTS_CACHE_DIR,
+    max_bytes=settings.TTS_CACHE_MAX_BYTES,
+    s3_prefix=settings.TTS_CACHE_S3_PREFIX or None,
+)
@@ -0,0 +1,124 @@
+"""Streaming multipart/form-data parsing with limits enforced while the body arrives."""
+
+import logging
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from app.services.audio_probe import DurationProbe
+
+logger = logging.getLogger(__name__)
+
+# Room for the text fields and multipart framing on top of the file itself
+FORM_OVERHEAD_BYTES = 64 * 1024
+# Re-probe the duration each time this much more audio has arrived
+PROBE_INTERVAL_BYTES = 128 * 1024
+
+
+class StreamedUpload:
+    """Text fields and the single file of a streamed multipart form."""
+
+    def __init__(self):
+        self.fields: Dict[str, str] = {}
+        self.file_bytes = bytearray()
+        self.filename: Optional[str] = None
+        self.duration_seconds: Optional[float] = None
+
+
+async def read_audio_upload(
+    request: Request,
+    file_field: str,
+    max_bytes: int,
+    max_seconds: float,
+) -> StreamedUpload:
+    """
+    Read a multipart form holding one audio file from the request stream.
+
+    Instead of letting Starlette spool the whole body first, the parser is fed
+    chunk by chunk: Content-Length is checked up front, the file is capped at
+    max_bytes while it arrives, and its duration is probed from the headers
+    received so far, so long recordings are rejected before the upload ends.
+    The probe gives a lower bound until the body is complete, then the exact
+    value (None if the format is not recognised); it resumes where it stopped
+    rather than re-reading the whole buffer each time.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data body")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes + FORM_OVERHEAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Audio file exceeds {max_bytes // (1024 * 1024)} MB")
+
+    upload = StreamedUpload()
+    audio = bytearray()
+    text_fields: Dict[str, bytearray] = {}
+    part = {"headers": {}, "field": b"", "value": b"", "name": None, "is_file": False}
+
+    def on_header_field(data: bytes, start: int, end: int):
+        part["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"], part["value"] = b"", b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode("utf-8", "replace")
+        part["name"] = name
+        part["is_file"] = name == file_field
+        if part["is_file"]:
+            upload.filename = disposition.get(b"filename", b"").decode("utf-8", "replace") or None
+        else:
+            text_fields[name] = bytearray()
+
+    def on_part_data(data: bytes, start: int, end: int):
+        if part["is_file"]:
+            audio.extend(data[start:end])
+            if len(audio) > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Audio file exceeds {max_bytes // (1024 * 1024)} MB")
+        else:
+            text_fields[part["name"]].extend(data[start:end])
+            if sum(len(v) for v in text_fields.values()) > FORM_OVERHEAD_BYTES:
+                raise HTTPException(status_code=413, detail="Form fields too large")
+
+    def on_part_begin():
+        part.update(headers={}, field=b"", value=b"", name=None, is_file=False)
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+    })
+
+    def check_duration(duration: Optional[float]):
+        if duration is not None and duration > max_seconds:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Audio duration ({duration:.1f}s) exceeds maximum of {max_seconds:g} seconds"
+            )
+
+    probe = DurationProbe()
+    probed_at = 0
+    async for chunk in request.stream():
+        parser.write(chunk)
+        if len(audio) - probed_at >= PROBE_INTERVAL_BYTES:
+            probed_at = len(audio)
+            check_duration(probe.update(audio))
+    parser.finalize()
+
+    upload.duration_seconds = probe.update(audio)
+    check_duration(upload.duration_seconds)
+
+    upload.fields = {name: value.decode("utf-8", "replace") for name, value in text_fields.items()}
+    # Handed over as is: a bytes() copy would double the peak memory of a large upload
+    upload.file_bytes = audio
+    return upload
@@ -0,0 +1,157 @@
+"""In-memory vocabulary catalogue serving /words and /flashcards without Mongo reads."""
+
+import asyncio
+import logging
+import random
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.core.config import settings
+from app.db.words import format_card, format_word, word_projection
+
+logger = logging.getLogger(__name__)
+
+# Ingest scripts bump {"_id": "words", "version": n} here after writing words
+CATALOG_META_COLLECTION = "catalog_meta"
+WORDS_VERSION_ID = "words"
+
+
+async def get_words_version(db: AsyncIOMotorDatabase) -> Optional[int]:
+    meta = await db[CATALOG_META_COLLECTION].find_one({"_id": WORDS_VERSION_ID})
+    return meta.get("version") if meta else None
+
+
+async def bump_words_version(db: AsyncIOMotorDatabase) -> None:
+    """Mark the words collection as changed so every worker reloads its catalogue."""
+    await db[CATALOG_META_COLLECTION].update_one(
+        {"_id": WORDS_VERSION_ID},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+class VersionedCatalogue(ABC):
+    """
+    Process-wide snapshot of the words collection, rebuilt whenever the words
+    version stamp moves. Subclasses implement load().
+    """
+
+    name = "catalogue"
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        """Build the snapshot and record the words version it was built from."""
+
+    async def ensure_loaded(self, db: AsyncIOMotorDatabase) -> None:
+        if self.loaded:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await self.load(db)
+
+    async def refresh_if_stale(self, db: AsyncIOMotorDatabase) -> bool:
+        """Reload when the version stamp has moved; returns whether it reloaded."""
+        version = await get_words_version(db)
+        if self.loaded and version == self.version:
+            return False
+        async with self._lock:
+            await self.load(db)
+        return True
+
+    async def _refresh_loop(self, db: AsyncIOMotorDatabase) -> None:
+        while True:
+            await asyncio.sleep(settings.VOCABULARY_REFRESH_SECONDS)
+            try:
+                await self.refresh_if_stale(db)
+            except Exception as e:
+                logger.warning(f"{self.name} refresh failed: {e}")
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        """Load the catalogue and poll the version stamp in the background."""
+        try:
+            await self.ensure_loaded(db)
+        except Exception as e:
+            # The first request loads it instead
+            logger.error(f"{self.name} load failed: {e}")
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(db))
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+
+class VocabularyCatalogue(VersionedCatalogue):
+    """
+    Copy of the words collection, pre-shaped for responses and indexed by
+    CEFR level and by id. Response dicts are shared between requests and
+    must not be mutated.
+    """
+
+    name = "Vocabulary catalogue"
+
+    def __init__(self):
+        super().__init__()
+        self._words_by_level: Dict[str, List[dict]] = {}
+        self._cards_by_level: Dict[str, List[dict]] = {}
+        self._cards_by_id: Dict[str, dict] = {}
+
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        version = await get_words_version(db)
+        words_by_level: Dict[str, List[dict]] = {}
+        cards_by_level: Dict[str, List[dict]] = {}
+        cards_by_id: Dict[str, dict] = {}
+
+        async for doc in db["words"].find({}, word_projection("catalogue")):
+            level = doc.get("cerf_level")
+            card = format_card(doc)
+            cards_by_id[card["id"]] = card
+            if level:
+                words_by_level.setdefault(level, []).append(format_word(doc))
+                cards_by_level.setdefault(level, []).append(card)
+
+        # Swap in whole structures so readers never see a half-built catalogue
+        self._words_by_level = words_by_level
+        self._cards_by_level = cards_by_level
+        self._cards_by_id = cards_by_id
+        self.version = version
+        self.loaded = True
+        logger.info(f"Vocabulary catalogue loaded: {len(cards_by_id)} words, version {version}")
+
+    def words(self, level: str) -> List[dict]:
+        return self._words_by_level.get(level, [])
+
+    def sample_cards(self, level: str, size: int) -> List[dict]:
+        """`size` random cards from a level; O(size), the level list is not copied."""
+        cards = self._cards_by_level.get(level, [])
+        return random.sample(cards, min(len(cards), size))
+
+    def cards_by_ids(self, word_ids: List[str]) -> List[dict]:
+        """Cards for the given ids, in the given order; unknown ids are skipped."""
+        return [self._cards_by_id[wid] for wid in word_ids if wid in self._cards_by_id]
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "version": self.version,
+            "words": len(self._cards_by_id),
+            "levels": {level: len(cards) for level, cards in self._cards_by_level.items()},
+        }
+
+
+# Singleton instance
+vocabulary = VocabularyCatalogue()
@@ -0,0 +1,203 @@
+"""Write-behind buffer for test results and flashcard progress."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from pymongo import ReplaceOne, UpdateOne
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Collects writes in memory and flushes them as bulk_write batches every
+    WRITE_BEHIND_FLUSH_SECONDS, or as soon as WRITE_BEHIND_MAX_BATCH writes are
+    pending. Flashcard progress is coalesced per (user, level): only the latest
+    index is written. Every write is idempotent, so a failed flush, which may
+    have partly applied, is simply retried in full. At most
+    WRITE_BEHIND_MAX_PENDING writes are held. Beyond that, new flashcard
+    progress is dropped and logged, being only the latest card position; test
+    results are never dropped, the caller writes them directly instead.
+    Pending writes are lost if the process dies; stop() drains them on a clean
+    shutdown.
+    """
+
+    def __init__(self):
+        self._progress: Dict[Tuple[str, str], int] = {}
+        # (test_results document, matching test_summaries update or None)
+        self._results: List[Tuple[dict, Optional[UpdateOne]]] = []
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self.metrics = {
+            "flushes": 0,
+            "failed_flushes": 0,
+            "progress_written": 0,
+            "progress_coalesced": 0,
+            "results_written": 0,
+            "dropped": 0,
+            "results_refused": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def depth(self) -> int:
+        return len(self._progress) + len(self._results)
+
+    def _full(self) -> bool:
+        return self.depth() >= settings.WRITE_BEHIND_MAX_PENDING
+
+    def _written(self) -> None:
+        if self.depth() >= settings.WRITE_BEHIND_MAX_BATCH:
+            self._wakeup.set()
+
+    def record_progress(self, user_id: str, level: str, current_index: int) -> None:
+        """Queue the current card index of the user's active session for a level."""
+        if (user_id, level) in self._progress:
+            self.metrics["progress_coalesced"] += 1
+        elif self._full():
+            self.metrics["dropped"] += 1
+            logger.error(f"Write-behind buffer is full ({self.depth()} pending), dropping progress of {user_id}")
+            return
+        self._progress[(user_id, level)] = current_index
+        self._written()
+
+    def pending_progress(self, user_id: str, level: str) -> Optional[int]:
+        return self._progress.get((user_id, level))
+
+    def discard_progress(self, user_id: str, level: str) -> None:
+        """Drop unflushed progress, e.g. when the session is being reset."""
+        self._progress.pop((user_id, level), None)
+
+    def add_result(self, result_doc: dict, summary_update: Optional[UpdateOne] = None) -> bool:
+        """
+        Queue a test_results insert, and the test_summaries update applied
+        after it. Returns False, queueing nothing, when the buffer is full; the
+        caller must then write the result itself.
+        """
+        if self._full():
+            self.metrics["results_refused"] += 1
+            logger.warning(f"Write-behind buffer is full ({self.depth()} pending), refusing a test result")
+            return False
+        # A fixed _id keeps the insert idempotent if a failed flush is retried
+        result_doc.setdefault("_id", ObjectId())
+        self._results.append((result_doc, summary_update))
+        self._written()
+        return True
+
+    def pending_results(self, user_id: str) -> List[dict]:
+        """Unflushed results of a user, newest first."""
+        return [doc for doc, _ in reversed(self._results) if doc["userId"] == user_id]
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if self._db is None or not self.depth():
+                return
+            # Swap the buffers out; writes arriving during the flush go to new ones
+            progress, self._progress = self._progress, {}
+            results, self._results = self._results, []
+
+            started = time.perf_counter()
+            try:
+                await self._write(progress, results)
+            except Exception as e:
+                self.metrics["failed_flushes"] += 1
+                logger.error(f"Write-behind flush of {len(progress) + len(results)} writes failed: {e}")
+                # Requeue, without overwriting progress recorded since
+                for key, index in progress.items():
+                    self._progress.setdefault(key, index)
+                self._results[:0] = results
+                self._trim()
+                return
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.metrics["flushes"] += 1
+            self.metrics["progress_written"] += len(progress)
+            self.metrics["results_written"] += len(results)
+            self.metrics["last_flush_ms"] = elapsed_ms
+            self.metrics["max_flush_ms"] = max(self.metrics["max_flush_ms"], elapsed_ms)
+            self.metrics["total_flush_ms"] += elapsed_ms
+
+    def _trim(self) -> None:
+        """Drop progress beyond WRITE_BEHIND_MAX_PENDING; requeued results are all kept."""
+        overflow = min(self.depth() - settings.WRITE_BEHIND_MAX_PENDING, len(self._progress))
+        if overflow <= 0:
+            return
+        for key in list(self._progress)[:overflow]:
+            del self._progress[key]
+        self.metrics["dropped"] += overflow
+        logger.error(f"Write-behind buffer is full, dropped {overflow} requeued progress writes")
+
+    async def _write(
+        self, progress: Dict[Tuple[str, str], int], results: List[Tuple[dict, Optional[UpdateOne]]]
+    ) -> None:
+        db = self._db
+        writes = []
+        if progress:
+            writes.append(db["flashcard_sessions"].bulk_write([
+                UpdateOne(
+                    {"user_id": user_id, "level": level, "is_active": True},
+                    {"$set": {"current_index": index}}
+                )
+                for (user_id, level), index in progress.items()
+            ], ordered=False))
+        if results:
+            writes.append(db["test_results"].bulk_write(
+                [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc, _ in results],
+                ordered=False
+            ))
+        await asyncio.gather(*writes)
+
+        # Summaries only after their results are in
+        summary_updates = [op for _, op in results if op is not None]
+        if summary_updates:
+            await db["test_summaries"].bulk_write(summary_updates, ordered=False)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.WRITE_BEHIND_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._db = db
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and drain whatever is still pending."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        if self.depth():
+            logger.error(f"Write-behind buffer stopped with {self.depth()} unwritten writes")
+
+    def stats(self) -> dict:
+        flushes = self.metrics["flushes"]
+        return {
+            "queue_depth": self.depth(),
+            "pending_progress": len(self._progress),
+            "pending_results": len(self._results),
+            "avg_flush_ms": self.metrics["total_flush_ms"] / flushes if flushes else 0.0,
+            **self.metrics,
+        }
+
+
+# Singleton instance
+write_behind = WriteBehindBuffer()
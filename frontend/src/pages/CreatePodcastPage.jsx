@@ -12,10 +12,18 @@ import {
 } from 'lucide-react';
 import { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { createPodcast, getContexts, getVoices } from '../services/podcastService';
+import { createPodcast, getContexts, getVoices, waitForPodcast } from '../services/podcastService';
 
 const CEFR_LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2'];
 
+// Generation stages reported by the backend, in order
+const GENERATION_STEPS = [
+    { status: 'script', label: 'Generating dialogue script...' },
+    { status: 'audio', label: 'Creating audio with ElevenLabs...' },
+    { status: 'upload', label: 'Uploading audio...' },
+    { status: 'quiz', label: 'Preparing quiz questions...' },
+];
+
 // Level badge styles
 const levelStyles = {
     A1: "bg-emerald-50 text-emerald-700 border-emerald-200",
@@ -43,6 +51,7 @@ export default function CreatePodcastPage() {
     // UI state
     const [isLoading, setIsLoading] = useState(false);
     const [isGenerating, setIsGenerating] = useState(false);
+    const [generationStatus, setGenerationStatus] = useState('queued');
     const [error, setError] = useState(null);
     const [contextDropdownOpen, setContextDropdownOpen] = useState(false);
     const [voiceDropdownOpen, setVoiceDropdownOpen] = useState(false);
@@ -117,20 +126,22 @@ export default function CreatePodcastPage() {
         }
 
         setError(null);
+        setGenerationStatus('queued');
         setIsGenerating(true);
 
         try {
-            const podcast = await createPodcast({
+            const job = await createPodcast({
                 words,
                 cefr_level: selectedLevel,
                 context: selectedContext,
                 voice_ids: selectedVoices
             });
+            const podcast = await waitForPodcast(job.id, setGenerationStatus);
 
             // Navigate to the new podcast
             navigate(`/learning/listening/${podcast.id}`);
         } catch (err) {
-            setError(err.response?.data?.detail || 'Failed to generate podcast. Please try again.');
+            setError(err.response?.data?.detail || err.message || 'Failed to generate podcast. Please try again.');
             console.error(err);
         } finally {
             setIsGenerating(false);
@@ -435,9 +446,24 @@ export default function CreatePodcastPage() {
                             Our AI is creating your personalized German learning podcast with script, audio, and quiz questions.
                         </p>
                         <div className="space-y-2 text-xs text-slate-400">
-                            <p>• Generating dialogue script...</p>
-                            <p>• Creating audio with ElevenLabs...</p>
-                            <p>• Preparing quiz questions...</p>
+                            {generationStatus === 'queued' && (
+                                <p className="text-indigo-600 font-medium">Waiting in queue...</p>
+                            )}
+                            {GENERATION_STEPS.map((step, index) => {
+                                const current = GENERATION_STEPS.findIndex(s => s.status === generationStatus);
+                                return (
+                                    <p
+                                        key={step.status}
+                                        className={
+                                            index === current ? 'text-indigo-600 font-medium'
+                                                : index < current ? 'text-emerald-600'
+                                                    : ''
+                                        }
+                                    >
+                                        {index < current ? '✓' : '•'} {step.label}
+                                    </p>
+                                );
+                            })}
                         </div>
                     </div>
                 </div>
@@ -24,6 +24,7 @@ const TestPage = () => {
   const [currentIndex, setCurrentIndex] = useState(0);
   const [selectedOption, setSelectedOption] = useState(null);
   const [isCorrect, setIsCorrect] = useState(null);
+  const [feedback, setFeedback] = useState(null);
   const [score, setScore] = useState(0);
   const [isFinished, setIsFinished] = useState(false);
   const [answers, setAnswers] = useState([]);
@@ -43,6 +44,7 @@ const TestPage = () => {
       setCurrentIndex(0);
       setScore(0);
       setAnswers([]);
+      setFeedback(null);
       setIsFinished(false);
       setFinalResult(null);
     } catch (err) {
@@ -62,26 +64,31 @@ const TestPage = () => {
     }
   };
 
-  const handleOptionSelect = (option) => {
+  const handleOptionSelect = async (option) => {
     if (selectedOption !== null) return;
 
     const currentQuestion = testSession.questions[currentIndex];
     setSelectedOption(option);
-    const correct = option === currentQuestion.correct_answer;
-    setIsCorrect(correct);
 
-    if (correct) {
-      setScore(prev => prev + 1);
-    }
-
-    // Record the answer
+    // Record the answer; the server grades it on submit
     setAnswers(prev => [...prev, {
-      question_index: currentIndex,
-      word_id: currentQuestion.word_id,
-      question: currentQuestion.question,
+      question_id: currentQuestion.question_id,
       selected_answer: option,
-      correct_answer: currentQuestion.correct_answer,
     }]);
+
+    try {
+      const result = await testService.checkAnswer(
+        level, testSession.session_token, currentQuestion.question_id, option
+      );
+      setFeedback(result);
+      setIsCorrect(result.is_correct);
+      if (result.is_correct) {
+        setScore(prev => prev + 1);
+      }
+    } catch (err) {
+      setFeedback({ is_correct: false, correct_answer: null, explanation: '' });
+      setIsCorrect(false);
+    }
   };
 
   const nextQuestion = async () => {
@@ -89,6 +96,7 @@ const TestPage = () => {
       setCurrentIndex(prev => prev + 1);
       setSelectedOption(null);
       setIsCorrect(null);
+      setFeedback(null);
     } else {
       // Submit the test - include current answer since state might not be updated yet
       setSubmitting(true);
@@ -98,19 +106,16 @@ const TestPage = () => {
       const allAnswers = [...answers];
       
       // Check if current answer is already in the array (avoid duplicates)
-      const currentAnswerExists = allAnswers.some(a => a.question_index === currentIndex);
+      const currentAnswerExists = allAnswers.some(a => a.question_id === currentQuestion.question_id);
       if (!currentAnswerExists && selectedOption) {
         allAnswers.push({
-          question_index: currentIndex,
-          word_id: currentQuestion.word_id,
-          question: currentQuestion.question,
+          question_id: currentQuestion.question_id,
           selected_answer: selectedOption,
-          correct_answer: currentQuestion.correct_answer,
         });
       }
       
       try {
-        const result = await testService.submitTest(level, allAnswers);
+        const result = await testService.submitTest(level, testSession.session_token, allAnswers);
         setFinalResult(result);
         setIsFinished(true);
       } catch (err) {
@@ -306,9 +311,9 @@ const TestPage = () => {
               let btnStyle = "bg-white border-2 border-slate-200 text-slate-600 hover:border-indigo-300 hover:bg-indigo-50";
               
               if (selectedOption !== null) {
-                if (option === currentQuestion.correct_answer) {
+                if (feedback && option === feedback.correct_answer) {
                   btnStyle = "bg-emerald-50 border-2 border-emerald-500 text-emerald-700 font-bold";
-                } else if (option === selectedOption && !isCorrect) {
+                } else if (option === selectedOption && isCorrect === false) {
                   btnStyle = "bg-rose-50 border-2 border-rose-500 text-rose-700 opacity-70";
                 } else {
                   btnStyle = "bg-slate-50 border-2 border-slate-100 text-slate-300 opacity-50";
@@ -354,7 +359,7 @@ const TestPage = () => {
       </div>
       
       {/* Explanation Feedback */}
-      {selectedOption !== null && (
+      {feedback && (
         <div className={`mt-4 animate-in slide-in-from-top-2 duration-200 rounded-xl p-4 flex items-start gap-3 shadow-sm ${
           isCorrect 
             ? 'bg-emerald-50 border border-emerald-100' 
@@ -371,16 +376,16 @@ const TestPage = () => {
             }`}>
               {isCorrect ? 'Correct!' : 'Incorrect'}
             </span>
-            {currentQuestion.explanation && (
+            {feedback.explanation && (
               <p className={`text-sm mt-1 ${
                 isCorrect ? 'text-emerald-900' : 'text-rose-900'
               }`}>
-                {currentQuestion.explanation}
+                {feedback.explanation}
               </p>
             )}
-            {!isCorrect && (
+            {!isCorrect && feedback.correct_answer && (
               <p className="text-sm mt-2 font-medium text-rose-700">
-                Correct answer: <span className="font-bold">{currentQuestion.correct_answer}</span>
+                Correct answer: <span className="font-bold">{feedback.correct_answer}</span>
               </p>
             )}
           </div>
@@ -47,13 +47,41 @@ export const getPodcast = async (podcastId) => {
 };
 
 /**
- * Create a new podcast
+ * Queue a new podcast for generation.
+ * Resolves to the job: { id, status: 'queued', error, podcast }
  */
 export const createPodcast = async (podcastData) => {
     const response = await api.post('/podcasts/', podcastData);
     return response.data;
 };
 
+/**
+ * Fetch the generation status of a podcast
+ * (queued, script, audio, upload, quiz, ready or failed)
+ */
+export const getPodcastStatus = async (podcastId) => {
+    const response = await api.get(`/podcasts/${podcastId}/status`);
+    return response.data;
+};
+
+/**
+ * Poll a podcast until it is ready and resolve to the podcast.
+ * onStatus is called with each status as generation moves along.
+ */
+export const waitForPodcast = async (podcastId, onStatus, intervalMs = 2000) => {
+    for (;;) {
+        const job = await getPodcastStatus(podcastId);
+        if (onStatus) onStatus(job.status);
+        if (job.status === 'ready') {
+            return job.podcast;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Failed to generate podcast');
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+};
+
 /**
  * Delete a podcast by ID
  */
@@ -195,7 +195,9 @@ export const speakingService = {
     },
 
     /**
-     * Submit an audio recording for analysis.
+     * Submit an audio recording for analysis and wait for the result.
+     * The backend queues the analysis and returns a job ID, which is polled
+     * until the analysis completes or fails.
      * @param {Blob} audioBlob - The recorded audio blob
      * @param {string} questionText - The question that was asked
      * @param {Array} targetWords - Array of target word objects
@@ -232,7 +234,8 @@ export const speakingService = {
                 throw new Error(getErrorMessage(errorData, 'Failed to analyze recording'));
             }
             
-            return await response.json();
+            const job = await response.json();
+            return await speakingService.waitForAnalysis(job.jobId);
         } catch (error) {
             console.error("Error submitting recording:", error);
             if (error instanceof Error) {
@@ -242,6 +245,47 @@ export const speakingService = {
         }
     },
 
+    /**
+     * Get the status of a speaking analysis job.
+     * @param {string} jobId - The job ID returned by submitRecording
+     * @returns {Promise<{jobId: string, status: string, error?: string, session?: Object}>}
+     */
+    getJob: async (jobId) => {
+        const response = await fetch(
+            `${API_URL}/speaking/jobs/${jobId}`,
+            { headers: getAuthHeaders() }
+        );
+        
+        if (!response.ok) {
+            if (response.status === 401) {
+                throw new Error('Session expired. Please log in again.');
+            }
+            const errorData = await response.json().catch(() => null);
+            throw new Error(getErrorMessage(errorData, 'Failed to fetch analysis status'));
+        }
+        
+        return await response.json();
+    },
+
+    /**
+     * Poll a speaking analysis job until it completes.
+     * @param {string} jobId - The job ID returned by POST /speaking/analyze
+     * @param {number} intervalMs - Delay between polls
+     * @returns {Promise<Object>} - The analysed session
+     */
+    waitForAnalysis: async (jobId, intervalMs = 1500) => {
+        for (;;) {
+            const job = await speakingService.getJob(jobId);
+            if (job.status === 'completed') {
+                return job.session;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Failed to analyze recording');
+            }
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+    },
+
     /**
      * Get the user's speaking practice history.
      * @param {number} skip - Number of records to skip (for pagination)
@@ -51,14 +51,39 @@ export const testService = {
     },
 
     /**
-     * Submit test answers and get results.
+     * Check one answer of a test session; returns the correct answer and explanation.
      */
-    submitTest: async (level, answers) => {
+    checkAnswer: async (level, sessionToken, questionId, selectedAnswer) => {
+        try {
+            const response = await fetch(`${API_URL}/tests/${level}/check`, {
+                method: 'POST',
+                headers: getAuthHeaders(),
+                body: JSON.stringify({
+                    session_token: sessionToken,
+                    question_id: questionId,
+                    selected_answer: selectedAnswer
+                })
+            });
+            if (!response.ok) {
+                const errorData = await response.json().catch(() => ({}));
+                throw new Error(errorData.detail || 'Failed to check answer');
+            }
+            return await response.json();
+        } catch (error) {
+            console.error("Error checking answer:", error);
+            throw error;
+        }
+    },
+
+    /**
+     * Submit test answers and get results. Grading happens on the server.
+     */
+    submitTest: async (level, sessionToken, answers) => {
         try {
             const response = await fetch(`${API_URL}/tests/${level}/submit`, {
                 method: 'POST',
                 headers: getAuthHeaders(),
-                body: JSON.stringify({ answers })
+                body: JSON.stringify({ session_token: sessionToken, answers })
             });
             if (!response.ok) {
                 const errorData = await response.json().catch(() => ({}));
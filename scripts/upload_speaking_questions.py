@@ -19,6 +19,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from app.db.indexes import ensure_indexes
+
 # Speaking questions data - organized by level
 # Each target_word is now an object with "word" and "translation"
 
@@ -1794,12 +1796,9 @@ async def upload_questions():
     final_count = await collection.count_documents({})
     print(f"  - Total questions in database: {final_count}")
     
-    # Create indexes for efficient queries
-    await collection.create_index("id", unique=True)
-    await collection.create_index("theme")
-    await collection.create_index("level")
-    await collection.create_index([("level", 1), ("theme", 1)])
-    print("  - Created indexes on 'id' (unique), 'theme', 'level', and compound (level, theme)")
+    # Create indexes for efficient queries (declared in app/db/indexes.py)
+    report = await ensure_indexes(db, ["speaking_questions"])
+    print(f"  - Created indexes: {report['speaking_questions']['created'] or 'none (all present)'}")
     
     # List levels and themes
     levels = await collection.distinct("level")
@@ -2,6 +2,7 @@
 import os
 import json
 import asyncio
+from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import urllib.parse
@@ -72,6 +73,13 @@ async def upload_files():
         count += len(batch)
 
     print(f"Finished. Total documents uploaded: {count}")
+
+    # Tell running backends to reload their vocabulary catalogue and level counts
+    await db["catalog_meta"].update_one(
+        {"_id": "words"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
     client.close()
 
 if __name__ == "__main__":
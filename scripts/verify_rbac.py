@@ -11,7 +11,9 @@ load_dotenv()
 
 BASE_URL = "http://127.0.0.1:8000"
 
-# Direct DB connection to manipulate roles for testing
+# Direct DB connection to manipulate roles for testing. The server caches resolved
+# users for AUTH_CACHE_TTL_SECONDS, so run it with AUTH_CACHE_TTL_SECONDS=0 to see
+# each role change straight away.
 mongo_uri = f"mongodb+srv://{os.getenv('MONGO_USER')}:{os.getenv('MONGO_PASSWORD')}@{os.getenv('MONGO_ADDRESS')}/?appName={os.getenv('MONGO_CLUSTER')}"
 client = MongoClient(mongo_uri)
 db = client.get_database("hackaton")
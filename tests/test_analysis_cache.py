@@ -0,0 +1,64 @@
+import os
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.models.speaking import SpeakingAnalysis, TargetWord
+from app.services.analysis_cache import AnalysisCache, normalize_text
+
+QUESTION = "Was machst du am Wochenende?"
+WORDS = [
+    TargetWord(wordId="1", word="Wochenende", translation="weekend"),
+    TargetWord(wordId="2", word="schwimmen", translation="to swim"),
+]
+
+
+def make_analysis(transcription: str) -> SpeakingAnalysis:
+    return SpeakingAnalysis(
+        transcription=transcription,
+        correctedText="Am Wochenende gehe ich schwimmen.",
+        cefrLevel="A2",
+        score=80,
+        generalFeedback="Gut gemacht!",
+        wordUsage=[],
+    )
+
+
+def test_normalize_text():
+    assert normalize_text("  Am Wochenende,   gehe ich „schwimmen“! ") == "am wochenende gehe ich schwimmen"
+
+
+def test_exact_hit_ignores_whitespace_and_word_order():
+    cache = AnalysisCache(maxsize=10, ttl=60, normalized=False)
+    cache.set("Am Wochenende gehe ich schwimmen.", QUESTION, WORDS, make_analysis("x"))
+
+    hit = cache.get("Am  Wochenende gehe ich schwimmen. ", QUESTION, list(reversed(WORDS)))
+    assert hit is not None
+    assert hit.score == 80
+    assert hit.transcription == "Am  Wochenende gehe ich schwimmen. "
+
+    assert cache.get("am wochenende gehe ich schwimmen", QUESTION, WORDS) is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_normalized_tier_ignores_case_and_punctuation():
+    cache = AnalysisCache(maxsize=10, ttl=60, normalized=True)
+    cache.set("Am Wochenende gehe ich schwimmen.", QUESTION, WORDS, make_analysis("x"))
+
+    assert cache.get("am wochenende, gehe ich schwimmen", QUESTION, WORDS) is not None
+    stats = cache.stats()
+    assert stats["exact"]["hits"] == 0
+    assert stats["normalized"]["hits"] == 1
+    assert stats["hit_ratio"] == 1.0
+
+
+def test_question_and_words_are_part_of_the_key():
+    cache = AnalysisCache(maxsize=10, ttl=60, normalized=True)
+    cache.set("Ich schwimme.", QUESTION, WORDS, make_analysis("x"))
+
+    assert cache.get("Ich schwimme.", "Was machst du heute?", WORDS) is None
+    assert cache.get("Ich schwimme.", QUESTION, WORDS[:1]) is None
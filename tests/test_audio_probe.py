@@ -0,0 +1,143 @@
+import io
+import os
+import struct
+import wave
+import pytest
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.audio_probe import DurationProbe, probe_duration, probe_mp3, probe_wav, probe_webm
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+MP3_HEADER = b"\xff\xfb\x90\x00"
+MP3_FRAME_SECONDS = 1152 / 44100
+
+
+def mp3_frame(payload: bytes = b"") -> bytes:
+    return (MP3_HEADER + payload).ljust(417, b"\x00")
+
+
+def make_wav(seconds: float, rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+def ebml(element_id: int, body: bytes = b"", unknown_size: bool = False) -> bytes:
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    if unknown_size:
+        size = b"\x01\xff\xff\xff\xff\xff\xff\xff"
+    elif len(body) < 127:
+        size = bytes([0x80 | len(body)])
+    else:
+        size = b"\x01" + len(body).to_bytes(7, "big")
+    return id_bytes + size + body
+
+
+def simple_block(relative_ms: int, payload: int = 40) -> bytes:
+    # track 1, relative timestamp, flags, some Opus payload
+    return ebml(0xA3, b"\x81" + struct.pack(">h", relative_ms) + b"\x80" + b"\x00" * payload)
+
+
+def make_webm(clusters, duration_ms=None, block_payload=40) -> bytes:
+    info = ebml(0x2AD7B1, (1_000_000).to_bytes(3, "big"))
+    if duration_ms is not None:
+        info += ebml(0x4489, struct.pack(">d", duration_ms))
+    track = ebml(0xD7, b"\x01") + ebml(0x86, b"A_OPUS")
+    body = ebml(0x1549A966, info) + ebml(0x1654AE6B, ebml(0xAE, track))
+    for timecode, blocks in clusters:
+        # MediaRecorder writes clusters (and the segment) with unknown size
+        cluster = ebml(0xE7, timecode.to_bytes(2, "big")) + b"".join(simple_block(b, block_payload) for b in blocks)
+        body += ebml(0x1F43B675, cluster, unknown_size=True)
+    header = ebml(0x1A45DFA3, ebml(0x4282, b"webm"))
+    return header + ebml(0x18538067, body, unknown_size=True)
+
+
+def test_wav():
+    assert probe_wav(make_wav(1.5)) == pytest.approx(1.5)
+
+
+def test_mp3_frame_scan_after_id3_tag():
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    data = id3 + mp3_frame() * 100
+    assert probe_mp3(data) == pytest.approx(100 * MP3_FRAME_SECONDS)
+
+
+def test_mp3_xing_header():
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">II", 0x01, 2000)
+    data = mp3_frame(xing) + mp3_frame() * 3
+    assert probe_mp3(data) == pytest.approx(2000 * MP3_FRAME_SECONDS)
+
+
+def test_mp3_vbri_header():
+    vbri = b"\x00" * 32 + b"VBRI" + b"\x00" * 10 + struct.pack(">I", 500)
+    data = mp3_frame(vbri) + mp3_frame() * 3
+    assert probe_mp3(data) == pytest.approx(500 * MP3_FRAME_SECONDS)
+
+
+def test_webm_without_duration_uses_last_block():
+    data = make_webm([(0, [0, 20, 40]), (5000, [0, 60, 120])])
+    assert probe_webm(data) == pytest.approx(5.12)
+
+
+def test_mp3_header_count_below_the_frames_present():
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">II", 0x01, 2)
+    data = mp3_frame(xing) + mp3_frame() * 49
+    assert probe_mp3(data) == pytest.approx(50 * MP3_FRAME_SECONDS)
+
+
+def test_mp3_frames_hidden_after_junk_count_by_size():
+    xing = b"\x00" * 32 + b"Xing" + struct.pack(">II", 0x01, 2)
+    data = mp3_frame(xing) + mp3_frame() + b"junk" + mp3_frame() * 2000
+    assert probe_mp3(data) >= len(data) * 8 / 320_000
+
+
+def test_webm_duration_below_the_blocks_present():
+    data = make_webm([(0, [0, 20]), (9000, [0])], duration_ms=1_000.0)
+    assert probe_webm(data) == pytest.approx(9.0)
+
+
+def test_webm_opus_bytes_bound_the_duration():
+    # Timestamps all claim 20 ms, but 300 KB of Opus cannot be shorter than 300e3 * 8 / 510e3 seconds
+    data = make_webm([(0, [0, 20] * 25)], duration_ms=20.0, block_payload=6000)
+    assert probe_webm(data) == pytest.approx(len(data) * 8 / 510_000)
+
+
+def test_webm_with_duration():
+    data = make_webm([(0, [0, 20])], duration_ms=12_345.0)
+    assert probe_webm(data) == pytest.approx(12.345)
+
+
+def test_dispatch_and_unknown_data():
+    assert probe_duration(make_wav(2.0)) == pytest.approx(2.0)
+    assert probe_duration(make_webm([(0, [0, 500])])) == pytest.approx(0.5)
+    assert probe_duration(mp3_frame() * 10) == pytest.approx(10 * MP3_FRAME_SECONDS)
+    assert probe_duration(b"OggS" + b"\x00" * 200) is None
+    assert probe_duration(b"") is None
+
+
+@pytest.mark.parametrize("data", [
+    b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10 + mp3_frame() * 50,
+    make_webm([(0, [0, 20, 40]), (5000, [0, 60, 120])]),
+    make_wav(1.5),
+])
+def test_incremental_probe_matches_full_probe(data):
+    probe = DurationProbe()
+    buffer = bytearray()
+    last = None
+    for start in range(0, len(data), 100):
+        buffer.extend(data[start:start + 100])
+        duration = probe.update(buffer)
+        if last is not None:
+            assert duration >= last
+        last = duration
+    assert last == pytest.approx(probe_duration(data))
@@ -0,0 +1,51 @@
+import os
+import asyncio
+import time
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.core.concurrency import Stage, run_blocking
+
+
+def test_stage_caps_concurrent_calls():
+    async def scenario():
+        stage = Stage("test", limit=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with stage.slot():
+                peak = max(peak, stage.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+        return peak, stage.stats()
+
+    peak, stats = asyncio.run(scenario())
+    assert peak == 2
+    assert stats == {"limit": 2, "active": 0, "waiting": 0}
+
+
+def test_blocking_calls_do_not_block_the_loop():
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        result = await run_blocking("upload", lambda: time.sleep(0.2) or "done")
+        task.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    assert result == "done"
+    assert ticks >= 5
@@ -0,0 +1,58 @@
+import os
+import asyncio
+import time
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+import jwt
+
+from app import dependencies
+from app.services import firebase_auth
+
+
+class Response:
+    status_code = 200
+
+    def json(self):
+        return {"users": [{"localId": "u1", "email": "a@b.com"}]}
+
+
+class HttpClient:
+    async def post(self, url, json):
+        return Response()
+
+
+class Users:
+    async def find_one(self, query):
+        return {"_id": query["_id"], "email": "a@b.com", "role": "student_free"}
+
+
+def test_rest_lookup_carries_the_token_expiry(monkeypatch):
+    monkeypatch.setattr(firebase_auth, "get_http_client", lambda: HttpClient())
+    exp = int(time.time()) + 600
+    token = jwt.encode({"sub": "u1", "exp": exp}, "a-key-firebase-never-signed-with-32b", algorithm="HS256")
+
+    user = asyncio.run(firebase_auth.lookup_user_by_token(token))
+    assert user["localId"] == "u1"
+    assert user["exp"] == exp
+
+
+def test_principal_is_only_cached_with_a_known_expiry(monkeypatch):
+    results = iter([{"localId": "u1"}, {"localId": "u1", "exp": time.time() + 600}])
+
+    async def get_user_by_token(token):
+        return next(results)
+
+    monkeypatch.setattr(dependencies, "get_user_by_token", get_user_by_token)
+    monkeypatch.setattr(dependencies, "principal_cache", dependencies.TTLCache(maxsize=10, ttl=3600))
+    db = {"user": Users()}
+
+    asyncio.run(dependencies._resolve_user("token-a", db))
+    assert len(dependencies.principal_cache) == 0
+    asyncio.run(dependencies._resolve_user("token-b", db))
+    assert len(dependencies.principal_cache) == 1
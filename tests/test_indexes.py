@@ -0,0 +1,20 @@
+import os
+import pytest
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.db.indexes import HOT_QUERIES, covering_index
+
+
+@pytest.mark.parametrize("query", HOT_QUERIES, ids=lambda q: q["collection"])
+def test_every_hot_query_has_a_registered_index(query):
+    assert covering_index(query) is not None, f"No index serves {query}"
+
+
+def test_unindexed_query_is_reported():
+    assert covering_index({"collection": "words", "filter": {"word": "Haus"}}) is None
@@ -0,0 +1,105 @@
+import os
+import asyncio
+import pytest
+from fastapi import HTTPException
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.jobs import JobQueue, job_event_stream
+
+
+def test_full_queue_is_rejected_with_503():
+    async def scenario():
+        queue = JobQueue("test", workers=1, max_pending=1)
+        queue.submit("a", lambda: asyncio.sleep(0))
+        with pytest.raises(HTTPException) as exc:
+            queue.submit("b", lambda: asyncio.sleep(0))
+        assert exc.value.status_code == 503
+        assert "Retry-After" in exc.value.headers
+
+    asyncio.run(scenario())
+
+
+def test_event_stream_follows_job_to_completion():
+    async def scenario():
+        queue = JobQueue("test", workers=2, max_pending=10)
+        state = {"status": "pending"}
+
+        async def job():
+            state["status"] = "processing"
+            queue.notify("job-1")
+            await asyncio.sleep(0.01)
+            state["status"] = "completed"
+
+        async def load_state():
+            return dict(state)
+
+        await queue.start()
+        queue.submit("job-1", job)
+        events = [e async for e in job_event_stream(queue, "job-1", load_state, poll_seconds=5)]
+        await queue.stop()
+        return events, queue.stats()
+
+    events, stats = asyncio.run(scenario())
+    assert all(e.startswith("event: status\n") for e in events)
+    assert '"completed"' in events[-1]
+    assert stats["completed"] == 1
+
+
+def test_event_stream_stops_at_custom_terminal_status():
+    async def scenario():
+        queue = JobQueue("test", workers=1, max_pending=10)
+        stages = iter(["script", "audio", "ready", "never reached"])
+        state = {"status": "queued"}
+
+        async def job():
+            for status in stages:
+                state["status"] = status
+                queue.notify("job-1")
+                await asyncio.sleep(0.01)
+
+        async def load_state():
+            return dict(state)
+
+        await queue.start()
+        queue.submit("job-1", job)
+        events = [
+            e async for e in job_event_stream(
+                queue, "job-1", load_state, poll_seconds=5, terminal=("ready", "failed")
+            )
+        ]
+        await queue.stop()
+        return events
+
+    events = asyncio.run(scenario())
+    assert '"queued"' in events[0]
+    assert '"ready"' in events[-1]
+    assert not any("never reached" in e for e in events)
+
+
+def test_cancelled_job_does_not_stop_the_worker():
+    async def scenario():
+        queue = JobQueue("test", workers=1, max_pending=10)
+        done = []
+
+        async def cancelled_job():
+            raise asyncio.CancelledError()
+
+        async def job():
+            done.append("job-2")
+
+        await queue.start()
+        queue.submit("job-1", cancelled_job)
+        queue.submit("job-2", job)
+        await asyncio.wait_for(queue._queue.join(), timeout=1)
+        await queue.stop()
+        return done, queue.stats()
+
+    done, stats = asyncio.run(scenario())
+    assert done == ["job-2"]
+    assert stats["failed"] == 1 and stats["completed"] == 1
@@ -0,0 +1,76 @@
+import os
+import struct
+import pytest
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.audio_probe import iter_mp3_frames, probe_mp3
+from app.services.mp3_assembly import Mp3FormatError, assemble_mp3, silence_frame
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, stereo: 417-byte frames (418 padded) of 1152 samples
+HEADER = b"\xff\xfb\x90\x00"
+PADDED_HEADER = b"\xff\xfb\x92\x00"
+FRAME_SECONDS = 1152 / 44100
+
+
+def audio_frame(marker: int, padded: bool = False) -> bytes:
+    header = PADDED_HEADER if padded else HEADER
+    return (header + bytes([marker]) * 32).ljust(418 if padded else 417, bytes([marker]))
+
+
+def segment(frames: int, marker: int) -> bytes:
+    """An ElevenLabs-like file: ID3v2 tag, Info header frame, audio frames, ID3v1 tag."""
+    id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    info = (HEADER + b"\x00" * 32 + b"Info" + struct.pack(">II", 0x01, frames)).ljust(417, b"\x00")
+    audio = b"".join(audio_frame(marker, padded=i % 3 == 1) for i in range(frames))
+    id3v1 = b"TAG" + b"\x00" * 125
+    return id3v2 + info + audio + id3v1
+
+
+def test_segments_are_joined_frame_by_frame_with_silence(tmp_path):
+    output = tmp_path / "podcast.mp3"
+    timings = assemble_mp3([segment(10, 0x11), segment(8, 0x22)], output, gap_seconds=0.4)
+
+    gap = round(0.4 / FRAME_SECONDS)
+    assert gap == 15
+    assert timings == [
+        {"start": 0.0, "end": round((10 + gap) * FRAME_SECONDS, 3)},
+        {"start": round((10 + gap) * FRAME_SECONDS, 3), "end": round((18 + 2 * gap) * FRAME_SECONDS, 3)},
+    ]
+
+    data = output.read_bytes()
+    frames = list(iter_mp3_frames(data))
+    assert len(frames) == 18 + 2 * gap
+    assert sum(frame.length for frame in frames) == len(data)
+    # Tags and the per-segment Info frames are not carried over
+    assert b"ID3" not in data and b"TAG" not in data and b"Info" not in data
+    markers = [data[frame.offset + 4] for frame in frames]
+    assert markers == [0x11] * 10 + [0x00] * gap + [0x22] * 8 + [0x00] * gap
+    assert probe_mp3(data) == pytest.approx(len(frames) * FRAME_SECONDS)
+
+
+def test_silence_frame_matches_the_stream_format():
+    frame = silence_frame(PADDED_HEADER, 417)
+    assert len(frame) == 417
+    assert frame[:4] == HEADER
+    assert frame[4:] == b"\x00" * 413
+
+    # A CRC-protected source still gets an unprotected silence frame
+    assert silence_frame(b"\xff\xfa\x90\x00", 417)[1] == 0xFB
+
+
+def test_mismatched_sample_rates_are_rejected(tmp_path):
+    # 48 kHz frames: bitrate 128 kbit/s, sample rate index 1
+    other = b"".join((b"\xff\xfb\x94\x00" + b"\x33" * 32).ljust(384, b"\x33") for _ in range(5))
+    with pytest.raises(Mp3FormatError):
+        assemble_mp3([segment(5, 0x11), other], tmp_path / "out.mp3", gap_seconds=0.4)
+
+
+def test_data_without_frames_is_rejected(tmp_path):
+    with pytest.raises(Mp3FormatError):
+        assemble_mp3([b"not an mp3 at all"], tmp_path / "out.mp3", gap_seconds=0.4)
@@ -0,0 +1,100 @@
+import os
+import asyncio
+import time
+import pytest
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+import httpx
+from fastapi import HTTPException
+from tenacity import wait_none
+
+from app.core.outbound import Provider, TokenBucket, is_retryable, outbound_retry
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_provider_caps_concurrent_calls():
+    async def scenario():
+        provider = Provider("test", max_concurrency=2, rate_per_second=0, max_queued=10)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with provider.slot():
+                peak = max(peak, provider.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+        return peak, provider.stats()
+
+    peak, stats = asyncio.run(scenario())
+    assert peak == 2
+    assert stats["calls"] == 6
+    assert stats["active"] == 0 and stats["waiting"] == 0
+    assert stats["queue_seconds_max"] > 0
+
+
+def test_provider_rejects_when_queue_is_full():
+    async def scenario():
+        provider = Provider("test", max_concurrency=1, rate_per_second=0, max_queued=1)
+
+        async def call():
+            async with provider.slot():
+                await asyncio.sleep(0.05)
+
+        return await asyncio.gather(*[call() for _ in range(3)], return_exceptions=True), provider
+
+    results, provider = asyncio.run(scenario())
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
+    assert rejected[0].headers["Retry-After"]
+    assert provider.stats()["rejected"] == 1
+
+
+def test_token_bucket_spaces_out_calls_beyond_the_burst():
+    async def scenario():
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # Two calls ride the burst, the other three wait ~20 ms each
+    assert asyncio.run(scenario()) >= 0.05
+
+
+def test_is_retryable():
+    assert is_retryable(StatusError(429))
+    assert is_retryable(StatusError(503))
+    assert is_retryable(httpx.ConnectError("refused"))
+    assert is_retryable(TimeoutError())
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(StatusError(401))
+    assert not is_retryable(ValueError("bad input"))
+    assert not is_retryable(HTTPException(status_code=503))
+
+
+@pytest.mark.parametrize("status_code,attempts", [(429, 3), (400, 1)])
+def test_outbound_retry_only_retries_transient_errors(status_code, attempts):
+    calls = 0
+
+    @outbound_retry("Test call")
+    async def call():
+        nonlocal calls
+        calls += 1
+        raise StatusError(status_code)
+
+    with pytest.raises(StatusError):
+        asyncio.run(call.retry_with(wait=wait_none())())
+    assert calls == attempts
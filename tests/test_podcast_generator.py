@@ -0,0 +1,142 @@
+import os
+import asyncio
+from pathlib import Path
+import pytest
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.core.config import settings
+from app.services.podcast_generator import (
+    PodcastGeneratorService,
+    PodcastScriptModel,
+    QuizModel,
+    QuizQuestionModel,
+    ScriptLineModel,
+)
+
+
+def make_script(lines: int) -> PodcastScriptModel:
+    return PodcastScriptModel(
+        title="Im Café",
+        dialogue=[
+            ScriptLineModel(speaker="Person A" if i % 2 == 0 else "Person B", text=f"Satz {i}")
+            for i in range(lines)
+        ],
+    )
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    service = PodcastGeneratorService()
+    service._initialized = True
+    # Skip ffmpeg: "assemble" by returning the segments in the order received
+    monkeypatch.setattr(
+        service, "_assemble_audio", lambda segments, output_path: [s.decode() for s in segments]
+    )
+    return service
+
+
+def test_lines_are_synthesized_concurrently_and_kept_in_order(generator, monkeypatch):
+    monkeypatch.setattr(settings, "PODCAST_TTS_CONCURRENCY", 3)
+    active = peak = 0
+
+    async def synthesize_line(text, voice_id):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        # Later lines finish first
+        await asyncio.sleep(0.05 - int(text.split()[1]) * 0.004)
+        active -= 1
+        return f"{text}/{voice_id}".encode()
+
+    monkeypatch.setattr(generator, "synthesize_line", synthesize_line)
+    result = asyncio.run(generator.generate_audio(make_script(10), ["v1", "v2"], Path("out.mp3")))
+
+    assert result == [f"Satz {i}/{'v1' if i % 2 == 0 else 'v2'}" for i in range(10)]
+    assert peak == 3
+
+
+def test_failed_line_cancels_the_rest(generator, monkeypatch):
+    finished = []
+
+    async def synthesize_line(text, voice_id):
+        if text == "Satz 1":
+            raise RuntimeError("TTS failed")
+        await asyncio.sleep(0.2)
+        finished.append(text)
+        return b""
+
+    monkeypatch.setattr(generator, "synthesize_line", synthesize_line)
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.generate_audio(make_script(6), [], Path("out.mp3")))
+    assert finished == []
+
+
+def stub_pipeline(generator, monkeypatch, audio_seconds=0.1, quiz_seconds=0.1, quiz_error=None):
+    """Replace the provider calls of generate_podcast with timed stubs; returns the event log."""
+    log = []
+
+    async def generate_script(words, cefr_level, context, num_speakers):
+        return make_script(2)
+
+    async def generate_audio(script, voice_ids, output_path):
+        log.append("audio started")
+        await asyncio.sleep(audio_seconds)
+        log.append("audio done")
+        return [{"start": 0.0, "end": 1.0}, {"start": 1.0, "end": 2.0}]
+
+    async def generate_quiz(script_content, num_questions=7):
+        log.append("quiz started")
+        await asyncio.sleep(quiz_seconds)
+        if quiz_error:
+            raise quiz_error
+        log.append("quiz done")
+        return QuizModel(questions=[
+            QuizQuestionModel(question="Wo sind sie?", options=["A", "B", "C", "D"], correct_answer="A")
+        ])
+
+    monkeypatch.setattr(generator, "generate_script", generate_script)
+    monkeypatch.setattr(generator, "generate_audio", generate_audio)
+    monkeypatch.setattr(generator, "generate_quiz", generate_quiz)
+    monkeypatch.setattr(generator, "get_audio_duration", lambda path: "0:02")
+    monkeypatch.setattr(generator, "upload_to_hetzner", lambda path, folder: log.append(Path(path).name) or True)
+    return log
+
+
+def test_quiz_is_generated_while_audio_is_produced(generator, monkeypatch):
+    log = stub_pipeline(generator, monkeypatch, audio_seconds=0.2, quiz_seconds=0.2)
+    stages = []
+
+    async def on_stage(stage):
+        stages.append(stage)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await generator.generate_podcast(
+            ["a", "b", "c"], "A1", "Das Café", [], on_stage=on_stage, podcast_id="abc123"
+        )
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+    assert log.index("quiz started") < log.index("audio done")
+    assert elapsed < 0.35
+    assert len(result.quiz) == 1
+    assert result.transcript[1]["start_time"] == 1.0
+    assert stages[:3] == ["script", "audio", "upload"]
+    assert result.audio_filename == "podcast_abc123.mp3"
+    assert "podcast_abc123.mp3" in log
+
+
+def test_failed_quiz_cancels_audio(generator, monkeypatch):
+    log = stub_pipeline(
+        generator, monkeypatch, audio_seconds=1.0, quiz_seconds=0.01, quiz_error=RuntimeError("LLM down")
+    )
+    with pytest.raises(RuntimeError, match="LLM down"):
+        asyncio.run(generator.generate_podcast(["a", "b", "c"], "A1", "Das Café", []))
+    assert "audio done" not in log
@@ -0,0 +1,37 @@
+import os
+from datetime import datetime, timedelta
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.services.podcast_jobs import AUDIO, FAILED, QUEUED, job_state
+
+
+def ago(seconds: float) -> datetime:
+    return datetime.utcnow() - timedelta(seconds=seconds)
+
+
+def test_queued_podcast_is_not_timed_out_while_waiting_for_a_worker():
+    doc = {"_id": ObjectId(), "status": QUEUED, "created_at": ago(settings.PODCAST_JOB_TIMEOUT_SECONDS + 60)}
+    assert job_state(doc, "")["status"] == QUEUED
+
+
+def test_running_podcast_times_out_from_when_it_started():
+    created = ago(settings.PODCAST_JOB_TIMEOUT_SECONDS + 120)
+    running = {"_id": ObjectId(), "status": AUDIO, "created_at": created, "started_at": ago(10)}
+    assert job_state(running, "")["status"] == AUDIO
+
+    stuck = dict(running, started_at=ago(settings.PODCAST_JOB_TIMEOUT_SECONDS + 1))
+    assert job_state(stuck, "")["status"] == FAILED
+
+
+def test_podcast_never_picked_up_eventually_fails():
+    doc = {"_id": ObjectId(), "status": QUEUED, "created_at": ago(settings.PODCAST_JOB_QUEUE_TIMEOUT_SECONDS + 1)}
+    assert job_state(doc, "")["status"] == FAILED
@@ -0,0 +1,88 @@
+import os
+import asyncio
+from bson import ObjectId
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.question_bank import QuestionBank
+
+WORD_ID = ObjectId()
+WORDS = [
+    {
+        "_id": WORD_ID,
+        "word": "Haus",
+        "cerf_level": "A1",
+        "tests": [
+            {
+                "question": "Article?",
+                "question_type": "article",
+                "options": [{"text": "das", "is_correct": True}, {"text": "der", "is_correct": False}],
+                "correct_answer": "das",
+                "difficulty": "easy",
+            },
+            {"question": "Meaning?", "options": ["house", "mouse"], "correct_answer": "house", "difficulty": "medium"},
+        ],
+    },
+    {"_id": ObjectId(), "word": "Baum", "cerf_level": "B1", "tests": [{"question": "Q", "options": ["tree"]}]},
+]
+
+
+class Cursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class Collection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        return Cursor(self.docs)
+
+    async def find_one(self, query, projection=None):
+        return None
+
+
+class Database:
+    def __init__(self):
+        self.collections = {"words": Collection(WORDS), "catalog_meta": Collection([])}
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+
+def load_bank():
+    bank = QuestionBank()
+    asyncio.run(bank.load(Database()))
+    return bank
+
+
+def test_questions_are_flattened_with_stable_ids():
+    bank = load_bank()
+    question = bank.get(f"{WORD_ID}:0")
+    assert question["word"] == "Haus"
+    assert question["options"] == ["das", "der"]
+    assert bank.get(f"{WORD_ID}:1")["options"] == ["house", "mouse"]
+    assert bank.stats()["levels"] == {"A1": 2, "B1": 1}
+
+
+def test_sample_honours_size_and_difficulty():
+    bank = load_bank()
+    assert len(bank.sample("A1", 1)) == 1
+    assert len(bank.sample("A1", 20)) == 2
+    assert [q["question_id"] for q in bank.sample("A1", 20, "medium")] == [f"{WORD_ID}:1"]
+    assert bank.sample("C2", 20) == []
@@ -0,0 +1,60 @@
+import os
+import pytest
+from fastapi import HTTPException
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.core.config import settings
+from app.services.session_tokens import issue_session_token, verify_session_token
+
+QUESTION_IDS = ["65f0c0ffee0000000000a001:0", "65f0c0ffee0000000000a002:3"]
+
+
+def test_round_trip():
+    token = issue_session_token("A1", QUESTION_IDS, 3)
+    claims = verify_session_token(token, "A1")
+    assert claims.question_ids == QUESTION_IDS
+    assert claims.words_version == 3
+    assert claims.session_id
+
+
+def test_every_session_gets_its_own_id():
+    first = issue_session_token("A1", QUESTION_IDS, 3)
+    second = issue_session_token("A1", QUESTION_IDS, 3)
+    assert first != second
+    assert verify_session_token(first, "A1").session_id != verify_session_token(second, "A1").session_id
+
+
+def test_tampered_question_set_is_rejected():
+    token = issue_session_token("A1", QUESTION_IDS, 3)
+    other = issue_session_token("A1", QUESTION_IDS[:1], 3)
+    forged = other.split(".")[0] + "." + token.split(".")[1]
+    with pytest.raises(HTTPException) as exc:
+        verify_session_token(forged, "A1")
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("token", ["", "abc", "a.b.c", "!!!.???"])
+def test_malformed_token_is_rejected(token):
+    with pytest.raises(HTTPException):
+        verify_session_token(token, "A1")
+
+
+def test_other_level_is_rejected():
+    token = issue_session_token("A1", QUESTION_IDS, 3)
+    with pytest.raises(HTTPException):
+        verify_session_token(token, "B2")
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    token = issue_session_token("A1", QUESTION_IDS, 3)
+    monkeypatch.setattr(settings, "TEST_SESSION_TTL_SECONDS", -1)
+    with pytest.raises(HTTPException) as exc:
+        verify_session_token(token, "A1")
+    assert "expired" in exc.value.detail
+
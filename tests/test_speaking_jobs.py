@@ -0,0 +1,39 @@
+import os
+from datetime import datetime, timedelta
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from bson import ObjectId
+
+from app.core.config import settings
+from app.services.speaking_jobs import FAILED, PENDING, PROCESSING, job_state
+
+
+def ago(seconds: float) -> datetime:
+    return datetime.utcnow() - timedelta(seconds=seconds)
+
+
+def test_queued_job_is_not_timed_out_while_waiting_for_a_worker():
+    doc = {"_id": ObjectId(), "status": PENDING, "createdAt": ago(settings.SPEAKING_JOB_TIMEOUT_SECONDS + 60)}
+    assert job_state(doc)["status"] == PENDING
+
+
+def test_running_job_times_out_from_when_it_started():
+    created = ago(settings.SPEAKING_JOB_TIMEOUT_SECONDS + 120)
+    running = {"_id": ObjectId(), "status": PROCESSING, "createdAt": created, "startedAt": ago(10)}
+    assert job_state(running)["status"] == PROCESSING
+
+    stuck = dict(running, startedAt=ago(settings.SPEAKING_JOB_TIMEOUT_SECONDS + 1))
+    state = job_state(stuck)
+    assert state["status"] == FAILED
+    assert state["error"] == "Analysis timed out"
+
+
+def test_job_never_picked_up_eventually_fails():
+    doc = {"_id": ObjectId(), "status": PENDING, "createdAt": ago(settings.SPEAKING_JOB_QUEUE_TIMEOUT_SECONDS + 1)}
+    assert job_state(doc)["status"] == FAILED
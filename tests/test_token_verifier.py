@@ -0,0 +1,71 @@
+import os
+import time
+import asyncio
+import pytest
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.token_verifier import FirebaseTokenVerifier, parse_max_age
+
+PROJECT_ID = "sprache-test"
+PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def make_verifier():
+    verifier = FirebaseTokenVerifier(PROJECT_ID)
+    verifier._keys = {"kid-1": PRIVATE_KEY.public_key()}
+    verifier._expires_at = time.monotonic() + 3600
+    verifier._last_refresh = time.monotonic()
+    return verifier
+
+
+def make_token(kid="kid-1", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "user-123",
+        "iat": now,
+        "auth_time": now,
+        "exp": now + 3600,
+        "email": "user@example.com",
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, PRIVATE_KEY, algorithm="RS256", headers={"kid": kid})
+
+
+def test_valid_token_returns_lookup_shape():
+    user = asyncio.run(make_verifier().verify(make_token()))
+    assert user["localId"] == "user-123"
+    assert user["email"] == "user@example.com"
+    assert user["exp"] > time.time()
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "other-project"},
+    {"iss": "https://securetoken.google.com/other-project"},
+    {"exp": int(time.time()) - 3600},
+])
+def test_invalid_claims_are_rejected(overrides):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(make_verifier().verify(make_token(**overrides)))
+    assert exc.value.status_code == 401
+
+
+def test_unknown_kid_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(make_verifier().verify(make_token(kid="rotated")))
+    assert exc.value.status_code == 401
+
+
+def test_parse_max_age():
+    assert parse_max_age("public, max-age=19822, must-revalidate, no-transform") == 19822
+    assert parse_max_age(None) == 3600
@@ -0,0 +1,128 @@
+import os
+import asyncio
+import pytest
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.tts_cache import TTSCache, segment_key
+
+
+class Synthesizer:
+    """Counts calls; returns `size` bytes derived from the text."""
+
+    def __init__(self, size: int = 100, delay: float = 0.0):
+        self.size = size
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, text: str):
+        async def synthesize():
+            self.calls += 1
+            await asyncio.sleep(self.delay)
+            return text.encode().ljust(self.size, b"\x00")
+        return synthesize
+
+
+def fetch(cache, text, synth, voice_id="v1"):
+    return asyncio.run(cache.fetch(voice_id, "model", text, synth(text)))
+
+
+def test_key_covers_voice_model_and_text():
+    key = segment_key("v1", "m", "Ja, gerne.")
+    assert key == segment_key("v1", "m", "Ja, gerne.")
+    assert key != segment_key("v2", "m", "Ja, gerne.")
+    assert key != segment_key("v1", "m2", "Ja, gerne.")
+    assert key != segment_key("v1", "m", "Ja gerne.")
+
+
+def test_second_request_is_served_from_disk(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=10_000)
+    synth = Synthesizer()
+
+    first = fetch(cache, "Danke schön!", synth)
+    second = fetch(cache, "Danke schön!", synth)
+    other_voice = fetch(cache, "Danke schön!", synth, voice_id="v2")
+
+    assert first == second == other_voice
+    assert synth.calls == 2
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["bytes_saved"] == 100
+
+
+def test_least_recently_used_segments_are_evicted(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=250)
+    synth = Synthesizer()
+
+    fetch(cache, "a", synth)
+    fetch(cache, "b", synth)
+    fetch(cache, "a", synth)  # "b" is now the least recently used
+    fetch(cache, "c", synth)
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 200
+    calls = synth.calls
+    fetch(cache, "a", synth)
+    assert synth.calls == calls
+    fetch(cache, "b", synth)
+    assert synth.calls == calls + 1
+
+
+def test_segments_survive_a_restart(tmp_path):
+    synth = Synthesizer()
+    fetch(TTSCache(str(tmp_path), max_bytes=10_000), "Hallo", synth)
+
+    restarted = TTSCache(str(tmp_path), max_bytes=10_000)
+    fetch(restarted, "Hallo", synth)
+    assert synth.calls == 1
+    assert restarted.stats()["entries"] == 1
+
+
+def test_concurrent_requests_for_one_segment_synthesize_once(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=10_000)
+    synth = Synthesizer(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*[
+            cache.fetch("v1", "model", "Ja.", synth("Ja.")) for _ in range(5)
+        ])
+
+    results = asyncio.run(scenario())
+    assert len(set(results)) == 1
+    assert synth.calls == 1
+    assert cache.stats()["hits"] == 4
+
+
+def test_failed_synthesis_is_not_cached(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=10_000)
+
+    async def failing():
+        raise RuntimeError("TTS down")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.fetch("v1", "model", "Tschüss", failing))
+    assert cache.stats()["entries"] == 0
+    assert fetch(cache, "Tschüss", Synthesizer()).startswith("Tschüss".encode())
+
+
+def test_waiters_synthesize_themselves_when_the_leading_fetch_is_cancelled(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=10_000)
+    synth = Synthesizer(delay=0.05)
+
+    async def scenario():
+        leader = asyncio.create_task(cache.fetch("v1", "model", "Ja.", synth("Ja.")))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.fetch("v1", "model", "Ja.", synth("Ja."))) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(scenario())
+    assert results == [b"Ja.".ljust(100, b"\x00")] * 3
+    # One waiter took over, the others joined it
+    assert synth.calls == 2
@@ -0,0 +1,107 @@
+import asyncio
+import io
+import os
+import wave
+import pytest
+from fastapi import HTTPException
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from app.services.upload_stream import read_audio_upload
+
+BOUNDARY = "testboundary"
+
+
+def make_wav(seconds: float, rate: int = 8000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+def multipart_body(audio: bytes, **fields: str) -> bytes:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="audio"; filename="a.wav"\r\n'
+        f"Content-Type: audio/wav\r\n\r\n".encode() + audio + b"\r\n"
+    )
+    parts.append(f"--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+class FakeRequest:
+    """Just enough of a Starlette Request: headers and a chunked body stream."""
+
+    def __init__(self, body: bytes, content_length: bool = True, chunk_size: int = 16 * 1024):
+        self.headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+        if content_length:
+            self.headers["content-length"] = str(len(body))
+        self._body = body
+        self._chunk_size = chunk_size
+        self.chunks_read = 0
+
+    async def stream(self):
+        for start in range(0, len(self._body), self._chunk_size):
+            self.chunks_read += 1
+            yield self._body[start:start + self._chunk_size]
+
+
+def read(request, max_bytes=1024 * 1024, max_seconds=60):
+    return asyncio.run(read_audio_upload(request, "audio", max_bytes, max_seconds))
+
+
+def test_reads_fields_file_and_duration():
+    audio = make_wav(2)
+    upload = read(FakeRequest(multipart_body(audio, questionText="Hej?", targetWords="[]")))
+    assert upload.fields == {"questionText": "Hej?", "targetWords": "[]"}
+    assert upload.file_bytes == audio
+    assert upload.filename == "a.wav"
+    assert upload.duration_seconds == pytest.approx(2.0)
+
+
+def test_rejects_non_multipart_body():
+    request = FakeRequest(b"{}")
+    request.headers["content-type"] = "application/json"
+    with pytest.raises(HTTPException) as exc:
+        read(request)
+    assert exc.value.status_code == 400
+
+
+def test_rejects_oversized_content_length_before_reading():
+    request = FakeRequest(multipart_body(make_wav(10)))
+    with pytest.raises(HTTPException) as exc:
+        read(request, max_bytes=1024)
+    assert exc.value.status_code == 413
+    assert request.chunks_read == 0
+
+
+def test_caps_file_size_while_streaming():
+    # Chunked uploads carry no Content-Length, so the cap applies as bytes arrive
+    request = FakeRequest(multipart_body(make_wav(30)), content_length=False)
+    with pytest.raises(HTTPException) as exc:
+        read(request, max_bytes=100 * 1024)
+    assert exc.value.status_code == 413
+    assert request.chunks_read < 10
+
+
+def test_rejects_long_recording_before_upload_ends():
+    # 90 s at 8 kHz mono 16-bit is ~1.4 MB; 60 s worth of it is enough to reject
+    request = FakeRequest(multipart_body(make_wav(90)), chunk_size=64 * 1024)
+    with pytest.raises(HTTPException) as exc:
+        read(request, max_bytes=2 * 1024 * 1024)
+    assert exc.value.status_code == 400
+    assert "exceeds maximum of 60 seconds" in exc.value.detail
+    total_chunks = -(-len(request._body) // (64 * 1024))
+    assert request.chunks_read < total_chunks
@@ -0,0 +1,50 @@
+import ast
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# Functions allowed to read whole word documents
+FULL_DOCUMENT_ALLOWLIST = {
+    "debug_words_structure",  # /tests/debug dumps a sample document on purpose
+}
+
+
+def _is_words_collection(node: ast.AST) -> bool:
+    """Matches db["words"] and db.words."""
+    if isinstance(node, ast.Subscript):
+        return isinstance(node.slice, ast.Constant) and node.slice.value == "words"
+    if isinstance(node, ast.Attribute):
+        return node.attr == "words"
+    return False
+
+
+def _full_document_reads(tree: ast.AST):
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if func.name in FULL_DOCUMENT_ALLOWLIST:
+            continue
+        for node in ast.walk(func):
+            if not (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ("find", "find_one")
+                and _is_words_collection(node.func.value)
+            ):
+                continue
+            has_projection = len(node.args) >= 2 or any(kw.arg == "projection" for kw in node.keywords)
+            if not has_projection:
+                yield f"{func.name} (line {node.lineno})"
+
+
+def test_words_reads_use_a_projection():
+    offenders = []
+    for path in APP_DIR.rglob("*.py"):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        offenders += [f"{path.relative_to(APP_DIR)}: {o}" for o in _full_document_reads(tree)]
+    assert not offenders, f"Full word document fetched without a projection: {offenders}"
+
+
+def test_detects_missing_projection():
+    tree = ast.parse("async def f(db):\n    return await db['words'].find_one({'_id': 1})\n")
+    assert list(_full_document_reads(tree)) == ["f (line 2)"]
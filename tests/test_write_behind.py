@@ -0,0 +1,139 @@
+import os
+import asyncio
+
+# Set required environment variables before importing settings/app
+os.environ["MONGO_USER"] = "test"
+os.environ["MONGO_PASSWORD"] = "test"
+os.environ["MONGO_ADDRESS"] = "localhost"
+os.environ["MONGO_CLUSTER"] = "test"
+os.environ["FIREBASE_API"] = "test"
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.services.write_behind import WriteBehindBuffer
+
+
+class Collection:
+    def __init__(self, name, db):
+        self.name = name
+        self.db = db
+
+    async def bulk_write(self, requests, ordered=True):
+        if self.db.fail:
+            raise ConnectionError("primary stepped down")
+        self.db.writes.append((self.name, list(requests)))
+
+
+class Database:
+    def __init__(self):
+        self.writes = []
+        self.fail = False
+
+    def __getitem__(self, name):
+        return Collection(name, self)
+
+
+def make_buffer():
+    buffer = WriteBehindBuffer()
+    db = Database()
+    buffer._db = db
+    return buffer, db
+
+
+def test_progress_is_coalesced_per_user_and_level():
+    buffer, db = make_buffer()
+    for index in range(5):
+        buffer.record_progress("u1", "A1", index)
+    buffer.record_progress("u1", "B1", 2)
+    assert buffer.pending_progress("u1", "A1") == 4
+    assert buffer.depth() == 2
+
+    asyncio.run(buffer.flush())
+
+    (collection, ops), = db.writes
+    assert collection == "flashcard_sessions"
+    assert [op._doc["$set"]["current_index"] for op in ops] == [4, 2]
+    assert buffer.depth() == 0
+    assert buffer.stats()["progress_coalesced"] == 4
+
+
+def test_reset_discards_pending_progress():
+    buffer, db = make_buffer()
+    buffer.record_progress("u1", "A1", 7)
+    buffer.discard_progress("u1", "A1")
+    asyncio.run(buffer.flush())
+    assert db.writes == []
+
+
+def test_summaries_are_written_after_results():
+    buffer, db = make_buffer()
+    result_id = ObjectId()
+    summary = UpdateOne(
+        {"_id": "u1", "recent_result_ids": {"$ne": result_id}},
+        {"$inc": {"levels.A1.attempts": 1}, "$push": {"recent_result_ids": result_id}}
+    )
+    buffer.add_result({"userId": "u1", "level": "A1", "score": 80}, summary)
+    assert [doc["score"] for doc in buffer.pending_results("u1")] == [80]
+
+    asyncio.run(buffer.flush())
+
+    assert [name for name, _ in db.writes] == ["test_results", "test_summaries"]
+    assert buffer.pending_results("u1") == []
+
+
+def test_failed_flush_is_requeued_without_overwriting_newer_progress():
+    buffer, db = make_buffer()
+    buffer.record_progress("u1", "A1", 3)
+    buffer.add_result({"userId": "u1", "level": "A1", "score": 50})
+    db.fail = True
+    asyncio.run(buffer.flush())
+    assert buffer.depth() == 2
+    assert buffer.stats()["failed_flushes"] == 1
+
+    buffer.record_progress("u1", "A1", 9)
+    db.fail = False
+    asyncio.run(buffer.flush())
+    progress_ops = dict(db.writes)["flashcard_sessions"]
+    assert [op._doc["$set"]["current_index"] for op in progress_ops] == [9]
+    assert buffer.depth() == 0
+
+
+def test_full_buffer_drops_progress_but_refuses_results(monkeypatch):
+    monkeypatch.setattr(settings, "WRITE_BEHIND_MAX_PENDING", 2)
+    buffer, db = make_buffer()
+    buffer.record_progress("u1", "A1", 1)
+    assert buffer.add_result({"userId": "u1", "level": "A1", "score": 50})
+    # Full: the caller has to write this result itself
+    assert not buffer.add_result({"userId": "u1", "level": "A1", "score": 60})
+    buffer.record_progress("u2", "A1", 1)
+    # Coalescing into a pending write does not grow the buffer
+    buffer.record_progress("u1", "A1", 2)
+
+    assert buffer.depth() == 2
+    assert buffer.pending_progress("u1", "A1") == 2
+    assert [doc["score"] for doc in buffer.pending_results("u1")] == [50]
+    stats = buffer.stats()
+    assert stats["dropped"] == 1 and stats["results_refused"] == 1
+
+
+def test_requeue_after_a_failed_flush_sheds_progress_not_results(monkeypatch):
+    monkeypatch.setattr(settings, "WRITE_BEHIND_MAX_PENDING", 3)
+    buffer, db = make_buffer()
+    buffer.record_progress("u1", "A1", 1)
+    for score in (10, 20):
+        buffer.add_result({"userId": "u1", "level": "A1", "score": score})
+
+    async def scenario():
+        db.fail = True
+        flush = asyncio.create_task(buffer.flush())
+        await asyncio.sleep(0)
+        # Arrives while the failing flush is in progress
+        buffer.add_result({"userId": "u1", "level": "A1", "score": 30})
+        await flush
+
+    asyncio.run(scenario())
+    assert [doc["score"] for doc in buffer.pending_results("u1")] == [30, 20, 10]
+    assert buffer.pending_progress("u1", "A1") is None
+    assert buffer.stats()["dropped"] == 1